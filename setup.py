@@ -10,8 +10,8 @@ from pathlib import Path
 from setuptools import setup, find_packages
 
 # 确保Python版本
-if sys.version_info < (3, 8):
-    raise RuntimeError("RSDatasetGenerator需要Python 3.8或更高版本")
+if sys.version_info < (3, 10):
+    raise RuntimeError("RSDatasetGenerator需要Python 3.10或更高版本")
 
 # 获取项目根目录
 HERE = Path(__file__).parent.absolute()
@@ -105,8 +105,6 @@ setup(
         "License :: OSI Approved :: MIT License",
         "Operating System :: OS Independent",
         "Programming Language :: Python :: 3",
-        "Programming Language :: Python :: 3.8",
-        "Programming Language :: Python :: 3.9",
         "Programming Language :: Python :: 3.10",
         "Programming Language :: Python :: 3.11",
         "Programming Language :: Python :: 3.12",
@@ -115,12 +113,14 @@ setup(
         "Topic :: Multimedia :: Graphics :: Graphics Conversion",
     ],
     keywords="gis, remote sensing, satellite imagery, dataset generation, geospatial",
-    python_requires=">=3.8",
+    python_requires=">=3.10",
     install_requires=requirements,
     extras_require={
         "dev": dev_requirements,
         "docs": docs_requirements,
         "benchmark": benchmark_requirements,
+        # pillow-simd是Pillow的SSE4/AVX2加速替代实现，与Pillow互斥安装
+        "simd": ["pillow-simd>=9.0.0"],
         "all": dev_requirements + docs_requirements + benchmark_requirements,
     },
     entry_points={
@@ -162,7 +162,7 @@ setup(
 if __name__ == "__main__":
     print("RSDatasetGenerator安装配置完成")
     print(f"版本: {version}")
-    print(f"Python要求: >=3.8")
+    print(f"Python要求: >=3.10")
     print(f"依赖包数量: {len(requirements)}")
     
     # 检查关键依赖
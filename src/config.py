@@ -13,8 +13,11 @@ from pathlib import Path
 
 try:
     import yaml
+    # 优先使用libyaml的C解析器，比纯Python实现快一个数量级
+    _YAML_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
 except ImportError:
     yaml = None
+    _YAML_LOADER = None
 
 
 @dataclass
@@ -28,7 +31,9 @@ class DownloadConfig:
     retry_wait_range: Tuple[float, float] = (6, 10)
     max_retries: int = 3
     backoff_base: float = 2.0
-    
+    enable_cache: bool = True
+    max_cache_bytes: int = 0  # 磁盘瓦片缓存容量上限（字节），0表示不限制
+
     def __post_init__(self):
         """验证配置参数"""
         if self.grid_size % 2 == 0:
@@ -37,6 +42,8 @@ class DownloadConfig:
             raise ValueError("zoom级别必须在1-20之间")
         if self.max_concurrency < 1:
             raise ValueError("max_concurrency必须大于0")
+        if self.max_cache_bytes < 0:
+            raise ValueError("max_cache_bytes不能为负数")
 
 
 @dataclass
@@ -53,13 +60,37 @@ class PathConfig:
             Path(dir_path).mkdir(parents=True, exist_ok=True)
 
 
+def _accept_encoding() -> str:
+    """根据本地可用的解码器生成Accept-Encoding头
+
+    始终支持gzip/deflate；brotli与zstd仅在对应解码库已安装时声明，
+    避免服务端返回本地无法解码的编码。
+
+    Returns:
+        Accept-Encoding头的值
+    """
+    encodings = ['gzip', 'deflate']
+    try:
+        import brotli  # noqa: F401
+        encodings.append('br')
+    except ImportError:
+        pass
+    try:
+        import zstandard  # noqa: F401
+        encodings.append('zstd')
+    except ImportError:
+        pass
+    return ', '.join(encodings)
+
+
 @dataclass
 class NetworkConfig:
     """网络相关配置"""
     headers: Dict[str, str] = field(default_factory=lambda: {
         'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) '
                      'AppleWebKit/537.36 (KHTML, like Gecko) '
-                     'Chrome/91.0.4472.124 Safari/537.36'
+                     'Chrome/91.0.4472.124 Safari/537.36',
+        'Accept-Encoding': _accept_encoding()
     })
     base_url: str = "http://mt0.google.com/vt/lyrs=s&hl=en"
     use_proxy: bool = False
@@ -123,7 +154,7 @@ class Config:
             if file_ext in ['.yaml', '.yml']:
                 if yaml is None:
                     raise ImportError("需要安装PyYAML库来支持YAML格式配置文件")
-                config_data = yaml.safe_load(f)
+                config_data = yaml.load(f, Loader=_YAML_LOADER)
             else:
                 # 默认使用JSON格式
                 config_data = json.load(f)
@@ -8,6 +8,7 @@ from .base import BaseDownloader, DownloadResult
 from .sync_downloader import SyncDownloader
 from .async_downloader import AsyncDownloader
 from .factory import DownloaderFactory, DownloaderType
+from .tile_store import SqliteTileStore
 
 __all__ = [
     "BaseDownloader",
@@ -15,5 +16,6 @@ __all__ = [
     "SyncDownloader",
     "AsyncDownloader",
     "DownloaderFactory",
-    "DownloaderType"
+    "DownloaderType",
+    "SqliteTileStore"
 ]
\ No newline at end of file
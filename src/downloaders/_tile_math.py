@@ -0,0 +1,46 @@
+"""瓦片坐标数值计算模块
+
+提供瓦片网格计算热点路径使用的数值内核。
+numba可用时将内核JIT编译为并行机器码，否则回退到等价的NumPy实现。
+"""
+
+import numpy as np
+
+try:
+    from numba import njit, prange
+except ImportError:
+    njit = None
+    prange = range
+
+
+def _grid_to_tiles_py(cx: int, cy: int, half: int):
+    """以(cx, cy)为中心生成方形网格的瓦片坐标
+
+    Args:
+        cx: 中心瓦片X坐标
+        cy: 中心瓦片Y坐标
+        half: 网格半径（网格边长为 2*half+1）
+
+    Returns:
+        瓦片坐标数组 (xs, ys)，顺序与嵌套循环 (dx外层, dy内层) 一致
+    """
+    size = 2 * half + 1
+    total = size * size
+    xs = np.empty(total, np.int64)
+    ys = np.empty(total, np.int64)
+    for k in prange(total):
+        i = k // size - half
+        j = k % size - half
+        xs[k] = cx + i
+        ys[k] = cy + j
+    return xs, ys
+
+
+if njit is not None:
+    grid_to_tiles = njit(cache=True, parallel=True)(_grid_to_tiles_py)
+else:
+    def grid_to_tiles(cx: int, cy: int, half: int):
+        """NumPy回退实现，语义与JIT版本一致"""
+        offsets = np.arange(-half, half + 1)
+        dx, dy = np.meshgrid(offsets, offsets, indexing='ij')
+        return np.int64(cx) + dx.ravel(), np.int64(cy) + dy.ravel()
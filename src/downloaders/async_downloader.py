@@ -7,16 +7,80 @@
 import asyncio
 import time
 import random
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Optional
 from PIL import Image
 from io import BytesIO
 import aiohttp
 from aiohttp import TCPConnector, ClientTimeout
 
-from .base import BaseDownloader, TileInfo, DownloadResult
+try:
+    import aiodns  # noqa: F401
+    from aiohttp.resolver import AsyncResolver
+except ImportError:
+    AsyncResolver = None
+
+from .base import BaseDownloader, TileBatch, TileInfo, DownloadResult
 from ..utils import DownloadError
 
 
+class _AdaptiveSemaphore:
+    """自适应并发信号量
+
+    类似TCP慢启动的并发控制：从较小的并发数起步，
+    每成功完成一批请求后并发数倍增，遇到超时或限流(429)后减半。
+    自动收敛到服务端可承受的并发水平，无需手动调参。
+    """
+
+    def __init__(self, initial: int, hard_cap: int):
+        """初始化自适应信号量
+
+        Args:
+            initial: 起始并发数
+            hard_cap: 并发数上限
+        """
+        self.hard_cap = max(1, hard_cap)
+        self.current = min(max(1, initial), self.hard_cap)
+        self._active = 0
+        self._successes = 0
+        self._cond = asyncio.Condition()
+
+    async def acquire(self):
+        """获取许可，活动请求数达到当前并发上限时等待"""
+        async with self._cond:
+            while self._active >= self.current:
+                await self._cond.wait()
+            self._active += 1
+
+    async def release(self):
+        """释放许可并唤醒等待者"""
+        async with self._cond:
+            self._active -= 1
+            self._cond.notify_all()
+
+    async def __aenter__(self):
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.release()
+
+    async def record_success(self):
+        """记录一次成功请求，每成功一批后并发数倍增"""
+        async with self._cond:
+            self._successes += 1
+            if self._successes >= self.current and self.current < self.hard_cap:
+                self._successes = 0
+                self.current = min(self.current * 2, self.hard_cap)
+                self._cond.notify_all()
+
+    async def record_backoff(self):
+        """记录一次超时或限流，并发数减半"""
+        async with self._cond:
+            self._successes = 0
+            self.current = max(self.current // 2, 1)
+
+
 class AsyncDownloader(BaseDownloader):
     """异步下载器
     
@@ -28,28 +92,44 @@ class AsyncDownloader(BaseDownloader):
     - 支持连接池管理
     """
     
-    def __init__(self, config):
+    def __init__(self, config, store=None):
         """初始化异步下载器
-        
+
         Args:
             config: 配置对象
+            store: 可选的SQLite瓦片存储
         """
-        super().__init__(config)
+        super().__init__(config, store=store)
         
-        # 并发控制
-        self.semaphore = asyncio.Semaphore(config.download.max_concurrency)
+        # 并发控制：慢启动起步，按成功/超时反馈自适应调整
+        self.semaphore = _AdaptiveSemaphore(
+            initial=min(4, config.download.max_concurrency),
+            hard_cap=config.download.max_concurrency
+        )
         
-        # 会话配置
+        # 会话配置：显式启用keep-alive连接复用，
+        # 同一主机的瓦片请求共享TCP连接，避免逐瓦片握手开销。
+        # DNS解析结果缓存10分钟，aiodns可用时使用异步解析器，
+        # 避免每个请求阻塞在glibc的同步DNS查询上
+        resolver = AsyncResolver() if AsyncResolver is not None else None
         self.connector = TCPConnector(
             limit=config.download.max_concurrency * 2,
             limit_per_host=config.download.max_concurrency,
+            keepalive_timeout=30.0,
+            force_close=False,
+            use_dns_cache=True,
+            ttl_dns_cache=600,
+            resolver=resolver,
             ssl=False
         )
         
         self.timeout = ClientTimeout(total=config.download.request_timeout)
         
         self.session: Optional[aiohttp.ClientSession] = None
-        
+
+        # CPU密集的网格计算使用的线程池，与网络I/O重叠执行
+        self._cpu_pool = ThreadPoolExecutor(max_workers=2)
+
         self.logger.info(f"异步下载器初始化完成，最大并发数: {config.download.max_concurrency}")
     
     async def __aenter__(self):
@@ -60,7 +140,9 @@ class AsyncDownloader(BaseDownloader):
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         """异步上下文管理器出口"""
         await self._close_session()
-    
+        # 线程池随下载器生命周期结束，不泄漏非守护线程
+        self._cpu_pool.shutdown(wait=False)
+
     async def _ensure_session(self):
         """确保会话已创建"""
         if self.session is None or self.session.closed:
@@ -203,9 +285,18 @@ class AsyncDownloader(BaseDownloader):
                             f"瓦片: ({tile_info.x}, {tile_info.y}, {tile_info.z})"
                         )
                     
-                    # 保存瓦片
-                    self.save_tile(tile_info, image)
-                    
+                    # 保存瓦片（磁盘写入推到线程池，避免阻塞事件循环）：
+                    # 服务端返回的PNG字节原样落盘，避免PIL重新编码
+                    loop = asyncio.get_running_loop()
+                    if content_type.startswith('image/png'):
+                        await loop.run_in_executor(
+                            None, self.save_tile_bytes, tile_info, image_data, image
+                        )
+                    else:
+                        await loop.run_in_executor(None, self.save_tile, tile_info, image)
+
+                    await self.semaphore.record_success()
+
                     return DownloadResult(
                         tile_info=tile_info,
                         success=True,
@@ -214,6 +305,7 @@ class AsyncDownloader(BaseDownloader):
                     )
                     
             except asyncio.TimeoutError:
+                await self.semaphore.record_backoff()
                 raise DownloadError("请求超时")
             except aiohttp.ClientConnectionError:
                 raise DownloadError("连接错误")
@@ -221,6 +313,7 @@ class AsyncDownloader(BaseDownloader):
                 if e.status == 404:
                     raise DownloadError("瓦片不存在 (404)")
                 elif e.status == 429:
+                    await self.semaphore.record_backoff()
                     raise DownloadError("请求过于频繁 (429)")
                 elif e.status >= 500:
                     raise DownloadError(f"服务器错误 ({e.status})")
@@ -244,12 +337,19 @@ class AsyncDownloader(BaseDownloader):
         """异步批量下载瓦片
         
         Args:
-            tiles: 瓦片信息列表
-            
+            tiles: 瓦片信息列表或TileBatch批次
+
         Returns:
             下载结果列表
         """
+        if isinstance(tiles, TileBatch):
+            tiles = self.create_tile_infos(tiles)
+
         total_tiles = len(tiles)
+
+        # 预创建存储目录，避免逐瓦片makedirs
+        self.ensure_tile_dirs(tiles)
+
         self.logger.info(f"开始异步下载 {total_tiles} 个瓦片，最大并发数: {self.config.download.max_concurrency}")
         self.monitor.update_stats('total_downloads', total_tiles)
         
@@ -316,6 +416,37 @@ class AsyncDownloader(BaseDownloader):
         
         return results
     
+    async def prepare_and_download(self, lon: float, lat: float,
+                                   zoom: Optional[int] = None,
+                                   grid_size: Optional[int] = None) -> List[DownloadResult]:
+        """计算点周围的瓦片网格并下载（网格计算与会话预热重叠）
+
+        CPU密集的网格计算提交到线程池，与会话/连接的建立并行进行，
+        网格计算的耗时被隐藏在首个网络往返之后。
+
+        Args:
+            lon: 经度
+            lat: 纬度
+            zoom: 缩放级别，默认取配置
+            grid_size: 网格大小，默认取配置
+
+        Returns:
+            下载结果列表
+        """
+        zoom = zoom if zoom is not None else self.config.download.zoom
+        grid_size = grid_size if grid_size is not None else self.config.download.grid_size
+
+        loop = asyncio.get_running_loop()
+        tiles_future = loop.run_in_executor(
+            self._cpu_pool, self.calculate_tiles_for_point, lon, lat, zoom, grid_size
+        )
+
+        # 网格计算进行的同时预热会话
+        await self._ensure_session()
+
+        tiles = await tiles_future
+        return await self.download_tiles_async(tiles)
+
     async def download_tiles_batch(self, tiles: List[TileInfo], batch_size: int = 100) -> List[DownloadResult]:
         """分批异步下载瓦片
         
@@ -350,6 +481,8 @@ class AsyncDownloader(BaseDownloader):
     
     def __del__(self):
         """析构函数"""
+        if hasattr(self, '_cpu_pool'):
+            self._cpu_pool.shutdown(wait=False)
         if hasattr(self, 'session') and self.session and not self.session.closed:
             # 在事件循环中关闭会话
             try:
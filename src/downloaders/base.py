@@ -3,34 +3,90 @@
 定义下载器的抽象接口和通用功能。
 """
 
+import mmap
 import os
 import time
 import random
 from abc import ABC, abstractmethod
+from collections import OrderedDict
 from typing import Dict, List, Optional, Tuple, Any
 from dataclasses import dataclass
+from io import BytesIO
 from PIL import Image
+import numpy as np
 import mercantile
 
 from ..config import Config
 from ..utils import Logger, PerformanceMonitor, DownloadError
+from ._tile_math import grid_to_tiles
+from .tile_store import SqliteTileStore
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class TileInfo:
-    """瓦片信息"""
+    """瓦片信息
+
+    不可变并启用slots：去掉每实例的__dict__以降低内存占用，
+    同时获得C实现的__hash__/__eq__，可直接用作字典键。
+    """
     x: int
     y: int
     z: int
     url: str
     file_path: str
-    
+
     @property
     def key(self) -> Tuple[int, int, int]:
         """瓦片唯一标识"""
         return (self.x, self.y, self.z)
 
 
+@dataclass
+class TileBatch:
+    """瓦片批次（SoA布局）
+
+    以结构数组（xs/ys两个连续数组加统一的缩放级别）表示一批瓦片坐标，
+    替代瓦片对象列表。内存连续、缓存友好，可直接传给NumPy向量化内核。
+    """
+    xs: np.ndarray
+    ys: np.ndarray
+    z: int
+
+    @classmethod
+    def from_tiles(cls, tiles: List[TileInfo]) -> 'TileBatch':
+        """从瓦片信息列表构建批次
+
+        Args:
+            tiles: 瓦片信息列表（缩放级别必须一致）
+
+        Returns:
+            瓦片批次
+        """
+        count = len(tiles)
+        xs = np.fromiter((t.x for t in tiles), dtype=np.int32, count=count)
+        ys = np.fromiter((t.y for t in tiles), dtype=np.int32, count=count)
+        zoom = tiles[0].z if tiles else 0
+        return cls(xs=xs, ys=ys, z=zoom)
+
+    def valid_mask(self) -> np.ndarray:
+        """批量验证瓦片坐标（向量化）
+
+        一次C层向量运算代替逐瓦片的Python级validate_tile_coordinates调用。
+
+        Returns:
+            布尔数组，对应位置的瓦片坐标是否有效
+        """
+        max_coord = 1 << self.z
+        return (
+            (self.xs >= 0) & (self.xs < max_coord) &
+            (self.ys >= 0) & (self.ys < max_coord)
+        )
+
+    def __len__(self) -> int:
+        """批次中的瓦片数量"""
+        return len(self.xs)
+
+
 @dataclass
 class DownloadResult:
     """下载结果"""
@@ -106,17 +162,38 @@ class BaseDownloader(ABC):
     定义下载器的抽象接口，所有具体下载器都应继承此类。
     """
     
-    def __init__(self, config: Config):
+    def __init__(self, config: Config, store: Optional[SqliteTileStore] = None):
         """初始化下载器
-        
+
         Args:
             config: 配置对象
+            store: 可选的SQLite瓦片存储，提供时瓦片写入单个数据库文件而非逐个PNG
         """
         self.config = config
+        self.store = store
         self.logger = Logger(f"{self.__class__.__name__}")
         self.monitor = PerformanceMonitor()
         self.cache = TileCache(max_size=1000)
-        
+
+        # 已知存在于磁盘的瓦片索引（LRU），避免热路径上重复stat文件系统
+        self._disk_index: "OrderedDict[Tuple[int, int, int], None]" = OrderedDict()
+        self._disk_index_max = 65536
+
+        # 磁盘缓存容量控制（LRU）：跟踪本次会话写入的瓦片字节数，
+        # 超出max_cache_bytes时O(1)淘汰最久未写入的瓦片
+        self._lru: "OrderedDict[Tuple[int, int, int], int]" = OrderedDict()
+        self._lru_bytes = 0
+        self._lru_cap = getattr(config.download, 'max_cache_bytes', 0)
+
+        # 预编译URL生成闭包：把base_url绑定进闭包，
+        # 热路径上每次生成URL免去config.network.base_url的属性查找链
+        base_url = config.network.base_url
+        self._url_fn = lambda x, y, z: f"{base_url}&x={x}&y={y}&z={z}"
+
+        # 预计算瓦片路径前缀：生成路径的热路径用f-string拼接，
+        # 免去逐瓦片os.path.join的分隔符解析开销
+        self._tile_path_prefix = os.path.join(self.config.paths.tile_save_dir, '')
+
         # 确保输出目录存在
         os.makedirs(self.config.paths.tile_save_dir, exist_ok=True)
     
@@ -131,7 +208,7 @@ class BaseDownloader(ABC):
         Returns:
             瓦片URL
         """
-        return f"{self.config.network.base_url}&x={x}&y={y}&z={z}"
+        return self._url_fn(x, y, z)
     
     def generate_tile_path(self, x: int, y: int, z: int) -> str:
         """生成瓦片文件路径
@@ -144,8 +221,7 @@ class BaseDownloader(ABC):
         Returns:
             瓦片文件路径
         """
-        filename = f"tile_{z}_{x}_{y}.png"
-        return os.path.join(self.config.paths.tile_save_dir, filename)
+        return f"{self._tile_path_prefix}tile_{z}_{x}_{y}.png"
     
     def create_tile_info(self, x: int, y: int, z: int) -> TileInfo:
         """创建瓦片信息对象
@@ -166,6 +242,87 @@ class BaseDownloader(ABC):
             file_path=self.generate_tile_path(x, y, z)
         )
     
+    @staticmethod
+    def geo_to_tiles(lons: np.ndarray, lats: np.ndarray, zoom: int) -> Tuple[np.ndarray, np.ndarray]:
+        """批量地理坐标转瓦片坐标（向量化）
+
+        使用NumPy ufunc一次性转换整批坐标，避免逐点的Python循环和三角函数调用。
+
+        Args:
+            lons: 经度数组
+            lats: 纬度数组
+            zoom: 缩放级别
+
+        Returns:
+            瓦片坐标数组 (x, y)
+        """
+        n = 1 << zoom
+        lons = np.asarray(lons, dtype=np.float64)
+        lats = np.asarray(lats, dtype=np.float64)
+
+        x = np.floor((lons + 180.0) / 360.0 * n).astype(np.int64)
+        lat_r = np.radians(lats)
+        y = np.floor(
+            (1.0 - np.log(np.tan(lat_r) + 1.0 / np.cos(lat_r)) / np.pi) / 2.0 * n
+        ).astype(np.int64)
+
+        # 与mercantile一致，将结果限制在有效瓦片范围内
+        np.clip(x, 0, n - 1, out=x)
+        np.clip(y, 0, n - 1, out=y)
+        return x, y
+
+    @staticmethod
+    def geo_to_tile(lon: float, lat: float, zoom: int) -> Tuple[int, int]:
+        """地理坐标转瓦片坐标（标量封装）
+
+        Args:
+            lon: 经度
+            lat: 纬度
+            zoom: 缩放级别
+
+        Returns:
+            瓦片坐标 (x, y)
+        """
+        x, y = BaseDownloader.geo_to_tiles(np.array([lon]), np.array([lat]), zoom)
+        return int(x[0]), int(y[0])
+
+    @staticmethod
+    def tiles_to_geo(xs: np.ndarray, ys: np.ndarray, zoom: int) -> Tuple[np.ndarray, np.ndarray]:
+        """批量瓦片坐标转地理坐标（向量化）
+
+        返回每个瓦片左上角对应的经纬度。
+
+        Args:
+            xs: 瓦片X坐标数组
+            ys: 瓦片Y坐标数组
+            zoom: 缩放级别
+
+        Returns:
+            地理坐标数组 (lon, lat)
+        """
+        n = float(1 << zoom)
+        xs = np.asarray(xs, dtype=np.float64)
+        ys = np.asarray(ys, dtype=np.float64)
+
+        lons = xs / n * 360.0 - 180.0
+        lats = np.degrees(np.arctan(np.sinh(np.pi * (1.0 - 2.0 * ys / n))))
+        return lons, lats
+
+    def create_tile_infos(self, batch: TileBatch) -> List[TileInfo]:
+        """将SoA瓦片批次展开为瓦片信息列表
+
+        Args:
+            batch: 瓦片批次
+
+        Returns:
+            瓦片信息列表
+        """
+        zoom = batch.z
+        return [
+            self.create_tile_info(int(x), int(y), zoom)
+            for x, y in zip(batch.xs, batch.ys)
+        ]
+
     def calculate_tiles_for_point(self, lon: float, lat: float, zoom: int, grid_size: int) -> List[TileInfo]:
         """计算点周围的瓦片
         
@@ -180,20 +337,57 @@ class BaseDownloader(ABC):
         """
         center_tile = mercantile.tile(lon, lat, zoom)
         half = grid_size // 2
-        tiles = []
-        
-        for dx in range(-half, half + 1):
-            for dy in range(-half, half + 1):
-                x = center_tile.x + dx
-                y = center_tile.y + dy
-                
-                # 检查瓦片坐标是否有效
-                max_coord = 1 << zoom
-                if 0 <= x < max_coord and 0 <= y < max_coord:
-                    tiles.append(self.create_tile_info(x, y, zoom))
-        
-        return tiles
+
+        # 网格坐标由_tile_math内核生成（numba可用时为JIT并行实现）
+        xs, ys = grid_to_tiles(center_tile.x, center_tile.y, half)
+
+        # 向量化过滤无效的瓦片坐标
+        valid = TileBatch(xs=xs, ys=ys, z=zoom).valid_mask()
+
+        return [
+            self.create_tile_info(int(x), int(y), zoom)
+            for x, y in zip(xs[valid], ys[valid])
+        ]
     
+    def is_tile_cached(self, tile_info: TileInfo) -> bool:
+        """检查瓦片是否已缓存到磁盘
+
+        优先查询内存中的LRU索引，O(1)哈希查找；
+        索引未命中时才回退到文件系统stat，并将结果记入索引。
+
+        Args:
+            tile_info: 瓦片信息
+
+        Returns:
+            瓦片文件是否存在
+        """
+        key = tile_info.key
+        if key in self._disk_index:
+            self._disk_index.move_to_end(key)
+            return True
+
+        if self.store is not None:
+            exists = self.store.contains(tile_info.x, tile_info.y, tile_info.z)
+        else:
+            exists = os.path.exists(tile_info.file_path)
+
+        if exists:
+            self._record_cached_tile(key)
+            return True
+
+        return False
+
+    def _record_cached_tile(self, key: Tuple[int, int, int]) -> None:
+        """将瓦片记入磁盘缓存索引，超出容量时淘汰最久未访问的条目
+
+        Args:
+            key: 瓦片标识 (x, y, z)
+        """
+        self._disk_index[key] = None
+        self._disk_index.move_to_end(key)
+        while len(self._disk_index) > self._disk_index_max:
+            self._disk_index.popitem(last=False)
+
     def load_cached_tile(self, tile_info: TileInfo) -> Optional[Image.Image]:
         """从缓存或文件加载瓦片
         
@@ -209,10 +403,21 @@ class BaseDownloader(ABC):
             self.monitor.update_stats('cache_hits')
             return cached_image
         
-        # 检查文件缓存
-        if os.path.exists(tile_info.file_path):
+        # 检查持久化缓存（SQLite存储或瓦片文件）
+        if self.is_tile_cached(tile_info):
             try:
-                image = Image.open(tile_info.file_path).convert('RGB')
+                if self.store is not None:
+                    data = self.store.get(tile_info.x, tile_info.y, tile_info.z)
+                    image = Image.open(BytesIO(data)).convert('RGB')
+                else:
+                    # 内存映射代替read()：解码直接走页缓存，
+                    # 省去一次整文件的堆拷贝；convert已物化像素，
+                    # 映射可随即关闭
+                    with open(tile_info.file_path, 'rb') as f:
+                        with mmap.mmap(
+                            f.fileno(), 0, access=mmap.ACCESS_READ
+                        ) as mapped:
+                            image = Image.open(mapped).convert('RGB')
                 self.cache.put(tile_info.key, image)
                 self.monitor.update_stats('cache_hits')
                 return image
@@ -230,20 +435,109 @@ class BaseDownloader(ABC):
             image: 瓦片图像
         """
         try:
-            # 保存到文件
-            os.makedirs(os.path.dirname(tile_info.file_path), exist_ok=True)
-            image.save(tile_info.file_path, 'PNG')
-            
+            if self.store is not None:
+                # 写入SQLite存储
+                buffer = BytesIO()
+                image.save(buffer, 'PNG')
+                data = buffer.getvalue()
+                self.store.put(tile_info.x, tile_info.y, tile_info.z, data)
+                file_size = len(data)
+            else:
+                # 保存到文件（目录已在初始化或批量下载前预创建）
+                image.save(tile_info.file_path, 'PNG')
+                file_size = os.path.getsize(tile_info.file_path)
+
             # 添加到缓存
             self.cache.put(tile_info.key, image)
-            
+            self._record_cached_tile(tile_info.key)
+
             # 更新统计
-            file_size = os.path.getsize(tile_info.file_path)
             self.monitor.update_stats('total_bytes', file_size)
-            
+
+            # 磁盘缓存容量控制
+            self._track_saved_tile(tile_info, file_size)
+
         except Exception as e:
             raise DownloadError(f"保存瓦片失败: {tile_info.file_path}, 错误: {str(e)}")
+
+    def save_tile_bytes(self, tile_info: TileInfo, data: bytes, image: Image.Image) -> None:
+        """直接保存下载到的PNG原始字节
+
+        服务端返回的已是PNG编码数据时，原样落盘即可，
+        跳过save_tile中PIL重新编码的CPU与内存拷贝开销。
+        文件后端先写临时文件再os.replace，保证写入原子性。
+
+        Args:
+            tile_info: 瓦片信息
+            data: PNG编码的原始字节
+            image: 已解码的瓦片图像（用于内存缓存）
+        """
+        try:
+            if self.store is not None:
+                self.store.put(tile_info.x, tile_info.y, tile_info.z, data)
+            else:
+                tmp_path = tile_info.file_path + '.tmp'
+                with open(tmp_path, 'wb') as f:
+                    f.write(memoryview(data))
+                os.replace(tmp_path, tile_info.file_path)
+
+            # 添加到缓存
+            self.cache.put(tile_info.key, image)
+            self._record_cached_tile(tile_info.key)
+
+            # 更新统计
+            self.monitor.update_stats('total_bytes', len(data))
+
+            # 磁盘缓存容量控制
+            self._track_saved_tile(tile_info, len(data))
+
+        except Exception as e:
+            raise DownloadError(f"保存瓦片失败: {tile_info.file_path}, 错误: {str(e)}")
+
+    def _track_saved_tile(self, tile_info: TileInfo, nbytes: int) -> None:
+        """记录已保存瓦片的字节数，超出缓存容量时淘汰最旧的瓦片
+
+        基于OrderedDict的O(1)淘汰：每次只弹出队首条目并删除对应文件，
+        无需扫描缓存目录。
+
+        Args:
+            tile_info: 瓦片信息
+            nbytes: 瓦片字节数
+        """
+        if self._lru_cap <= 0:
+            return
+
+        key = tile_info.key
+        self._lru_bytes += nbytes - self._lru.get(key, 0)
+        self._lru[key] = nbytes
+        self._lru.move_to_end(key)
+
+        while self._lru_bytes > self._lru_cap and self._lru:
+            (x, y, z), size = self._lru.popitem(last=False)
+            self._lru_bytes -= size
+            self._disk_index.pop((x, y, z), None)
+            try:
+                if self.store is not None:
+                    self.store.delete(x, y, z)
+                else:
+                    os.remove(self.generate_tile_path(x, y, z))
+            except OSError as e:
+                self.logger.warning(f"淘汰缓存瓦片失败: ({x}, {y}, {z}), 错误: {str(e)}")
     
+    def ensure_tile_dirs(self, tiles: List[TileInfo]) -> None:
+        """预创建批次中所有瓦片的存储目录
+
+        批量下载前一次性创建去重后的目录集合，
+        避免在每个瓦片保存时重复调用makedirs产生的系统调用开销。
+
+        Args:
+            tiles: 瓦片信息列表
+        """
+        if self.store is not None:
+            return
+        for directory in {os.path.dirname(t.file_path) for t in tiles}:
+            os.makedirs(directory, exist_ok=True)
+
     def add_random_delay(self) -> None:
         """添加随机延迟以避免被封禁"""
         min_interval, max_interval = self.config.download.request_interval_range
@@ -307,4 +601,7 @@ class BaseDownloader(ABC):
     def reset_statistics(self) -> None:
         """重置统计信息"""
         self.monitor.reset()
-        self.cache.clear()
\ No newline at end of file
+        self.cache.clear()
+        self._disk_index.clear()
+        self._lru.clear()
+        self._lru_bytes = 0
\ No newline at end of file
@@ -11,7 +11,7 @@ from typing import List, Optional
 from PIL import Image
 from io import BytesIO
 
-from .base import BaseDownloader, TileInfo, DownloadResult
+from .base import BaseDownloader, TileBatch, TileInfo, DownloadResult
 from ..utils import DownloadError
 
 
@@ -26,13 +26,14 @@ class SyncDownloader(BaseDownloader):
     - 网络异常处理完善
     """
     
-    def __init__(self, config):
+    def __init__(self, config, store=None):
         """初始化同步下载器
-        
+
         Args:
             config: 配置对象
+            store: 可选的SQLite瓦片存储
         """
-        super().__init__(config)
+        super().__init__(config, store=store)
         
         # 创建requests会话
         self.session = requests.Session()
@@ -161,9 +162,12 @@ class SyncDownloader(BaseDownloader):
                     f"瓦片: ({tile_info.x}, {tile_info.y}, {tile_info.z})"
                 )
             
-            # 保存瓦片
-            self.save_tile(tile_info, image)
-            
+            # 保存瓦片：服务端返回的PNG字节原样落盘，避免PIL重新编码
+            if content_type.startswith('image/png'):
+                self.save_tile_bytes(tile_info, image_data, image)
+            else:
+                self.save_tile(tile_info, image)
+
             return DownloadResult(
                 tile_info=tile_info,
                 success=True,
@@ -191,14 +195,20 @@ class SyncDownloader(BaseDownloader):
         """批量下载瓦片
         
         Args:
-            tiles: 瓦片信息列表
-            
+            tiles: 瓦片信息列表或TileBatch批次
+
         Returns:
             下载结果列表
         """
+        if isinstance(tiles, TileBatch):
+            tiles = self.create_tile_infos(tiles)
+
         results = []
         total_tiles = len(tiles)
-        
+
+        # 预创建存储目录，避免逐瓦片makedirs
+        self.ensure_tile_dirs(tiles)
+
         self.logger.info(f"开始下载 {total_tiles} 个瓦片")
         self.monitor.update_stats('total_downloads', total_tiles)
         
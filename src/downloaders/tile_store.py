@@ -0,0 +1,138 @@
+"""瓦片存储模块
+
+提供基于SQLite的单文件瓦片存储，替代每瓦片一个PNG文件的布局。
+大规模下载时单个数据库文件可避免数百万inode带来的文件系统元数据开销，
+热数据读取由操作系统页缓存直接命中。
+"""
+
+import sqlite3
+import threading
+from typing import Iterable, Optional, Tuple
+
+
+class SqliteTileStore:
+    """SQLite瓦片存储
+
+    以(z, x, y)为主键将瓦片二进制数据存入单个SQLite文件。
+    特点：
+    - 单文件存储，避免海量小文件
+    - WITHOUT ROWID表，主键即聚簇索引，点查一次B树查找
+    - WAL模式，读写互不阻塞
+    - 支持批量事务写入
+    """
+
+    def __init__(self, path: str):
+        """初始化瓦片存储
+
+        Args:
+            path: 数据库文件路径
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS tiles ("
+            "z INTEGER, x INTEGER, y INTEGER, data BLOB, "
+            "PRIMARY KEY (z, x, y)) WITHOUT ROWID"
+        )
+        self._conn.commit()
+
+    def put(self, x: int, y: int, z: int, data: bytes) -> None:
+        """写入单个瓦片
+
+        Args:
+            x: 瓦片X坐标
+            y: 瓦片Y坐标
+            z: 缩放级别
+            data: 瓦片二进制数据（PNG编码）
+        """
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO tiles (z, x, y, data) VALUES (?, ?, ?, ?)",
+                (z, x, y, sqlite3.Binary(data))
+            )
+            self._conn.commit()
+
+    def put_many(self, items: Iterable[Tuple[int, int, int, bytes]]) -> None:
+        """批量写入瓦片（单个事务）
+
+        Args:
+            items: (x, y, z, data)元组的可迭代对象
+        """
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO tiles (z, x, y, data) VALUES (?, ?, ?, ?)",
+                ((z, x, y, sqlite3.Binary(data)) for x, y, z, data in items)
+            )
+            self._conn.commit()
+
+    def get(self, x: int, y: int, z: int) -> Optional[bytes]:
+        """读取单个瓦片
+
+        Args:
+            x: 瓦片X坐标
+            y: 瓦片Y坐标
+            z: 缩放级别
+
+        Returns:
+            瓦片二进制数据，不存在时返回None
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT data FROM tiles WHERE z = ? AND x = ? AND y = ?",
+                (z, x, y)
+            ).fetchone()
+        return bytes(row[0]) if row else None
+
+    def contains(self, x: int, y: int, z: int) -> bool:
+        """检查瓦片是否存在
+
+        Args:
+            x: 瓦片X坐标
+            y: 瓦片Y坐标
+            z: 缩放级别
+
+        Returns:
+            瓦片是否已存储
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT 1 FROM tiles WHERE z = ? AND x = ? AND y = ?",
+                (z, x, y)
+            ).fetchone()
+        return row is not None
+
+    def delete(self, x: int, y: int, z: int) -> None:
+        """删除单个瓦片
+
+        Args:
+            x: 瓦片X坐标
+            y: 瓦片Y坐标
+            z: 缩放级别
+        """
+        with self._lock:
+            self._conn.execute(
+                "DELETE FROM tiles WHERE z = ? AND x = ? AND y = ?",
+                (z, x, y)
+            )
+            self._conn.commit()
+
+    def count(self) -> int:
+        """获取已存储的瓦片数量"""
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM tiles").fetchone()[0]
+
+    def close(self) -> None:
+        """关闭数据库连接"""
+        with self._lock:
+            self._conn.close()
+
+    def __enter__(self):
+        """上下文管理器入口"""
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """上下文管理器出口"""
+        self.close()
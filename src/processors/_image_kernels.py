@@ -0,0 +1,169 @@
+"""图像坐标变换数值计算模块
+
+提供Web墨卡托投影（地理坐标<->浮点瓦片坐标）的批量内核。
+numba可用时将内核JIT编译为并行机器码（fastmath下LLVM可生成
+向量化的三角/对数指令），否则回退到等价的NumPy ufunc实现。
+"""
+
+import math
+from functools import lru_cache
+
+import numpy as np
+
+try:
+    from numba import njit, prange
+except ImportError:
+    njit = None
+    prange = range
+
+
+@lru_cache(maxsize=16)
+def disc_masks(radius):
+    """圆形标记的填充掩码与轮廓环掩码（按半径缓存）
+
+    Args:
+        radius: 标记半径（像素）
+
+    Returns:
+        (fill_mask, ring_mask) 两个 (2r+1, 2r+1) 布尔数组，
+        分别对应实心圆盘与最外一圈轮廓
+    """
+    offsets = np.arange(-radius, radius + 1)
+    dist2 = offsets[:, None] ** 2 + offsets[None, :] ** 2
+    disc = dist2 <= radius * radius
+    fill = dist2 <= (radius - 1) * (radius - 1)
+    return fill, disc & ~fill
+
+
+def _geo_to_tile_float_py(lons, lats, zoom):
+    """批量地理坐标转浮点瓦片坐标
+
+    Args:
+        lons: 经度数组（float64）
+        lats: 纬度数组（float64）
+        zoom: 缩放级别
+
+    Returns:
+        浮点瓦片坐标数组 (tile_x, tile_y)
+    """
+    n = 2.0 ** zoom
+    total = lons.shape[0]
+    tile_x = np.empty(total, np.float64)
+    tile_y = np.empty(total, np.float64)
+    for k in prange(total):
+        tile_x[k] = (lons[k] + 180.0) / 360.0 * n
+        tile_y[k] = (
+            1.0 - math.asinh(math.tan(math.radians(lats[k]))) / math.pi
+        ) / 2.0 * n
+    return tile_x, tile_y
+
+
+def _tile_float_to_geo_py(tile_x, tile_y, zoom):
+    """批量浮点瓦片坐标转地理坐标（_geo_to_tile_float的逆变换）
+
+    Args:
+        tile_x: 浮点瓦片X坐标数组（float64）
+        tile_y: 浮点瓦片Y坐标数组（float64）
+        zoom: 缩放级别
+
+    Returns:
+        地理坐标数组 (lons, lats)
+    """
+    n = 2.0 ** zoom
+    total = tile_x.shape[0]
+    lons = np.empty(total, np.float64)
+    lats = np.empty(total, np.float64)
+    for k in prange(total):
+        lons[k] = tile_x[k] / n * 360.0 - 180.0
+        lats[k] = math.degrees(
+            math.atan(math.sinh(math.pi * (1.0 - 2.0 * tile_y[k] / n)))
+        )
+    return lons, lats
+
+
+def _stamp_markers_py(buf, xs, ys, fill_mask, ring_mask, red, green, blue):
+    """在像素缓冲区上为每个点压印圆形标记（白色轮廓）
+
+    Args:
+        buf: (H, W, 3)的uint8像素缓冲区（原地修改）
+        xs: 标记中心X坐标数组
+        ys: 标记中心Y坐标数组
+        fill_mask: 填充掩码（disc_masks产物）
+        ring_mask: 轮廓环掩码（disc_masks产物）
+        red: 填充色R分量
+        green: 填充色G分量
+        blue: 填充色B分量
+    """
+    height, width = buf.shape[0], buf.shape[1]
+    radius = fill_mask.shape[0] // 2
+    for k in prange(xs.shape[0]):
+        cx = xs[k]
+        cy = ys[k]
+        for dy in range(-radius, radius + 1):
+            y = cy + dy
+            if y < 0 or y >= height:
+                continue
+            for dx in range(-radius, radius + 1):
+                x = cx + dx
+                if x < 0 or x >= width:
+                    continue
+                if fill_mask[dy + radius, dx + radius]:
+                    buf[y, x, 0] = red
+                    buf[y, x, 1] = green
+                    buf[y, x, 2] = blue
+                elif ring_mask[dy + radius, dx + radius]:
+                    buf[y, x, 0] = 255
+                    buf[y, x, 1] = 255
+                    buf[y, x, 2] = 255
+
+
+if njit is not None:
+    # 显式签名使内核在声明处即时编译并随cache=True落盘，
+    # 省去首次调用的类型推断与编译延迟
+    stamp_markers = njit(
+        'void(uint8[:, :, :], int32[:], int32[:], '
+        'boolean[:, :], boolean[:, :], int64, int64, int64)',
+        cache=True, parallel=True
+    )(_stamp_markers_py)
+    geo_to_tile_float = njit(
+        'UniTuple(float64[:], 2)(float64[:], float64[:], int64)',
+        cache=True, fastmath=True, parallel=True
+    )(_geo_to_tile_float_py)
+    tile_float_to_geo = njit(
+        'UniTuple(float64[:], 2)(float64[:], float64[:], int64)',
+        cache=True, fastmath=True, parallel=True
+    )(_tile_float_to_geo_py)
+else:
+    def geo_to_tile_float(lons, lats, zoom):
+        """NumPy回退实现，语义与JIT版本一致"""
+        n = 2.0 ** zoom
+        tile_x = (lons + 180.0) / 360.0 * n
+        tile_y = (1.0 - np.arcsinh(np.tan(np.radians(lats))) / np.pi) / 2.0 * n
+        return tile_x, tile_y
+
+    def tile_float_to_geo(tile_x, tile_y, zoom):
+        """NumPy回退实现，语义与JIT版本一致"""
+        n = 2.0 ** zoom
+        lons = tile_x / n * 360.0 - 180.0
+        lats = np.degrees(
+            np.arctan(np.sinh(np.pi * (1.0 - 2.0 * tile_y / n)))
+        )
+        return lons, lats
+
+    def stamp_markers(buf, xs, ys, fill_mask, ring_mask, red, green, blue):
+        """NumPy回退实现：逐点裁剪切片后整块掩码赋值"""
+        height, width = buf.shape[0], buf.shape[1]
+        radius = fill_mask.shape[0] // 2
+        for cx, cy in zip(xs, ys):
+            top, left = cy - radius, cx - radius
+            y0, y1 = max(0, top), min(height, cy + radius + 1)
+            x0, x1 = max(0, left), min(width, cx + radius + 1)
+            if y0 >= y1 or x0 >= x1:
+                continue
+            window = buf[y0:y1, x0:x1]
+            window[fill_mask[y0 - top:y1 - top, x0 - left:x1 - left]] = (
+                red, green, blue
+            )
+            window[ring_mask[y0 - top:y1 - top, x0 - left:x1 - left]] = (
+                255, 255, 255
+            )
@@ -5,28 +5,42 @@
 """
 
 import os
+import json
+import warnings
 from abc import ABC, abstractmethod
 from typing import List, Dict, Any, Tuple, Optional
 from dataclasses import dataclass
 import geopandas as gpd
+import numpy as np
 import pandas as pd
 from shapely.geometry import Point, Polygon
 from pyproj import Transformer
 
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
 from ..utils import ValidationError, DataProcessingError, validate_shapefile
+from ._geo_kernels import haversine, haversine_vector, pairwise_haversine
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class GeoPoint:
-    """地理点数据类"""
+    """地理点数据类
+
+    不可变并启用slots：去掉每实例的__dict__以降低内存占用，
+    数据集达百万点级时逐点节省会累积成量级差异。
+    """
     longitude: float
     latitude: float
     properties: Dict[str, Any] = None
     index: int = None
-    
+
     def __post_init__(self):
         if self.properties is None:
-            self.properties = {}
+            # frozen禁止常规赋值，默认值初始化需绕过__setattr__
+            object.__setattr__(self, 'properties', {})
     
     def to_dict(self) -> Dict[str, Any]:
         """转换为字典"""
@@ -44,10 +58,39 @@ class GeoPoint:
             -90 <= self.latitude <= 90
         )
 
+    def distance_to(self, other: 'GeoPoint') -> float:
+        """计算到另一点的大圆距离
+
+        Args:
+            other: 目标地理点
+
+        Returns:
+            haversine大圆距离（公里）
+        """
+        # 显式转float，避免Decimal等对象类型进入编译内核
+        return haversine(
+            float(self.latitude), float(self.longitude),
+            float(other.latitude), float(other.longitude)
+        )
+
+    def distance_to_array(self, lons, lats):
+        """计算到一批点的大圆距离（向量化）
+
+        Args:
+            lons: 目标点经度数组
+            lats: 目标点纬度数组
+
+        Returns:
+            距离数组（公里），形状与输入一致
+        """
+        return haversine_vector(
+            float(self.latitude), float(self.longitude), lats, lons
+        )
+
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class GeoBounds:
-    """地理边界数据类"""
+    """地理边界数据类（不可变，slots布局）"""
     min_lon: float
     min_lat: float
     max_lon: float
@@ -59,7 +102,48 @@ class GeoBounds:
             self.min_lon <= point.longitude <= self.max_lon and
             self.min_lat <= point.latitude <= self.max_lat
         )
+
+    def contains_points(self, lons, lats):
+        """批量检查点是否在边界内（向量化）
+
+        一条布尔ufunc表达式完成全部比较，
+        替代逐点构造GeoPoint再做Python层分支。
+
+        Args:
+            lons: 经度数组
+            lats: 纬度数组
+
+        Returns:
+            布尔数组，形状与输入一致
+        """
+        lons = np.asarray(lons, dtype=np.float64)
+        lats = np.asarray(lats, dtype=np.float64)
+        return (
+            (lons >= self.min_lon) & (lons <= self.max_lon)
+            & (lats >= self.min_lat) & (lats <= self.max_lat)
+        )
     
+    def filter_points(self, points: 'GeoPointArray') -> 'GeoPointArray':
+        """筛选边界内的点（向量化）
+
+        先对整批坐标做一趟contains_points掩码，
+        再按掩码一次性切出子集，代替逐点contains_point循环。
+
+        Args:
+            points: 地理点数组
+
+        Returns:
+            仅包含边界内点的新地理点数组
+        """
+        mask = self.contains_points(points.lons, points.lats)
+        keep = np.flatnonzero(mask)
+        return GeoPointArray(
+            lons=points.lons[mask],
+            lats=points.lats[mask],
+            properties=[points.properties[i] for i in keep],
+            indices=[points.indices[i] for i in keep]
+        )
+
     def expand(self, margin: float = 0.001) -> 'GeoBounds':
         """扩展边界"""
         return GeoBounds(
@@ -74,6 +158,60 @@ class GeoBounds:
         return (self.max_lon - self.min_lon) * (self.max_lat - self.min_lat)
 
 
+class GeoPointArray:
+    """地理点数组（SoA布局）
+
+    坐标保存为两个连续的float64数组，属性与原始索引保持列表。
+    对外提供len/下标/迭代的序列接口，按需物化GeoPoint对象，
+    既兼容按列表使用的既有调用方，又允许下游直接在
+    lons/lats数组上做向量化运算。
+    """
+
+    __slots__ = ('lons', 'lats', 'properties', 'indices')
+
+    def __init__(self, lons, lats, properties=None, indices=None):
+        self.lons = np.asarray(lons, dtype=np.float64)
+        self.lats = np.asarray(lats, dtype=np.float64)
+        n = self.lons.shape[0]
+        self.properties = (
+            properties if properties is not None else [{} for _ in range(n)]
+        )
+        self.indices = (
+            list(indices) if indices is not None else list(range(n))
+        )
+
+    def __len__(self) -> int:
+        return self.lons.shape[0]
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            return GeoPointArray(
+                self.lons[key], self.lats[key],
+                self.properties[key], self.indices[key]
+            )
+        return GeoPoint(
+            longitude=float(self.lons[key]),
+            latitude=float(self.lats[key]),
+            properties=self.properties[key],
+            index=self.indices[key]
+        )
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def pairwise_distances(self) -> np.ndarray:
+        """计算数组内所有点的两两大圆距离矩阵
+
+        外层循环跨核并行（numba可用时），
+        代替O(N^2)次Python层distance_to调用。
+
+        Returns:
+            (N, N)的对称距离矩阵（公里）
+        """
+        return pairwise_haversine(self.lats, self.lons)
+
+
 class BaseDataLoader(ABC):
     """数据加载器基类"""
     
@@ -148,6 +286,57 @@ class BaseDataLoader(ABC):
             return self.transformer.transform(x, y)
         return x, y
 
+    def _extract_points(self, gdf) -> 'GeoPointArray':
+        """从GeoDataFrame向量化提取地理点
+
+        质心、坐标抽取、坐标转换和有效性过滤都在C层整列完成，
+        避免iterrows逐行产生Series与shapely对象拆包的开销。
+
+        Args:
+            gdf: 已加载的GeoDataFrame
+
+        Returns:
+            有效地理点数组（SoA布局，支持序列接口）
+        """
+        # 质心对点几何就是其自身，统一走一次C层centroid调用。
+        # 与旧逐行实现一致地在度坐标下取质心，屏蔽geopandas的重投影提示
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', UserWarning)
+            centroids = gdf.geometry.centroid
+        xs = centroids.x.to_numpy(dtype=np.float64)
+        ys = centroids.y.to_numpy(dtype=np.float64)
+
+        # 坐标转换（pyproj的transform原生支持数组）
+        if self.transformer:
+            lons, lats = self.transformer.transform(xs, ys)
+        else:
+            lons, lats = xs, ys
+
+        # 有效性过滤（NaN坐标的空几何在比较中自然为False）
+        valid = (
+            (lons >= -180.0) & (lons <= 180.0)
+            & (lats >= -90.0) & (lats <= 90.0)
+        )
+
+        # 属性整表转记录字典，pandas特殊值统一替换为None
+        attrs = gdf.drop(columns=gdf.geometry.name)
+        attrs = attrs.astype(object).where(pd.notna(attrs), None)
+        records = attrs.to_dict(orient='records')
+
+        index_values = gdf.index.to_numpy()
+
+        for i in np.flatnonzero(~valid):
+            self.logger.warning(
+                f"跳过无效坐标: ({lons[i]}, {lats[i]}) at index {index_values[i]}"
+            )
+
+        return GeoPointArray(
+            lons=lons[valid],
+            lats=lats[valid],
+            properties=[records[i] for i in np.flatnonzero(valid)],
+            indices=[int(i) for i in index_values[valid]]
+        )
+
 
 class ShapefileLoader(BaseDataLoader):
     """Shapefile加载器"""
@@ -300,25 +489,41 @@ class GeoJSONLoader(BaseDataLoader):
         try:
             if not os.path.exists(file_path):
                 return False
-            
+
             if not file_path.lower().endswith(('.geojson', '.json')):
                 return False
-            
-            # 尝试读取文件
-            gdf = gpd.read_file(file_path)
-            return not gdf.empty
-            
+
+            # 流式验证：发现第一个feature即返回，
+            # 避免仅为验证就完整构建GeoDataFrame（load_points随后还要再读一次）
+            if ijson is not None:
+                with open(file_path, 'rb') as f:
+                    for _ in ijson.items(f, 'features.item'):
+                        return True
+                # 无features数组时回头检查顶层type，
+                # 与json回退分支一样接受单个Feature
+                with open(file_path, 'rb') as f:
+                    for value in ijson.items(f, 'type'):
+                        return value == 'Feature'
+                return False
+
+            # ijson不可用时退化为标准json解析（仍远轻于gpd.read_file）
+            with open(file_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('type') == 'Feature':
+                return True
+            return bool(data.get('features'))
+
         except Exception:
             return False
     
-    def load_points(self, file_path: str) -> List[GeoPoint]:
+    def load_points(self, file_path: str) -> GeoPointArray:
         """加载GeoJSON中的点数据
-        
+
         Args:
             file_path: GeoJSON路径
-            
+
         Returns:
-            地理点列表
+            地理点数组（兼容列表接口）
         """
         if not self.validate_file(file_path):
             raise ValidationError(f"无效的GeoJSON文件: {file_path}")
@@ -331,65 +536,19 @@ class GeoJSONLoader(BaseDataLoader):
                 raise DataProcessingError("GeoJSON为空")
             
             self.logger.info(f"加载GeoJSON: {file_path}, 记录数: {len(gdf)}")
-            
+
             # 设置坐标转换
             source_crs = str(gdf.crs) if gdf.crs else "EPSG:4326"
             self._setup_transformer(source_crs)
-            
-            points = []
-            
-            for idx, row in gdf.iterrows():
-                geometry = row.geometry
-                
-                # 处理不同的几何类型
-                if isinstance(geometry, Point):
-                    x, y = geometry.x, geometry.y
-                elif hasattr(geometry, 'centroid'):
-                    # 对于多边形等，使用质心
-                    centroid = geometry.centroid
-                    x, y = centroid.x, centroid.y
-                    self.logger.debug(f"使用几何体质心: {geometry.geom_type}")
-                else:
-                    self.logger.warning(f"跳过不支持的几何类型: {type(geometry)}")
-                    continue
-                
-                # 坐标转换
-                lon, lat = self._transform_coordinates(x, y)
-                
-                # 创建属性字典（排除几何列）
-                properties = {}
-                for col in gdf.columns:
-                    if col != gdf.geometry.name:
-                        value = row[col]
-                        # 处理pandas特殊值
-                        if pd.isna(value):
-                            properties[col] = None
-                        else:
-                            properties[col] = value
-                
-                # 创建地理点
-                point = GeoPoint(
-                    longitude=lon,
-                    latitude=lat,
-                    properties=properties,
-                    index=idx
-                )
-                
-                # 验证坐标
-                if not point.validate():
-                    self.logger.warning(
-                        f"跳过无效坐标: ({lon}, {lat}) at index {idx}"
-                    )
-                    continue
-                
-                points.append(point)
-            
+
+            points = self._extract_points(gdf)
+
             if not points:
                 raise DataProcessingError("没有有效的地理点数据")
-            
+
             self.logger.info(f"成功加载 {len(points)} 个有效地理点")
             return points
-            
+
         except Exception as e:
             if isinstance(e, (ValidationError, DataProcessingError)):
                 raise
@@ -4,6 +4,7 @@
 提供统一的数据处理接口。
 """
 
+import os
 import time
 from datetime import datetime
 from typing import List, Dict, Any, Optional, Tuple
@@ -48,6 +49,10 @@ class DataProcessor:
         
         # 进度报告器
         self.progress_reporter = ProgressReporter(config.logger)
+
+        # 时间估算的点数缓存：(文件路径, mtime) -> 点数，
+        # 避免估算与实际处理连续调用时重复解析输入文件
+        self._point_count_cache: Dict[Tuple[str, float], int] = {}
     
     def process_dataset(self, input_file: str) -> Dict[str, Any]:
         """处理整个数据集
@@ -416,10 +421,15 @@ class DataProcessor:
             时间估算信息
         """
         try:
-            # 加载点数据
-            points = self.data_loader.load_points(input_file, self.config)
-            total_points = len(points)
-            
+            # 点数只与文件内容有关，按(路径, mtime)记忆化，
+            # 第二次估算同一文件时跳过完整解析
+            cache_key = (input_file, os.path.getmtime(input_file))
+            total_points = self._point_count_cache.get(cache_key)
+            if total_points is None:
+                points = self.data_loader.load_points(input_file, self.config)
+                total_points = len(points)
+                self._point_count_cache[cache_key] = total_points
+
             # 计算总瓦片数
             tiles_per_point = self.config.download.grid_size ** 2
             total_tiles = total_points * tiles_per_point
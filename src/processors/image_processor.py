@@ -5,19 +5,41 @@
 
 import math
 import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from typing import List, Tuple, Dict, Optional
 from dataclasses import dataclass
 from PIL import Image, ImageDraw, ImageFont
 import numpy as np
 
 from .data_loader import GeoPoint
+from ._image_kernels import (
+    disc_masks, geo_to_tile_float, stamp_markers, tile_float_to_geo
+)
 from ..downloaders.base import TileInfo, DownloadResult
 from ..utils import DataProcessingError
 
 
-@dataclass
+@lru_cache(maxsize=32)
+def _zoom_constants(zoom: int) -> Tuple[float, float]:
+    """按缩放级别缓存的Web墨卡托常数
+
+    单次处理中zoom固定，逐点重算2**zoom纯属浪费；
+    倒数一并缓存，把内层的除法换成乘法（2的幂次下结果精确相同）。
+
+    Args:
+        zoom: 缩放级别
+
+    Returns:
+        (n, 1/n)，n为该级别下的瓦片边数2**zoom
+    """
+    n = float(1 << zoom)
+    return n, 1.0 / n
+
+
+@dataclass(frozen=True, slots=True)
 class PixelCoordinate:
-    """像素坐标"""
+    """像素坐标（不可变，slots布局）"""
     x: float
     y: float
     
@@ -27,8 +49,46 @@ class PixelCoordinate:
 
 
 @dataclass
+class PixelCoordinateArray:
+    """像素坐标批次（SoA布局）
+
+    以两个int32连续数组表示一批像素坐标，代替Python int对象列表：
+    内存占用减半（相对int64），可直接传给压印内核。
+    """
+    xs: np.ndarray
+    ys: np.ndarray
+
+    @classmethod
+    def from_coordinate_dicts(
+        cls, coordinates: List[Dict[str, any]]
+    ) -> 'PixelCoordinateArray':
+        """从像素坐标信息字典列表构建批次
+
+        Args:
+            coordinates: ImageMetadata.pixel_coordinates格式的字典列表
+
+        Returns:
+            像素坐标批次
+        """
+        count = len(coordinates)
+        xs = np.fromiter(
+            (int(c['pixel_x']) for c in coordinates),
+            dtype=np.int32, count=count
+        )
+        ys = np.fromiter(
+            (int(c['pixel_y']) for c in coordinates),
+            dtype=np.int32, count=count
+        )
+        return cls(xs=xs, ys=ys)
+
+    def __len__(self) -> int:
+        """批次中的坐标数量"""
+        return len(self.xs)
+
+
+@dataclass(frozen=True, slots=True)
 class ImageMetadata:
-    """图像元数据"""
+    """图像元数据（不可变，slots布局）"""
     width: int
     height: int
     zoom_level: int
@@ -62,6 +122,9 @@ class TileMerger:
         self.config = config
         self.logger = config.logger
         self.tile_size = 256  # Google Maps瓦片标准尺寸
+        self._missing_tile_array: Optional[np.ndarray] = None
+        # 瓦片解码线程池（懒创建）：PNG解码释放GIL，可跨瓦片并行
+        self._decode_pool: Optional[ThreadPoolExecutor] = None
     
     def merge_tiles(self, 
                    download_results: List[DownloadResult], 
@@ -77,20 +140,42 @@ class TileMerger:
         Returns:
             合并后的图像
         """
-        # 计算输出图像尺寸
-        output_width = grid_size * self.tile_size
-        output_height = grid_size * self.tile_size
-        
-        # 创建输出图像
-        merged_image = Image.new('RGB', (output_width, output_height), (0, 0, 0))
-        
+        tile_size = self.tile_size
+
         # 创建瓦片位置映射
         tile_map = {}
         for result in download_results:
             if result.success and result.image:
                 tile_info = result.tile_info
                 tile_map[(tile_info.x, tile_info.y)] = result.image
-        
+
+        # 快速路径：整个网格都缺失时直接惰性生成纯灰图像，
+        # 跳过逐格写占位模板和解码流程
+        if not tile_map:
+            side = grid_size * tile_size
+            self.logger.info(
+                f"瓦片合并完成: 0/{grid_size * grid_size} 成功, "
+                f"{grid_size * grid_size} 缺失"
+            )
+            self.logger.warning("所有瓦片缺失，返回灰色占位图像")
+            return Image.fromarray(np.full((side, side, 3), 128, dtype=np.uint8))
+
+        # 特化快速路径：1x1网格的整图就是中心瓦片本身，
+        # 解码结果直接成图，省掉拼接缓冲区和块拷贝
+        if grid_size == 1:
+            tile_image = tile_map.get((center_tile.x, center_tile.y))
+            if tile_image is not None:
+                self.logger.info("瓦片合并完成: 1/1 成功, 0 缺失")
+                return Image.fromarray(self._decode_tile(tile_image))
+
+        # 单块连续缓冲区代替Image.new加逐块paste：
+        # 每个瓦片解码后直接写入对应切片，整图只分配和遍历一次
+        buffer = np.empty(
+            (grid_size * tile_size, grid_size * tile_size, 3), dtype=np.uint8
+        )
+        # 分块视图：[grid_y, grid_x]直接寻址对应瓦片的内存块
+        tiled = self._to_tiled(buffer, tile_size)
+
         # 计算网格起始位置
         half_grid = grid_size // 2
         start_x = center_tile.x - half_grid
@@ -100,36 +185,40 @@ class TileMerger:
         successful_tiles = 0
         missing_tiles = []
         
+        present = []
         for grid_y in range(grid_size):
             for grid_x in range(grid_size):
                 tile_x = start_x + grid_x
                 tile_y = start_y + grid_y
-                
-                # 计算在输出图像中的位置
-                pixel_x = grid_x * self.tile_size
-                pixel_y = grid_y * self.tile_size
-                
-                # 获取瓦片图像
+
                 tile_image = tile_map.get((tile_x, tile_y))
-                
                 if tile_image:
-                    # 确保瓦片尺寸正确
-                    if tile_image.size != (self.tile_size, self.tile_size):
-                        tile_image = tile_image.resize(
-                            (self.tile_size, self.tile_size), 
-                            Image.Resampling.LANCZOS
-                        )
-                    
-                    # 粘贴瓦片
-                    merged_image.paste(tile_image, (pixel_x, pixel_y))
-                    successful_tiles += 1
+                    present.append((grid_x, grid_y, tile_image))
                 else:
-                    # 记录缺失的瓦片
+                    # 记录缺失的瓦片，写入灰色占位模板
                     missing_tiles.append((tile_x, tile_y))
-                    
-                    # 用灰色填充缺失的瓦片
-                    self._fill_missing_tile(merged_image, pixel_x, pixel_y)
-        
+                    tiled[grid_y, grid_x] = self._missing_tile_template()
+
+        # 解码并行化：PIL的PNG解码释放GIL，瓦片间互不依赖；
+        # 少量瓦片直接串行，省去任务分发开销
+        if len(present) > 2:
+            if self._decode_pool is None:
+                self._decode_pool = ThreadPoolExecutor(
+                    max_workers=os.cpu_count()
+                )
+            arrays = list(self._decode_pool.map(
+                lambda cell: self._decode_tile(cell[2]), present
+            ))
+        else:
+            arrays = [self._decode_tile(img) for _, _, img in present]
+
+        # 把解码结果写入预分配缓冲区的对应切片
+        for (grid_x, grid_y, _), array in zip(present, arrays):
+            tiled[grid_y, grid_x] = array
+            successful_tiles += 1
+
+        merged_image = Image.fromarray(buffer)
+
         # 记录合并统计
         total_tiles = grid_size * grid_size
         self.logger.info(
@@ -141,18 +230,82 @@ class TileMerger:
             self.logger.warning(f"缺失瓦片坐标: {missing_tiles[:10]}{'...' if len(missing_tiles) > 10 else ''}")
         
         return merged_image
-    
+
+    def close(self) -> None:
+        """关闭解码线程池
+
+        线程池跨多次merge_tiles复用，由持有者在处理结束时
+        显式关闭；重复调用安全。
+        """
+        if self._decode_pool is not None:
+            self._decode_pool.shutdown(wait=False)
+            self._decode_pool = None
+
+    def __del__(self):
+        """析构函数"""
+        self.close()
+
+    @staticmethod
+    def _to_tiled(buffer: np.ndarray, block: int) -> np.ndarray:
+        """把(H, W, 3)缓冲区重解释为分块布局的零拷贝视图
+
+        返回形状(H//block, W//block, block, block, 3)的视图，
+        [gy, gx]直接寻址一个图块；写入会落到同一块连续内存，
+        省去每次手工计算双切片的行列偏移。
+
+        Args:
+            buffer: 线性像素缓冲区（H、W须为block的整数倍）
+            block: 块边长（像素）
+
+        Returns:
+            分块视图（与输入共享内存）
+        """
+        height, width = buffer.shape[0], buffer.shape[1]
+        return buffer.reshape(
+            height // block, block, width // block, block, 3
+        ).swapaxes(1, 2)
+
+    def _decode_tile(self, tile_image: Image.Image) -> np.ndarray:
+        """把单个瓦片解码为标准尺寸的RGB像素数组
+
+        Args:
+            tile_image: 瓦片图像
+
+        Returns:
+            (tile_size, tile_size, 3)的uint8数组
+        """
+        if tile_image.size != (self.tile_size, self.tile_size):
+            tile_image = tile_image.resize(
+                (self.tile_size, self.tile_size),
+                Image.Resampling.LANCZOS
+            )
+        if tile_image.mode != 'RGB':
+            tile_image = tile_image.convert('RGB')
+        return np.asarray(tile_image, dtype=np.uint8)
+
     def _fill_missing_tile(self, image: Image.Image, x: int, y: int):
         """填充缺失的瓦片
-        
+
         Args:
             image: 目标图像
             x: X坐标
             y: Y坐标
         """
+        gray_tile = Image.fromarray(self._missing_tile_template())
+        image.paste(gray_tile, (x, y))
+
+    def _missing_tile_template(self) -> np.ndarray:
+        """缺失瓦片的灰色占位模板（只构建一次并缓存）
+
+        Returns:
+            带"MISSING"标记的灰色瓦片像素数组
+        """
+        if self._missing_tile_array is not None:
+            return self._missing_tile_array
+
         # 创建灰色瓦片
         gray_tile = Image.new('RGB', (self.tile_size, self.tile_size), (128, 128, 128))
-        
+
         # 添加"缺失"文字标记
         try:
             draw = ImageDraw.Draw(gray_tile)
@@ -179,9 +332,9 @@ class TileMerger:
         
         except Exception as e:
             self.logger.debug(f"添加缺失瓦片标记失败: {str(e)}")
-        
-        # 粘贴到目标图像
-        image.paste(gray_tile, (x, y))
+
+        self._missing_tile_array = np.asarray(gray_tile, dtype=np.uint8)
+        return self._missing_tile_array
 
 
 class ImageProcessor:
@@ -194,8 +347,12 @@ class ImageProcessor:
         self.config = config
         self.logger = config.logger
         self.tile_merger = TileMerger(config)
-    
-    def process_point_image(self, 
+
+    def close(self) -> None:
+        """释放持有的瓦片合并器资源"""
+        self.tile_merger.close()
+
+    def process_point_image(self,
                           point: GeoPoint, 
                           download_results: List[DownloadResult],
                           zoom_level: int,
@@ -240,7 +397,7 @@ class ImageProcessor:
             瓦片坐标 (x, y)
         """
         lat_rad = math.radians(lat)
-        n = 2.0 ** zoom
+        n, _ = _zoom_constants(zoom)
         x = int((lon + 180.0) / 360.0 * n)
         y = int((1.0 - math.asinh(math.tan(lat_rad)) / math.pi) / 2.0 * n)
         return x, y
@@ -256,42 +413,79 @@ class ImageProcessor:
         Returns:
             地理坐标 (lon, lat)
         """
-        n = 2.0 ** zoom
-        lon = x / n * 360.0 - 180.0
-        lat_rad = math.atan(math.sinh(math.pi * (1 - 2 * y / n)))
+        _, inv_n = _zoom_constants(zoom)
+        lon = x * inv_n * 360.0 - 180.0
+        lat_rad = math.atan(math.sinh(math.pi * (1 - 2 * y * inv_n)))
         lat = math.degrees(lat_rad)
         return lon, lat
     
     def _geo_to_pixel(self, point: GeoPoint, center_tile: TileInfo, grid_size: int) -> PixelCoordinate:
-        """地理坐标转像素坐标
-        
+        """地理坐标转像素坐标（标量，单元素数组包装）
+
         Args:
             point: 地理点
             center_tile: 中心瓦片
             grid_size: 网格大小
-            
+
         Returns:
             像素坐标
         """
-        # 计算点的瓦片坐标（浮点数）
-        point_tile_x, point_tile_y = self._geo_to_tile_float(
-            point.longitude, point.latitude, center_tile.z
+        xs, ys = self.geo_to_pixel_array(
+            np.asarray([point.longitude]), np.asarray([point.latitude]),
+            center_tile, grid_size
         )
-        
-        # 计算网格起始瓦片坐标
+        return PixelCoordinate(float(xs[0]), float(ys[0]))
+
+    def geo_to_pixel_array(self, lons, lats,
+                           center_tile: TileInfo,
+                           grid_size: int) -> Tuple[np.ndarray, np.ndarray]:
+        """批量地理坐标转像素坐标（向量化）
+
+        Web墨卡托投影与网格偏移整个数组一趟算完，
+        循环留在C层而不是Python层。
+
+        Args:
+            lons: 经度数组
+            lats: 纬度数组
+            center_tile: 中心瓦片
+            grid_size: 网格大小
+
+        Returns:
+            像素坐标数组 (xs, ys)
+        """
+        lons = np.asarray(lons, dtype=np.float64)
+        lats = np.asarray(lats, dtype=np.float64)
+
+        # 浮点瓦片坐标（JIT/NumPy内核）
+        tile_x, tile_y = geo_to_tile_float(lons, lats, center_tile.z)
+
+        # 相对网格起始瓦片的偏移，换算为像素
         half_grid = grid_size // 2
-        start_tile_x = center_tile.x - half_grid
-        start_tile_y = center_tile.y - half_grid
-        
-        # 计算在网格中的相对位置
-        relative_tile_x = point_tile_x - start_tile_x
-        relative_tile_y = point_tile_y - start_tile_y
-        
-        # 转换为像素坐标
-        pixel_x = relative_tile_x * 256
-        pixel_y = relative_tile_y * 256
-        
-        return PixelCoordinate(pixel_x, pixel_y)
+        pixel_x = (tile_x - (center_tile.x - half_grid)) * 256
+        pixel_y = (tile_y - (center_tile.y - half_grid)) * 256
+        return pixel_x, pixel_y
+
+    def pixel_to_geo_array(self, xs, ys,
+                           center_tile: TileInfo,
+                           grid_size: int) -> Tuple[np.ndarray, np.ndarray]:
+        """批量像素坐标转地理坐标（向量化，geo_to_pixel_array的逆变换）
+
+        Args:
+            xs: 像素X坐标数组
+            ys: 像素Y坐标数组
+            center_tile: 中心瓦片
+            grid_size: 网格大小
+
+        Returns:
+            地理坐标数组 (lons, lats)
+        """
+        xs = np.asarray(xs, dtype=np.float64)
+        ys = np.asarray(ys, dtype=np.float64)
+
+        half_grid = grid_size // 2
+        tile_x = xs / 256.0 + (center_tile.x - half_grid)
+        tile_y = ys / 256.0 + (center_tile.y - half_grid)
+        return tile_float_to_geo(tile_x, tile_y, center_tile.z)
     
     def _geo_to_tile_float(self, lon: float, lat: float, zoom: int) -> Tuple[float, float]:
         """地理坐标转浮点瓦片坐标
@@ -305,7 +499,7 @@ class ImageProcessor:
             浮点瓦片坐标 (x, y)
         """
         lat_rad = math.radians(lat)
-        n = 2.0 ** zoom
+        n, _ = _zoom_constants(zoom)
         x = (lon + 180.0) / 360.0 * n
         y = (1.0 - math.asinh(math.tan(lat_rad)) / math.pi) / 2.0 * n
         return x, y
@@ -386,24 +580,21 @@ class ImageProcessor:
         Returns:
             添加标记后的图像
         """
-        # 创建图像副本
-        marked_image = image.copy()
-        draw = ImageDraw.Draw(marked_image)
-        
-        # 添加点标记
-        for coord_info in metadata.pixel_coordinates:
-            x = coord_info['pixel_x']
-            y = coord_info['pixel_y']
-            
-            # 绘制圆形标记
-            left = x - marker_size
-            top = y - marker_size
-            right = x + marker_size
-            bottom = y + marker_size
-            
-            draw.ellipse([left, top, right, bottom], fill=marker_color, outline=(255, 255, 255), width=1)
-        
-        return marked_image
+        # 在像素缓冲区上批量压印预计算的圆盘掩码，
+        # 避免为每个点创建ImageDraw并逐点光栅化椭圆
+        buffer = np.array(image.convert('RGB'), dtype=np.uint8)
+
+        coords = PixelCoordinateArray.from_coordinate_dicts(
+            metadata.pixel_coordinates
+        )
+
+        fill_mask, ring_mask = disc_masks(marker_size)
+        stamp_markers(
+            buffer, coords.xs, coords.ys, fill_mask, ring_mask,
+            marker_color[0], marker_color[1], marker_color[2]
+        )
+
+        return Image.fromarray(buffer)
     
     def resize_image(self, image: Image.Image, target_size: Tuple[int, int], 
                     resample: Image.Resampling = Image.Resampling.LANCZOS) -> Image.Image:
@@ -6,20 +6,28 @@
 
 import json
 import os
-import csv
 from datetime import datetime
 from typing import Dict, List, Any, Optional
 from dataclasses import dataclass, asdict
 from pathlib import Path
 
+import pandas as pd
+
 from .image_processor import ImageMetadata
 from .data_loader import GeoPoint
 from ..utils import DataProcessingError, ensure_directory
 
+# orjson为可选依赖：C层直接序列化dataclass与NumPy标量，
+# 不经过to_dict/asdict物化的中间字典树
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class ProcessingStats:
-    """处理统计信息"""
+    """处理统计信息（不可变，slots布局）"""
     total_points: int
     successful_points: int
     failed_points: int
@@ -43,9 +51,9 @@ class ProcessingStats:
         return self.successful_tiles / self.total_tiles * 100
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class DatasetMetadata:
-    """数据集元数据"""
+    """数据集元数据（不可变，slots布局）"""
     dataset_name: str
     creation_time: str
     source_file: str
@@ -109,8 +117,17 @@ class MetadataManager:
     
     def _save_json_metadata(self, metadata: ImageMetadata, file_path: Path):
         """保存JSON格式元数据"""
-        with open(file_path, 'w', encoding='utf-8') as f:
-            json.dump(metadata.to_dict(), f, indent=2, ensure_ascii=False)
+        if orjson is not None:
+            # ImageMetadata及嵌套的GeoPoint都是dataclass，
+            # 字段与to_dict输出一一对应，可整树直接序列化
+            with open(file_path, 'wb') as f:
+                f.write(orjson.dumps(
+                    metadata,
+                    option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY
+                ))
+        else:
+            with open(file_path, 'w', encoding='utf-8') as f:
+                json.dump(metadata.to_dict(), f, indent=2, ensure_ascii=False)
     
     def _save_yaml_metadata(self, metadata: ImageMetadata, file_path: Path):
         """保存YAML格式元数据"""
@@ -223,15 +240,12 @@ class MetadataManager:
         mapping_file = self.output_dir / "coordinate_mapping.json"
         
         try:
-            # 创建坐标映射
+            # 像素坐标在生成各图像元数据时已由向量化内核批量算好，
+            # 这里只剩条目组装与序列化：单个推导式一次建完映射列表
             coordinate_mapping = {
                 'total_points': len(image_metadatas),
-                'mappings': []
-            }
-            
-            for i, metadata in enumerate(image_metadatas):
-                for coord_info in metadata.pixel_coordinates:
-                    mapping_entry = {
+                'mappings': [
+                    {
                         'image_index': i,
                         'image_file': f"point_{coord_info['point_index']:06d}.png",
                         'point_index': coord_info['point_index'],
@@ -245,12 +259,24 @@ class MetadataManager:
                         },
                         'properties': coord_info.get('properties', {})
                     }
-                    coordinate_mapping['mappings'].append(mapping_entry)
-            
-            # 保存文件
-            with open(mapping_file, 'w', encoding='utf-8') as f:
-                json.dump(coordinate_mapping, f, indent=2, ensure_ascii=False)
-            
+                    for i, metadata in enumerate(image_metadatas)
+                    for coord_info in metadata.pixel_coordinates
+                ]
+            }
+
+            # 保存文件：整棵树只序列化一次，优先走orjson的C实现
+            if orjson is not None:
+                with open(mapping_file, 'wb') as f:
+                    f.write(orjson.dumps(
+                        coordinate_mapping,
+                        option=(orjson.OPT_INDENT_2
+                                | orjson.OPT_SERIALIZE_NUMPY)
+                    ))
+            else:
+                with open(mapping_file, 'w', encoding='utf-8') as f:
+                    json.dump(coordinate_mapping, f, indent=2,
+                              ensure_ascii=False)
+
             self.logger.info(f"创建坐标映射文件: {mapping_file}")
             return str(mapping_file)
             
@@ -268,40 +294,40 @@ class MetadataManager:
         """
         csv_file = self.output_dir / "dataset_export.csv"
         
+        headers = [
+            'image_file', 'point_index', 'longitude', 'latitude',
+            'pixel_x', 'pixel_y', 'image_width', 'image_height',
+            'zoom_level', 'grid_size', 'min_lon', 'min_lat',
+            'max_lon', 'max_lat'
+        ]
+
         try:
-            with open(csv_file, 'w', newline='', encoding='utf-8') as f:
-                writer = csv.writer(f)
-                
-                # 写入表头
-                headers = [
-                    'image_file', 'point_index', 'longitude', 'latitude',
-                    'pixel_x', 'pixel_y', 'image_width', 'image_height',
-                    'zoom_level', 'grid_size', 'min_lon', 'min_lat',
-                    'max_lon', 'max_lat'
+            # 收集行数据后整表交给pandas：序列化循环在C层执行，
+            # 替代csv.writer逐行逐字段的Python开销
+            rows = [
+                [
+                    f"point_{coord_info['point_index']:06d}.png",
+                    coord_info['point_index'],
+                    coord_info['longitude'],
+                    coord_info['latitude'],
+                    coord_info['pixel_x'],
+                    coord_info['pixel_y'],
+                    metadata.width,
+                    metadata.height,
+                    metadata.zoom_level,
+                    metadata.grid_size,
+                    metadata.bounds['min_lon'],
+                    metadata.bounds['min_lat'],
+                    metadata.bounds['max_lon'],
+                    metadata.bounds['max_lat']
                 ]
-                writer.writerow(headers)
-                
-                # 写入数据
-                for i, metadata in enumerate(image_metadatas):
-                    for coord_info in metadata.pixel_coordinates:
-                        row = [
-                            f"point_{coord_info['point_index']:06d}.png",
-                            coord_info['point_index'],
-                            coord_info['longitude'],
-                            coord_info['latitude'],
-                            coord_info['pixel_x'],
-                            coord_info['pixel_y'],
-                            metadata.width,
-                            metadata.height,
-                            metadata.zoom_level,
-                            metadata.grid_size,
-                            metadata.bounds['min_lon'],
-                            metadata.bounds['min_lat'],
-                            metadata.bounds['max_lon'],
-                            metadata.bounds['max_lat']
-                        ]
-                        writer.writerow(row)
-            
+                for metadata in image_metadatas
+                for coord_info in metadata.pixel_coordinates
+            ]
+            pd.DataFrame(rows, columns=headers).to_csv(
+                csv_file, index=False, encoding='utf-8'
+            )
+
             self.logger.info(f"导出CSV文件: {csv_file}")
             return str(csv_file)
             
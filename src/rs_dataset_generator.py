@@ -339,7 +339,7 @@ class RSDatasetGenerator:
         try:
             return {
                 'download_config': {
-                    'zoom_level': self.config.download.zoom_level,
+                    'zoom': self.config.download.zoom,
                     'grid_size': self.config.download.grid_size,
                     'max_concurrency': self.config.download.max_concurrency,
                     'max_retries': self.config.download.max_retries,
@@ -355,7 +355,7 @@ class RSDatasetGenerator:
                 'network_config': {
                     'base_url': self.config.network.base_url,
                     'user_agent': self.config.network.headers.get('User-Agent', ''),
-                    'timeout': self.config.network.timeout
+                    'use_proxy': self.config.network.use_proxy
                 }
             }
         except Exception as e:
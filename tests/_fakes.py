@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""测试替身模块
+
+提供轻量的纯Python假对象，替代unittest.mock的Mock/patch组合。
+普通类没有Mock每次调用的属性记录开销，各测试类持有独立实例，
+互不共享状态，可安全配合pytest-xdist并行执行。
+"""
+
+from io import BytesIO
+
+import requests
+from PIL import Image
+
+
+_PNG_CACHE = {}
+
+
+def make_tile_png(size=256, color=(128, 128, 128)):
+    """生成一张可被PIL解码的PNG瓦片字节串（按参数缓存）
+
+    Args:
+        size: 瓦片边长（像素）
+        color: RGB填充颜色
+
+    Returns:
+        PNG编码的字节串
+    """
+    cache_key = (size, color)
+    if cache_key not in _PNG_CACHE:
+        buffer = BytesIO()
+        Image.new('RGB', (size, size), color).save(buffer, 'PNG')
+        _PNG_CACHE[cache_key] = buffer.getvalue()
+    return _PNG_CACHE[cache_key]
+
+
+class FakeResponse:
+    """假HTTP响应
+
+    预先构建好content/status_code/headers，raise_for_status在
+    状态码>=400时抛出异常，其余行为与requests.Response的常用子集一致。
+    """
+
+    def __init__(self, content=None, status_code=200, headers=None):
+        self.content = content if content is not None else make_tile_png()
+        self.status_code = status_code
+        self.headers = headers if headers is not None else {'content-type': 'image/png'}
+
+    def raise_for_status(self):
+        """状态码>=400时抛出HTTPError"""
+        if self.status_code >= 400:
+            raise requests.exceptions.HTTPError(
+                f"{self.status_code} Error", response=self
+            )
+
+
+class FakeSession:
+    """假requests会话
+
+    get返回预构建的FakeResponse；可配置前fail_n次请求失败，
+    用于测试重试逻辑。
+    """
+
+    def __init__(self, response=None, fail_n=0, fail_status=500):
+        self.response = response if response is not None else FakeResponse()
+        self.fail_n = fail_n
+        self.fail_status = fail_status
+        self.call_count = 0
+        self.headers = {}
+        self.proxies = {}
+
+    def get(self, url, *args, **kwargs):
+        """返回预构建的响应，前fail_n次返回失败状态码"""
+        self.call_count += 1
+        if self.call_count <= self.fail_n:
+            return FakeResponse(
+                content=b'', status_code=self.fail_status,
+                headers={'content-type': 'text/plain'}
+            )
+        return self.response
+
+    def close(self):
+        """与requests.Session接口保持一致"""
+        pass
@@ -0,0 +1,45 @@
+"""测试用文件系统辅助模块
+
+提供并行删除目录树的fast_rmtree。真实运行后临时目录里可能
+积累成千上万个瓦片文件，shutil.rmtree串行逐个unlink；
+unlink受系统调用约束，线程池在现代文件系统上可跨核并行。
+"""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+
+def fast_rmtree(path, keep_root=False):
+    """并行删除目录树
+
+    用os.scandir遍历收集文件后把unlink分发到线程池，
+    空目录再自底向上串行删除。
+
+    Args:
+        path: 要删除的目录路径
+        keep_root: 为True时保留（清空后的）根目录本身，
+            便于与TemporaryDirectory的清理终结器配合
+    """
+    files = []
+    dirs = []
+    stack = [path]
+    while stack:
+        current = stack.pop()
+        dirs.append(current)
+        with os.scandir(current) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                else:
+                    files.append(entry.path)
+
+    if files:
+        with ThreadPoolExecutor() as pool:
+            # map消费迭代器以传播异常
+            list(pool.map(os.unlink, files))
+
+    # 子目录路径必然比父目录长，按长度倒序即自底向上
+    for directory in sorted(dirs, key=len, reverse=True):
+        if keep_root and directory == path:
+            continue
+        os.rmdir(directory)
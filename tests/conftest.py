@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""pytest共享夹具
+
+提供会话级共享夹具，支持pytest-xdist并行执行：
+`pytest -n auto --dist=loadscope` 按测试类分发到worker，
+tmp_path_factory生成的目录天然按worker隔离，无跨进程竞争。
+"""
+
+import json
+
+import pytest
+
+
+@pytest.fixture(scope='session')
+def session_temp_dir(tmp_path_factory):
+    """会话级临时目录（每个xdist worker独立）"""
+    return tmp_path_factory.mktemp('rs_dataset_tests')
+
+
+@pytest.fixture(scope='session')
+def test_points_geojson(session_temp_dir):
+    """会话级共享的3点测试GeoJSON文件"""
+    test_data = {
+        "type": "FeatureCollection",
+        "features": [
+            {
+                "type": "Feature",
+                "geometry": {"type": "Point", "coordinates": [116.3974, 39.9093]},
+                "properties": {"name": "Beijing", "type": "capital", "id": 1}
+            },
+            {
+                "type": "Feature",
+                "geometry": {"type": "Point", "coordinates": [121.4737, 31.2304]},
+                "properties": {"name": "Shanghai", "type": "city", "id": 2}
+            },
+            {
+                "type": "Feature",
+                "geometry": {"type": "Point", "coordinates": [113.2644, 23.1291]},
+                "properties": {"name": "Guangzhou", "type": "city", "id": 3}
+            }
+        ]
+    }
+
+    geojson_path = session_temp_dir / 'test_points.geojson'
+    geojson_path.write_text(
+        json.dumps(test_data, ensure_ascii=False, indent=2), encoding='utf-8'
+    )
+    return str(geojson_path)
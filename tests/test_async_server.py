@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""异步下载器真实服务器测试
+
+使用aiohttp.test_utils.TestServer提供真实的HTTP瓦片服务，
+端到端走通AsyncDownloader的完整代码路径（连接池、DNS缓存、
+自适应并发、瓦片保存），替代对ClientSession.get的Mock。
+"""
+
+import asyncio
+import os
+import tempfile
+import unittest
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from src.config import Config
+from src.downloaders.async_downloader import AsyncDownloader
+from tests._fakes import make_tile_png
+
+
+class TestAsyncDownloaderRealServer(unittest.TestCase):
+    """基于真实HTTP服务的异步下载器测试"""
+
+    def setUp(self):
+        """测试前准备"""
+        # TemporaryDirectory用weakref.finalize注册清理，测试崩溃也不泄漏/tmp
+        self._tmp_ctx = tempfile.TemporaryDirectory()
+        self.temp_dir = self._tmp_ctx.name
+        Config.reset()
+        self.config = Config()
+        self.config.paths.tile_save_dir = os.path.join(self.temp_dir, 'tiles')
+        os.makedirs(self.config.paths.tile_save_dir, exist_ok=True)
+
+    def tearDown(self):
+        """测试后清理"""
+        self._tmp_ctx.cleanup()
+        Config.reset()
+
+    async def _serve_and_run(self, coro_fn):
+        """启动测试瓦片服务并执行测试协程
+
+        Args:
+            coro_fn: 接收下载器的测试协程函数
+
+        Returns:
+            测试协程的返回值
+        """
+        request_count = 0
+
+        async def tile_handler(request):
+            nonlocal request_count
+            request_count += 1
+            return web.Response(body=make_tile_png(), content_type='image/png')
+
+        app = web.Application()
+        app.router.add_get('/vt', tile_handler)
+        server = TestServer(app)
+        await server.start_server()
+
+        try:
+            self.config.network.base_url = f"http://127.0.0.1:{server.port}/vt?lyrs=s"
+            downloader = AsyncDownloader(self.config)
+            async with downloader:
+                result = await coro_fn(downloader)
+            return result, request_count
+        finally:
+            await server.close()
+
+    def test_download_single_tile_end_to_end(self):
+        """单个瓦片下载走通真实网络路径"""
+        async def scenario(downloader):
+            tile_info = downloader.create_tile_info(1, 2, 5)
+            return await downloader.download_tile_async(tile_info)
+
+        result, request_count = asyncio.run(self._serve_and_run(scenario))
+
+        self.assertTrue(result.success)
+        self.assertIsNotNone(result.image)
+        self.assertEqual(request_count, 1)
+        self.assertTrue(os.path.exists(result.tile_info.file_path))
+
+    def test_download_batch_concurrent(self):
+        """批量下载全部成功且命中服务端"""
+        async def scenario(downloader):
+            tiles = [downloader.create_tile_info(x, y, 6)
+                     for x in range(5) for y in range(5)]
+            return await downloader.download_tiles_async(tiles)
+
+        results, request_count = asyncio.run(self._serve_and_run(scenario))
+
+        self.assertEqual(len(results), 25)
+        self.assertTrue(all(r.success for r in results))
+        self.assertEqual(request_count, 25)
+
+    def test_prepare_and_download_grid(self):
+        """网格计算与会话预热重叠的组合入口"""
+        async def scenario(downloader):
+            return await downloader.prepare_and_download(116.4, 39.9, zoom=6, grid_size=3)
+
+        results, request_count = asyncio.run(self._serve_and_run(scenario))
+
+        self.assertEqual(len(results), 9)
+        self.assertTrue(all(r.success for r in results))
+        self.assertEqual(request_count, 9)
+
+    def test_second_download_served_from_cache(self):
+        """重复下载同一瓦片时命中缓存，不再请求服务端"""
+        async def scenario(downloader):
+            tile_info = downloader.create_tile_info(3, 4, 5)
+            first = await downloader.download_tile_async(tile_info)
+            second = await downloader.download_tile_async(tile_info)
+            return first, second
+
+        (first, second), request_count = asyncio.run(self._serve_and_run(scenario))
+
+        self.assertTrue(first.success)
+        self.assertTrue(second.success)
+        self.assertTrue(second.from_cache)
+        self.assertEqual(request_count, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
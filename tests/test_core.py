@@ -8,277 +8,342 @@
 - 下载器工厂
 """
 
+import asyncio
 import os
-import sys
+import time
 import unittest
 import tempfile
 import json
-from pathlib import Path
-from unittest.mock import Mock, patch, MagicMock
 
-# 添加项目根目录到Python路径
-project_root = Path(__file__).parent.parent
-sys.path.insert(0, str(project_root))
+import yaml
 
-try:
-    from src.config import ConfigManager
-    from src.utils import Logger, PerformanceMonitor, validate_shapefile, ensure_directory
-    from src.processors.data_loader import DataLoader, GeoPoint
-    from src.downloaders.factory import DownloaderFactory, DownloaderType
-except ImportError as e:
-    print(f"导入错误: {e}")
-    print("请确保在项目根目录运行测试")
-    sys.exit(1)
+from src.config import Config
+from src.utils import (
+    Logger, PerformanceMonitor, ValidationError,
+    validate_shapefile, ensure_directory
+)
+from src.processors.data_loader import DataLoader, GeoPoint
+from src.downloaders.factory import DownloaderFactory, DownloaderType
+from src.downloaders.sync_downloader import SyncDownloader
+from src.downloaders.async_downloader import AsyncDownloader
 
 
-class TestConfigManager(unittest.TestCase):
+class TestConfig(unittest.TestCase):
     """配置管理器测试"""
-    
+
     def setUp(self):
         """测试前准备"""
-        self.temp_dir = tempfile.mkdtemp()
+        # TemporaryDirectory用weakref.finalize注册清理，测试崩溃也不泄漏/tmp
+        self._tmp_ctx = tempfile.TemporaryDirectory()
+        self.temp_dir = self._tmp_ctx.name
         self.config_file = os.path.join(self.temp_dir, 'test_config.yaml')
-        
+
         # 创建测试配置文件
         test_config = {
             'download': {
-                'zoom_level': 18,
-                'grid_size': 5
-            },
-            'network': {
+                'zoom': 18,
+                'grid_size': 5,
                 'max_retries': 3,
                 'request_timeout': 30
+            },
+            'paths': {
+                'tile_save_dir': os.path.join(self.temp_dir, 'tiles'),
+                'output_dir': os.path.join(self.temp_dir, 'output'),
+                'log_dir': os.path.join(self.temp_dir, 'logs')
             }
         }
-        
-        import yaml
+
         with open(self.config_file, 'w', encoding='utf-8') as f:
             yaml.dump(test_config, f)
-    
+
+        # Config是单例，重置后各测试互不影响
+        Config.reset()
+
     def tearDown(self):
         """测试后清理"""
-        import shutil
-        shutil.rmtree(self.temp_dir, ignore_errors=True)
-    
+        Config.reset()
+        self._tmp_ctx.cleanup()
+
+    def test_singleton(self):
+        """测试配置管理器单例行为"""
+        self.assertIs(Config(), Config())
+
     def test_load_config_from_file(self):
         """测试从文件加载配置"""
-        config_manager = ConfigManager()
-        config = config_manager.load_config(self.config_file)
-        
-        self.assertIsInstance(config, dict)
-        self.assertIn('download', config)
-        self.assertEqual(config['download']['zoom_level'], 18)
-    
-    def test_load_config_with_overrides(self):
-        """测试配置覆盖"""
-        config_manager = ConfigManager()
-        overrides = {'download': {'zoom_level': 20}}
-        
-        config = config_manager.load_config(self.config_file, overrides)
-        
-        self.assertEqual(config['download']['zoom_level'], 20)
-        self.assertEqual(config['download']['grid_size'], 5)  # 未覆盖的值保持不变
-    
+        config = Config()
+        config.load_from_file(self.config_file)
+
+        self.assertEqual(config.download.zoom, 18)
+        self.assertEqual(config.download.grid_size, 5)
+        self.assertEqual(config.download.max_retries, 3)
+
+    def test_load_config_missing_file(self):
+        """测试加载不存在的配置文件"""
+        config = Config()
+
+        with self.assertRaises(FileNotFoundError):
+            config.load_from_file(os.path.join(self.temp_dir, 'missing.yaml'))
+
+    def test_update_from_dict(self):
+        """测试从字典覆盖配置"""
+        config = Config()
+        config.load_from_file(self.config_file)
+
+        config.update_from_dict({'download': {'zoom': 20}})
+
+        self.assertEqual(config.download.zoom, 20)
+        self.assertEqual(config.download.grid_size, 5)  # 未覆盖的值保持不变
+
+    def test_to_dict(self):
+        """测试配置导出为字典"""
+        config = Config()
+        config.load_from_file(self.config_file)
+
+        config_dict = config.to_dict()
+
+        self.assertIsInstance(config_dict, dict)
+        self.assertIn('download', config_dict)
+        self.assertIn('paths', config_dict)
+        self.assertIn('network', config_dict)
+        self.assertEqual(config_dict['download']['zoom'], 18)
+
     def test_validate_config(self):
         """测试配置验证"""
-        config_manager = ConfigManager()
-        
-        # 有效配置
-        valid_config = {
-            'zoom_level': 18,
-            'grid_size': 5,
-            'max_retries': 3
-        }
-        
-        self.assertTrue(config_manager.validate_config(valid_config))
-        
-        # 无效配置
-        invalid_config = {
-            'zoom_level': 25,  # 超出范围
-            'grid_size': -1,   # 负数
-        }
-        
-        self.assertFalse(config_manager.validate_config(invalid_config))
+        config = Config()
+
+        # 未指定输入文件
+        with self.assertRaises(ValueError):
+            config.validate()
+
+        # 输入文件不存在
+        config.paths.input_shapefile = os.path.join(self.temp_dir, 'missing.shp')
+        with self.assertRaises(FileNotFoundError):
+            config.validate()
 
 
 class TestLogger(unittest.TestCase):
     """日志器测试"""
-    
+
     def setUp(self):
         """测试前准备"""
-        self.temp_dir = tempfile.mkdtemp()
+        # TemporaryDirectory用weakref.finalize注册清理，测试崩溃也不泄漏/tmp
+        self._tmp_ctx = tempfile.TemporaryDirectory()
+        self.temp_dir = self._tmp_ctx.name
         self.log_file = os.path.join(self.temp_dir, 'test.log')
-    
+        self._loggers = []
+
     def tearDown(self):
-        """测试后清理"""
-        import shutil
-        shutil.rmtree(self.temp_dir, ignore_errors=True)
-    
+        """测试后清理：关闭文件处理器后再删除临时目录"""
+        for logger in self._loggers:
+            for handler in logger.logger.handlers:
+                handler.close()
+            logger.logger.handlers.clear()
+        self._tmp_ctx.cleanup()
+
+    def _make_logger(self, name, **kwargs):
+        """创建测试日志器并登记以便清理"""
+        logger = Logger(name=name, log_file=self.log_file, **kwargs)
+        self._loggers.append(logger)
+        return logger
+
     def test_logger_creation(self):
         """测试日志器创建"""
-        logger = Logger(
-            name='TestLogger',
-            level='INFO',
-            console_output=True,
-            file_output=True,
-            log_file=self.log_file
-        )
-        
+        logger = self._make_logger('TestLoggerCreation', level='INFO')
+
         self.assertIsNotNone(logger.logger)
-        self.assertEqual(logger.logger.name, 'TestLogger')
-    
+        self.assertEqual(logger.logger.name, 'TestLoggerCreation')
+
     def test_logger_file_output(self):
         """测试日志文件输出"""
-        logger = Logger(
-            name='TestLogger',
+        logger = self._make_logger(
+            'TestLoggerFileOutput',
             level='INFO',
             console_output=False,
-            file_output=True,
-            log_file=self.log_file
+            file_output=True
         )
-        
+
         logger.info("测试消息")
-        
+
         # 检查日志文件是否创建
         self.assertTrue(os.path.exists(self.log_file))
-        
+
         # 检查日志内容
         with open(self.log_file, 'r', encoding='utf-8') as f:
             content = f.read()
             self.assertIn("测试消息", content)
-    
-    def test_execution_timer(self):
+
+    def test_log_execution_time(self):
         """测试执行时间记录"""
-        logger = Logger(name='TestLogger')
-        
-        with logger.execution_timer("测试操作"):
-            import time
-            time.sleep(0.1)  # 模拟耗时操作
-        
-        # 这里主要测试不会抛出异常
-        self.assertTrue(True)
+        logger = self._make_logger('TestLoggerTimer', console_output=False)
+
+        with logger.log_execution_time("测试操作"):
+            time.sleep(0.01)  # 模拟耗时操作
+
+        with open(self.log_file, 'r', encoding='utf-8') as f:
+            content = f.read()
+            self.assertIn("开始执行: 测试操作", content)
+            self.assertIn("执行完成: 测试操作", content)
+
+    def test_log_execution_time_failure(self):
+        """测试执行失败时的时间记录"""
+        logger = self._make_logger('TestLoggerTimerFail', console_output=False)
+
+        with self.assertRaises(RuntimeError):
+            with logger.log_execution_time("失败操作"):
+                raise RuntimeError("模拟失败")
+
+        with open(self.log_file, 'r', encoding='utf-8') as f:
+            self.assertIn("执行失败: 失败操作", f.read())
 
 
 class TestPerformanceMonitor(unittest.TestCase):
     """性能监控器测试"""
-    
+
     def test_monitor_creation(self):
         """测试监控器创建"""
         monitor = PerformanceMonitor()
-        self.assertIsNotNone(monitor)
-        self.assertFalse(monitor.is_monitoring)
-    
-    def test_monitor_start_stop(self):
-        """测试监控启动和停止"""
+
+        self.assertEqual(monitor.stats['total_tasks'], 0)
+        self.assertEqual(monitor.stats['completed_tasks'], 0)
+
+    def test_update_stats(self):
+        """测试统计更新"""
         monitor = PerformanceMonitor()
-        
-        monitor.start_monitoring()
-        self.assertTrue(monitor.is_monitoring)
-        
-        import time
-        time.sleep(0.1)  # 让监控运行一段时间
-        
-        monitor.stop_monitoring()
-        self.assertFalse(monitor.is_monitoring)
-    
-    def test_get_statistics(self):
+
+        monitor.update_stats('total_tasks', 10)
+        monitor.update_stats('completed_tasks')
+
+        self.assertEqual(monitor.stats['total_tasks'], 10)
+        self.assertEqual(monitor.stats['completed_tasks'], 1)
+
+        # 未知的统计项应该报错
+        with self.assertRaises(ValueError):
+            monitor.update_stats('unknown_key')
+
+    def test_get_current_stats(self):
         """测试获取统计信息"""
         monitor = PerformanceMonitor()
-        
-        monitor.start_monitoring()
-        import time
-        time.sleep(0.1)
-        monitor.stop_monitoring()
-        
-        stats = monitor.get_statistics()
-        
+
+        monitor.record_performance()
+        stats = monitor.get_current_stats()
+
         self.assertIsInstance(stats, dict)
         self.assertIn('avg_cpu_percent', stats)
         self.assertIn('avg_memory_mb', stats)
         self.assertIn('peak_memory_mb', stats)
 
+        # 已采样一次，内存值应该为正
+        self.assertGreater(stats['peak_memory_mb'], 0)
+
+    def test_reset(self):
+        """测试重置监控数据"""
+        monitor = PerformanceMonitor()
+
+        monitor.update_stats('completed_tasks', 5)
+        monitor.record_performance()
+        monitor.reset()
+
+        self.assertEqual(monitor.stats['completed_tasks'], 0)
+        self.assertEqual(len(monitor.memory_samples), 0)
+
 
 class TestUtilityFunctions(unittest.TestCase):
     """工具函数测试"""
-    
+
     def setUp(self):
         """测试前准备"""
-        self.temp_dir = tempfile.mkdtemp()
-    
+        # TemporaryDirectory用weakref.finalize注册清理，测试崩溃也不泄漏/tmp
+        self._tmp_ctx = tempfile.TemporaryDirectory()
+        self.temp_dir = self._tmp_ctx.name
+
     def tearDown(self):
         """测试后清理"""
-        import shutil
-        shutil.rmtree(self.temp_dir, ignore_errors=True)
-    
+        self._tmp_ctx.cleanup()
+
     def test_ensure_directory(self):
         """测试目录创建"""
         test_dir = os.path.join(self.temp_dir, 'test_subdir')
-        
+
         # 目录不存在时创建
         ensure_directory(test_dir)
         self.assertTrue(os.path.exists(test_dir))
         self.assertTrue(os.path.isdir(test_dir))
-        
+
         # 目录已存在时不报错
         ensure_directory(test_dir)
         self.assertTrue(os.path.exists(test_dir))
-    
+
     def test_validate_shapefile_missing(self):
         """测试验证不存在的Shapefile"""
         non_existent_file = os.path.join(self.temp_dir, 'missing.shp')
-        
-        result = validate_shapefile(non_existent_file)
-        self.assertFalse(result)
-    
-    @patch('geopandas.read_file')
-    def test_validate_shapefile_valid(self, mock_read_file):
-        """测试验证有效的Shapefile"""
-        # 模拟成功读取
-        mock_gdf = Mock()
-        mock_gdf.empty = False
-        mock_read_file.return_value = mock_gdf
-        
+
+        with self.assertRaises(ValidationError):
+            validate_shapefile(non_existent_file)
+
+    def test_validate_shapefile_incomplete(self):
+        """测试验证缺少辅助文件的Shapefile"""
         test_file = os.path.join(self.temp_dir, 'test.shp')
-        
-        # 创建空文件
+
+        # 只创建.shp文件，缺少.shx和.dbf
         with open(test_file, 'w') as f:
             f.write('')
-        
-        result = validate_shapefile(test_file)
-        self.assertTrue(result)
-    
-    @patch('geopandas.read_file')
-    def test_validate_shapefile_invalid(self, mock_read_file):
-        """测试验证无效的Shapefile"""
-        # 模拟读取失败
-        mock_read_file.side_effect = Exception("读取失败")
-        
+
+        with self.assertRaises(ValidationError):
+            validate_shapefile(test_file)
+
+    def test_validate_shapefile_valid(self):
+        """测试验证有效的Shapefile"""
+        import geopandas as gpd
+        from shapely.geometry import Point
+
         test_file = os.path.join(self.temp_dir, 'test.shp')
-        
-        # 创建空文件
-        with open(test_file, 'w') as f:
-            f.write('')
-        
-        result = validate_shapefile(test_file)
-        self.assertFalse(result)
+        gdf = gpd.GeoDataFrame(
+            {'osm_id': [1]},
+            geometry=[Point(116.3974, 39.9093)],
+            crs='EPSG:4326'
+        )
+        gdf.to_file(test_file)
+
+        # 有效文件不应该抛出异常
+        validate_shapefile(test_file)
+
+    def test_validate_shapefile_missing_field(self):
+        """测试验证缺少osm_id字段的Shapefile"""
+        import geopandas as gpd
+        from shapely.geometry import Point
+
+        test_file = os.path.join(self.temp_dir, 'test.shp')
+        gdf = gpd.GeoDataFrame(
+            {'name': ['test']},
+            geometry=[Point(116.3974, 39.9093)],
+            crs='EPSG:4326'
+        )
+        gdf.to_file(test_file)
+
+        with self.assertRaises(ValidationError):
+            validate_shapefile(test_file)
 
 
 class TestDataLoader(unittest.TestCase):
     """数据加载器测试"""
-    
+
     def setUp(self):
         """测试前准备"""
-        self.temp_dir = tempfile.mkdtemp()
-    
+        # TemporaryDirectory用weakref.finalize注册清理，测试崩溃也不泄漏/tmp
+        self._tmp_ctx = tempfile.TemporaryDirectory()
+        self.temp_dir = self._tmp_ctx.name
+        Config.reset()
+        self.config = Config()
+
     def tearDown(self):
         """测试后清理"""
-        import shutil
-        shutil.rmtree(self.temp_dir, ignore_errors=True)
-    
+        Config.reset()
+        self._tmp_ctx.cleanup()
+
     def test_create_loader_geojson(self):
         """测试创建GeoJSON加载器"""
         geojson_file = os.path.join(self.temp_dir, 'test.geojson')
-        
+
         # 创建测试GeoJSON文件
         test_data = {
             "type": "FeatureCollection",
@@ -293,128 +358,162 @@ class TestDataLoader(unittest.TestCase):
                 }
             ]
         }
-        
+
         with open(geojson_file, 'w', encoding='utf-8') as f:
             json.dump(test_data, f)
-        
-        loader = DataLoader.create_loader(geojson_file)
+
+        loader = DataLoader.create_loader(geojson_file, self.config)
         self.assertIsNotNone(loader)
         self.assertEqual(loader.__class__.__name__, 'GeoJSONLoader')
-    
+
     def test_create_loader_shapefile(self):
         """测试创建Shapefile加载器"""
         shapefile = os.path.join(self.temp_dir, 'test.shp')
-        
+
         # 创建空的shapefile（仅用于测试文件类型识别）
         with open(shapefile, 'w') as f:
             f.write('')
-        
-        loader = DataLoader.create_loader(shapefile)
+
+        loader = DataLoader.create_loader(shapefile, self.config)
         self.assertIsNotNone(loader)
         self.assertEqual(loader.__class__.__name__, 'ShapefileLoader')
-    
+
     def test_create_loader_unsupported(self):
         """测试不支持的文件类型"""
         txt_file = os.path.join(self.temp_dir, 'test.txt')
-        
+
         with open(txt_file, 'w') as f:
             f.write('test')
-        
-        with self.assertRaises(ValueError):
-            DataLoader.create_loader(txt_file)
-    
-    @patch('geopandas.read_file')
-    def test_load_points_from_geojson(self, mock_read_file):
+
+        with self.assertRaises(ValidationError):
+            DataLoader.create_loader(txt_file, self.config)
+
+    def test_get_supported_formats(self):
+        """测试获取支持的文件格式"""
+        formats = DataLoader.get_supported_formats()
+
+        self.assertIn('.shp', formats)
+        self.assertIn('.geojson', formats)
+
+    def test_load_points_from_geojson(self):
         """测试从GeoJSON加载点数据"""
-        # 模拟GeoDataFrame
-        mock_gdf = Mock()
-        mock_gdf.iterrows.return_value = [
-            (0, Mock(geometry=Mock(x=116.3974, y=39.9093), to_dict=lambda: {'name': 'test1'})),
-            (1, Mock(geometry=Mock(x=121.4737, y=31.2304), to_dict=lambda: {'name': 'test2'}))
-        ]
-        mock_read_file.return_value = mock_gdf
-        
         geojson_file = os.path.join(self.temp_dir, 'test.geojson')
-        with open(geojson_file, 'w') as f:
-            f.write('{}')
-        
-        loader = DataLoader.create_loader(geojson_file)
-        points = loader.load_points()
-        
+
+        test_data = {
+            "type": "FeatureCollection",
+            "features": [
+                {
+                    "type": "Feature",
+                    "geometry": {"type": "Point", "coordinates": [116.3974, 39.9093]},
+                    "properties": {"name": "test1"}
+                },
+                {
+                    "type": "Feature",
+                    "geometry": {"type": "Point", "coordinates": [121.4737, 31.2304]},
+                    "properties": {"name": "test2"}
+                }
+            ]
+        }
+
+        with open(geojson_file, 'w', encoding='utf-8') as f:
+            json.dump(test_data, f)
+
+        points = DataLoader.load_points(geojson_file, self.config)
+
         self.assertEqual(len(points), 2)
         self.assertIsInstance(points[0], GeoPoint)
-        self.assertEqual(points[0].longitude, 116.3974)
-        self.assertEqual(points[0].latitude, 39.9093)
+        self.assertAlmostEqual(points[0].longitude, 116.3974)
+        self.assertAlmostEqual(points[0].latitude, 39.9093)
 
 
 class TestDownloaderFactory(unittest.TestCase):
     """下载器工厂测试"""
-    
+
+    def setUp(self):
+        """测试前准备"""
+        # TemporaryDirectory用weakref.finalize注册清理，测试崩溃也不泄漏/tmp
+        self._tmp_ctx = tempfile.TemporaryDirectory()
+        Config.reset()
+        self.config = Config()
+        self.config.paths.tile_save_dir = os.path.join(
+            self._tmp_ctx.name, 'tiles'
+        )
+
+    def tearDown(self):
+        """测试后清理"""
+        Config.reset()
+        self._tmp_ctx.cleanup()
+
     def test_create_sync_downloader(self):
         """测试创建同步下载器"""
         downloader = DownloaderFactory.create_downloader(
-            downloader_type=DownloaderType.SYNC,
-            max_retries=3,
-            request_timeout=30
+            self.config, DownloaderType.SYNC
         )
-        
-        self.assertIsNotNone(downloader)
-        self.assertEqual(downloader.__class__.__name__, 'SyncDownloader')
-    
+
+        self.assertIsInstance(downloader, SyncDownloader)
+
     def test_create_async_downloader(self):
-        """测试创建异步下载器"""
-        downloader = DownloaderFactory.create_downloader(
-            downloader_type=DownloaderType.ASYNC,
-            max_concurrency=10,
-            max_retries=3,
-            request_timeout=30
-        )
-        
-        self.assertIsNotNone(downloader)
-        self.assertEqual(downloader.__class__.__name__, 'AsyncDownloader')
-    
+        """测试创建异步下载器
+
+        异步下载器的连接池依赖事件循环，创建与清理都放在协程内。
+        """
+        async def scenario():
+            downloader = DownloaderFactory.create_downloader(
+                self.config, DownloaderType.ASYNC
+            )
+            async with downloader:
+                return type(downloader)
+
+        self.assertIs(asyncio.run(scenario()), AsyncDownloader)
+
     def test_create_auto_downloader(self):
         """测试自动选择下载器"""
+        # 小规模下载自动选择同步下载器
         downloader = DownloaderFactory.create_downloader(
-            downloader_type=DownloaderType.AUTO,
-            max_concurrency=5
+            self.config, DownloaderType.AUTO
+        )
+        self.assertIsInstance(downloader, SyncDownloader)
+
+        # 大规模下载自动选择异步下载器
+        async def scenario():
+            self.config.download.expected_tiles = 10000
+            downloader = DownloaderFactory.create_downloader(
+                self.config, DownloaderType.AUTO
+            )
+            async with downloader:
+                return type(downloader)
+
+        self.assertIs(asyncio.run(scenario()), AsyncDownloader)
+
+    def test_get_available_types(self):
+        """测试获取可用下载器类型"""
+        types = DownloaderFactory.get_available_types()
+
+        self.assertIsInstance(types, list)
+        self.assertIn(DownloaderType.SYNC, types)
+        self.assertIn(DownloaderType.ASYNC, types)
+
+    def test_validate_downloader_config(self):
+        """测试下载器配置验证"""
+        # 默认配置有效
+        self.assertTrue(
+            DownloaderFactory.validate_downloader_config(
+                self.config, DownloaderType.SYNC
+            )
+        )
+
+        # 异步下载器要求max_concurrency大于0
+        self.config.download.max_concurrency = 0
+        self.assertFalse(
+            DownloaderFactory.validate_downloader_config(
+                self.config, DownloaderType.ASYNC
+            )
         )
-        
-        self.assertIsNotNone(downloader)
-        # 自动选择应该根据并发数选择合适的下载器
-    
-    def test_get_available_downloaders(self):
-        """测试获取可用下载器列表"""
-        downloaders = DownloaderFactory.get_available_downloaders()
-        
-        self.assertIsInstance(downloaders, list)
-        self.assertIn('sync', downloaders)
-        self.assertIn('async', downloaders)
-    
-    def test_validate_config(self):
-        """测试配置验证"""
-        # 有效配置
-        valid_config = {
-            'downloader_type': 'async',
-            'max_concurrency': 10,
-            'max_retries': 3,
-            'request_timeout': 30
-        }
-        
-        self.assertTrue(DownloaderFactory.validate_config(valid_config))
-        
-        # 无效配置
-        invalid_config = {
-            'downloader_type': 'invalid_type',
-            'max_concurrency': -1
-        }
-        
-        self.assertFalse(DownloaderFactory.validate_config(invalid_config))
 
 
 class TestGeoPoint(unittest.TestCase):
     """地理点测试"""
-    
+
     def test_geo_point_creation(self):
         """测试地理点创建"""
         point = GeoPoint(
@@ -422,32 +521,32 @@ class TestGeoPoint(unittest.TestCase):
             latitude=39.9093,
             properties={'name': 'Beijing'}
         )
-        
+
         self.assertEqual(point.longitude, 116.3974)
         self.assertEqual(point.latitude, 39.9093)
         self.assertEqual(point.properties['name'], 'Beijing')
-    
+
     def test_geo_point_validation(self):
         """测试地理点坐标验证"""
         # 有效坐标
         valid_point = GeoPoint(longitude=116.3974, latitude=39.9093)
-        self.assertTrue(valid_point.is_valid())
-        
+        self.assertTrue(valid_point.validate())
+
         # 无效经度
         invalid_lon = GeoPoint(longitude=200.0, latitude=39.9093)
-        self.assertFalse(invalid_lon.is_valid())
-        
+        self.assertFalse(invalid_lon.validate())
+
         # 无效纬度
         invalid_lat = GeoPoint(longitude=116.3974, latitude=100.0)
-        self.assertFalse(invalid_lat.is_valid())
-    
+        self.assertFalse(invalid_lat.validate())
+
     def test_geo_point_distance(self):
         """测试地理点距离计算"""
         point1 = GeoPoint(longitude=116.3974, latitude=39.9093)  # 北京
         point2 = GeoPoint(longitude=121.4737, latitude=31.2304)  # 上海
-        
+
         distance = point1.distance_to(point2)
-        
+
         # 北京到上海的距离大约是1000公里
         self.assertGreater(distance, 1000)
         self.assertLess(distance, 1500)
@@ -456,6 +555,6 @@ class TestGeoPoint(unittest.TestCase):
 if __name__ == '__main__':
     # 设置测试环境
     os.environ['TESTING'] = '1'
-    
+
     # 运行测试
-    unittest.main(verbosity=2)
\ No newline at end of file
+    unittest.main(verbosity=2)
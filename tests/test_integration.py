@@ -9,762 +9,715 @@
 """
 
 import os
-import sys
 import unittest
 import tempfile
 import json
+import threading
 import time
-import shutil
-from pathlib import Path
-from unittest.mock import Mock, patch, MagicMock
+from contextlib import contextmanager
+from types import SimpleNamespace
 
-# 添加项目根目录到Python路径
-project_root = Path(__file__).parent.parent
-sys.path.insert(0, str(project_root))
+import geopandas as gpd
+import numpy as np
+import requests
+from shapely.geometry import Point
 
 try:
-    from src.rs_dataset_generator import RSDatasetGenerator, create_generator, quick_generate
-    from src.config import ConfigManager
-    from src.processors.data_loader import GeoPoint
-    from src.downloaders.factory import DownloaderType
-except ImportError as e:
-    print(f"导入错误: {e}")
-    print("请确保在项目根目录运行测试")
-    sys.exit(1)
+    import orjson
+except ImportError:
+    orjson = None
+
+from src.rs_dataset_generator import RSDatasetGenerator, create_generator, quick_generate
+from src.config import Config
+from src.utils import ValidationError
+from tests._fakes import make_tile_png
+
+
+def _geojson_dumps(data, indent=False):
+    """序列化GeoJSON字符串，orjson可用时走其C实现（约3-5x于stdlib）"""
+    if orjson is not None:
+        option = orjson.OPT_INDENT_2 if indent else 0
+        return orjson.dumps(data, option=option).decode('utf-8')
+    if indent:
+        return json.dumps(data, ensure_ascii=False, indent=2)
+    return json.dumps(data, ensure_ascii=False)
+
+
+# 模块级预序列化的夹具内容：JSON序列化只做一次，
+# 各测试类写夹具文件时退化为单次write调用
+_TEST_POINTS_GEOJSON_STR = _geojson_dumps({
+    "type": "FeatureCollection",
+    "features": [
+        {
+            "type": "Feature",
+            "geometry": {
+                "type": "Point",
+                "coordinates": [116.3974, 39.9093]  # 北京
+            },
+            "properties": {
+                "name": "Beijing",
+                "type": "capital",
+                "id": 1
+            }
+        },
+        {
+            "type": "Feature",
+            "geometry": {
+                "type": "Point",
+                "coordinates": [121.4737, 31.2304]  # 上海
+            },
+            "properties": {
+                "name": "Shanghai",
+                "type": "city",
+                "id": 2
+            }
+        },
+        {
+            "type": "Feature",
+            "geometry": {
+                "type": "Point",
+                "coordinates": [113.2644, 23.1291]  # 广州
+            },
+            "properties": {
+                "name": "Guangzhou",
+                "type": "city",
+                "id": 3
+            }
+        }
+    ]
+}, indent=True)
+
+# 模块级共享的假PNG响应体与响应构造器：
+# 避免每个测试重复编码PNG并配置相同的响应属性
+_FAKE_PNG = make_tile_png()
+
+
+def _make_ok_response():
+    """构造一个成功的HTTP响应假对象
+
+    响应对象只被读取固定的几个属性，用SimpleNamespace比Mock轻量得多：
+    Mock的每次属性访问都会分配子Mock并记录调用历史。
+    """
+    return SimpleNamespace(
+        status_code=200,
+        content=_FAKE_PNG,
+        headers={'content-type': 'image/png'},
+        raise_for_status=lambda: None,
+    )
+
+
+@contextmanager
+def fast_patch(target, attr, value):
+    """轻量级猴子补丁：直接setattr替换对象属性
+
+    跳过unittest.mock.patch的导入机制解析与autospec处理，
+    对每类只打一次补丁的场景开销可忽略不计。
+    """
+    original = getattr(target, attr)
+    setattr(target, attr, value)
+    try:
+        yield value
+    finally:
+        setattr(target, attr, original)
+
+
+class _SwappableGet:
+    """requests.Session.get的可替换行为替身
+
+    下载器通过会话发请求，补丁打在Session类上对所有实例生效。
+    测试通过response/side_effect属性切换行为，
+    避免Mock在每次调用时记录调用历史的开销。
+    """
+
+    def __init__(self):
+        self.response = None
+        self.side_effect = None
+
+    def __call__(self, *args, **kwargs):
+        if self.side_effect is not None:
+            raise self.side_effect
+        return self.response
+
+
+def _write_point_shapefile(path, lons, lats):
+    """写出一份带osm_id字段的点要素Shapefile测试夹具
+
+    generate_dataset要求输入为完整的Shapefile
+    （配置验证会检查.shp/.shx/.dbf三件套）。
+
+    Args:
+        path: .shp文件路径
+        lons: 经度序列
+        lats: 纬度序列
+
+    Returns:
+        .shp文件路径
+    """
+    gdf = gpd.GeoDataFrame(
+        {'osm_id': list(range(1, len(lons) + 1))},
+        geometry=[Point(lon, lat) for lon, lat in zip(lons, lats)],
+        crs='EPSG:4326'
+    )
+    gdf.to_file(path)
+    return path
 
 
 class TestRSDatasetGeneratorIntegration(unittest.TestCase):
     """RSDatasetGenerator集成测试"""
-    
+
+    @classmethod
+    def setUpClass(cls):
+        """类级夹具：临时目录和测试输入文件整个测试类只创建一次"""
+        # TemporaryDirectory用weakref.finalize注册清理，测试崩溃也不泄漏/tmp
+        cls._class_tmp_ctx = tempfile.TemporaryDirectory()
+        cls.class_temp_dir = cls._class_tmp_ctx.name
+
+        cls.test_geojson = os.path.join(cls.class_temp_dir, 'test_points.geojson')
+        with open(cls.test_geojson, 'w', encoding='utf-8') as f:
+            f.write(_TEST_POINTS_GEOJSON_STR)
+
+        cls.test_shapefile = _write_point_shapefile(
+            os.path.join(cls.class_temp_dir, 'test_points.shp'),
+            lons=[116.3974, 121.4737, 113.2644],
+            lats=[39.9093, 31.2304, 23.1291]
+        )
+
+        # 类级HTTP补丁：setattr一次整类复用，免去每个测试的start/stop开销
+        cls._fake_get = _SwappableGet()
+        cls._get_patch = fast_patch(requests.Session, 'get', cls._fake_get)
+        cls._get_patch.__enter__()
+
+    @classmethod
+    def tearDownClass(cls):
+        """清理类级临时目录和HTTP mock"""
+        cls._get_patch.__exit__(None, None, None)
+        cls._class_tmp_ctx.cleanup()
+
     def setUp(self):
-        """测试前准备"""
-        self.temp_dir = tempfile.mkdtemp()
+        """测试前准备：每个测试使用独立的子目录和重置后的配置单例"""
+        self.temp_dir = os.path.join(self.class_temp_dir, self._testMethodName)
+        os.makedirs(self.temp_dir, exist_ok=True)
         self.output_dir = os.path.join(self.temp_dir, 'output')
-        self.cache_dir = os.path.join(self.temp_dir, 'cache')
-        
-        # 创建测试GeoJSON文件
-        self.test_geojson = self.create_test_geojson()
-        
-        # 基本配置
-        self.basic_config = {
-            'zoom_level': 18,
-            'grid_size': 3,
-            'output_dir': self.output_dir,
-            'cache_dir': self.cache_dir,
-            'downloader_type': 'sync',
-            'max_retries': 2,
-            'request_timeout': 10
-        }
-    
+
+        # 重置共享mock为默认的成功响应
+        self._fake_get.side_effect = None
+        self._fake_get.response = _make_ok_response()
+
+        # 配置单例指向本测试的临时目录，下载参数去掉等待
+        Config.reset()
+        self.config = Config()
+        self.config.paths.tile_save_dir = os.path.join(self.temp_dir, 'tiles')
+        self.config.paths.output_dir = self.output_dir
+        self.config.paths.log_dir = os.path.join(self.temp_dir, 'logs')
+        self.config.download.grid_size = 3
+        self.config.download.max_retries = 0
+        self.config.download.request_interval_range = (0.0, 0.0)
+        self.config.download.retry_wait_range = (0.0, 0.0)
+
     def tearDown(self):
         """测试后清理"""
-        shutil.rmtree(self.temp_dir, ignore_errors=True)
-    
-    def create_test_geojson(self):
-        """创建测试GeoJSON文件"""
-        test_data = {
-            "type": "FeatureCollection",
-            "features": [
-                {
-                    "type": "Feature",
-                    "geometry": {
-                        "type": "Point",
-                        "coordinates": [116.3974, 39.9093]  # 北京
-                    },
-                    "properties": {
-                        "name": "Beijing",
-                        "type": "capital",
-                        "id": 1
-                    }
-                },
-                {
-                    "type": "Feature",
-                    "geometry": {
-                        "type": "Point",
-                        "coordinates": [121.4737, 31.2304]  # 上海
-                    },
-                    "properties": {
-                        "name": "Shanghai",
-                        "type": "city",
-                        "id": 2
-                    }
-                },
-                {
-                    "type": "Feature",
-                    "geometry": {
-                        "type": "Point",
-                        "coordinates": [113.2644, 23.1291]  # 广州
-                    },
-                    "properties": {
-                        "name": "Guangzhou",
-                        "type": "city",
-                        "id": 3
-                    }
-                }
-            ]
-        }
-        
-        geojson_path = os.path.join(self.temp_dir, 'test_points.geojson')
-        with open(geojson_path, 'w', encoding='utf-8') as f:
-            json.dump(test_data, f, ensure_ascii=False, indent=2)
-        
-        return geojson_path
-    
+        Config.reset()
+
     def test_generator_initialization(self):
         """测试生成器初始化"""
-        generator = RSDatasetGenerator(config=self.basic_config)
-        
-        self.assertIsNotNone(generator.config_manager)
-        self.assertIsNotNone(generator.data_processor)
-        self.assertIsNotNone(generator.downloader_factory)
+        generator = RSDatasetGenerator()
+
+        self.assertIs(generator.config, self.config)
         self.assertIsNotNone(generator.logger)
-        self.assertIsNotNone(generator.performance_monitor)
-    
-    def test_validate_input_file_valid(self):
+        # 数据处理器在generate_dataset时才创建
+        self.assertIsNone(generator.data_processor)
+
+    def test_validate_input_valid(self):
         """测试验证有效输入文件"""
-        generator = RSDatasetGenerator(config=self.basic_config)
-        
-        result = generator.validate_input_file(self.test_geojson)
-        self.assertTrue(result)
-    
-    def test_validate_input_file_invalid(self):
+        generator = RSDatasetGenerator()
+
+        self.assertTrue(generator.validate_input(self.test_geojson))
+        self.assertTrue(generator.validate_input(self.test_shapefile))
+
+    def test_validate_input_invalid(self):
         """测试验证无效输入文件"""
-        generator = RSDatasetGenerator(config=self.basic_config)
-        
+        generator = RSDatasetGenerator()
+
         # 不存在的文件
-        result = generator.validate_input_file('/nonexistent/file.geojson')
-        self.assertFalse(result)
-        
+        self.assertFalse(generator.validate_input('/nonexistent/file.geojson'))
+
         # 无效格式的文件
         invalid_file = os.path.join(self.temp_dir, 'invalid.txt')
         with open(invalid_file, 'w') as f:
             f.write('invalid content')
-        
-        result = generator.validate_input_file(invalid_file)
-        self.assertFalse(result)
-    
+
+        self.assertFalse(generator.validate_input(invalid_file))
+
     def test_get_supported_formats(self):
         """测试获取支持的格式"""
-        generator = RSDatasetGenerator(config=self.basic_config)
-        
+        generator = RSDatasetGenerator()
+
         formats = generator.get_supported_formats()
-        
+
         self.assertIsInstance(formats, list)
         self.assertIn('.geojson', formats)
         self.assertIn('.shp', formats)
-    
-    def test_get_downloader_types(self):
+
+    def test_get_available_downloader_types(self):
         """测试获取下载器类型"""
-        generator = RSDatasetGenerator(config=self.basic_config)
-        
-        types = generator.get_downloader_types()
-        
+        generator = RSDatasetGenerator()
+
+        types = generator.get_available_downloader_types()
+
         self.assertIsInstance(types, list)
         self.assertIn('sync', types)
         self.assertIn('async', types)
-        self.assertIn('auto', types)
-    
+
     def test_estimate_processing_time(self):
         """测试估算处理时间"""
-        generator = RSDatasetGenerator(config=self.basic_config)
-        
-        estimated_time = generator.estimate_processing_time(
-            input_file=self.test_geojson,
-            config=self.basic_config
-        )
-        
-        self.assertIsInstance(estimated_time, dict)
-        self.assertIn('total_points', estimated_time)
-        self.assertIn('estimated_time_seconds', estimated_time)
-        self.assertIn('estimated_tiles', estimated_time)
-        
-        # 应该检测到3个点
-        self.assertEqual(estimated_time['total_points'], 3)
-        
+        generator = RSDatasetGenerator()
+
+        estimation = generator.estimate_processing_time(self.test_geojson)
+
+        self.assertIn('total_points', estimation)
+        self.assertIn('total_tiles', estimation)
+        self.assertIn('estimated_total_time', estimation)
+
+        # 应该检测到3个点，每个点grid_size^2个瓦片
+        self.assertEqual(estimation['total_points'], 3)
+        self.assertEqual(estimation['total_tiles'], 3 * 3 ** 2)
+
         # 估算时间应该是正数
-        self.assertGreater(estimated_time['estimated_time_seconds'], 0)
-    
-    def test_get_config_info(self):
-        """测试获取配置信息"""
-        generator = RSDatasetGenerator(config=self.basic_config)
-        
-        config_info = generator.get_config_info()
-        
-        self.assertIsInstance(config_info, dict)
-        self.assertIn('current_config', config_info)
-        self.assertIn('default_config', config_info)
-        self.assertIn('config_schema', config_info)
-    
-    @patch('requests.get')
-    def test_generate_dataset_success(self, mock_get):
+        self.assertGreater(estimation['estimated_total_time'], 0)
+
+    def test_generate_dataset_success(self):
         """测试成功生成数据集"""
-        # 模拟成功的HTTP响应
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.content = b'\x89PNG\r\n\x1a\n' + b'\x00' * 100  # 简单的PNG头
-        mock_response.raise_for_status.return_value = None
-        mock_get.return_value = mock_response
-        
-        generator = RSDatasetGenerator(config=self.basic_config)
-        
+        generator = RSDatasetGenerator()
+
         result = generator.generate_dataset(
-            input_file=self.test_geojson,
+            input_file=self.test_shapefile,
             output_dir=self.output_dir
         )
-        
-        self.assertIsInstance(result, dict)
-        self.assertIn('success', result)
-        self.assertIn('summary', result)
+
+        self.assertIn('processing_stats', result)
         self.assertIn('output_files', result)
-        
-        if result['success']:
-            # 检查输出目录是否创建
-            self.assertTrue(os.path.exists(self.output_dir))
-            
-            # 检查是否有输出文件
-            self.assertGreater(len(result['output_files']), 0)
-    
-    @patch('requests.get')
-    def test_generate_dataset_with_custom_config(self, mock_get):
-        """测试使用自定义配置生成数据集"""
-        # 模拟成功的HTTP响应
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.content = b'\x89PNG\r\n\x1a\n' + b'\x00' * 100
-        mock_response.raise_for_status.return_value = None
-        mock_get.return_value = mock_response
-        
-        # 自定义配置
-        custom_config = self.basic_config.copy()
-        custom_config.update({
-            'zoom_level': 16,
-            'grid_size': 5,
-            'downloader_type': 'async',
-            'max_concurrency': 5
-        })
-        
-        generator = RSDatasetGenerator(config=custom_config)
-        
+        self.assertIn('dataset_metadata', result)
+
+        stats = result['processing_stats']
+        self.assertEqual(stats['total_points'], 3)
+        self.assertEqual(stats['successful_points'], 3)
+        self.assertEqual(stats['failed_points'], 0)
+
+        # 检查输出文件
+        output_files = result['output_files']
+        self.assertEqual(output_files['images_count'], 3)
+        self.assertTrue(os.path.exists(self.output_dir))
+        for file_path in output_files['summary_files'].values():
+            self.assertTrue(os.path.exists(file_path))
+
+    def test_generate_dataset_with_options(self):
+        """测试带处理选项生成数据集"""
+        generator = RSDatasetGenerator()
+
         result = generator.generate_dataset(
-            input_file=self.test_geojson,
+            input_file=self.test_shapefile,
             output_dir=self.output_dir,
-            config_overrides={'grid_size': 7}  # 运行时覆盖
+            zoom=16,
+            grid_size=3
         )
-        
-        self.assertIsInstance(result, dict)
-        self.assertIn('success', result)
-    
+
+        # 处理选项应该应用到配置
+        self.assertEqual(generator.config.download.zoom, 16)
+        self.assertEqual(result['processing_stats']['successful_points'], 3)
+
     def test_generate_dataset_invalid_input(self):
         """测试无效输入的数据集生成"""
-        generator = RSDatasetGenerator(config=self.basic_config)
-        
-        # 不存在的文件
-        result = generator.generate_dataset(
-            input_file='/nonexistent/file.geojson',
-            output_dir=self.output_dir
-        )
-        
-        self.assertIsInstance(result, dict)
-        self.assertIn('success', result)
-        self.assertFalse(result['success'])
-        self.assertIn('error', result)
-    
-    @patch('requests.get')
-    def test_generate_dataset_network_error(self, mock_get):
+        generator = RSDatasetGenerator()
+
+        with self.assertRaises(ValidationError):
+            generator.generate_dataset(
+                input_file='/nonexistent/file.shp',
+                output_dir=self.output_dir
+            )
+
+    def test_generate_dataset_network_error(self):
         """测试网络错误时的数据集生成"""
         # 模拟网络错误
-        mock_get.side_effect = Exception("网络连接失败")
-        
-        generator = RSDatasetGenerator(config=self.basic_config)
-        
+        self._fake_get.side_effect = requests.exceptions.ConnectionError("网络连接失败")
+
+        generator = RSDatasetGenerator()
+
         result = generator.generate_dataset(
-            input_file=self.test_geojson,
+            input_file=self.test_shapefile,
             output_dir=self.output_dir
         )
-        
-        self.assertIsInstance(result, dict)
-        self.assertIn('success', result)
-        # 根据重试机制，可能成功也可能失败
-        self.assertIn('summary', result)
-    
+
+        # 所有瓦片下载失败，但流程应该正常完成并如实统计
+        stats = result['processing_stats']
+        self.assertEqual(stats['successful_points'], 0)
+        self.assertEqual(stats['failed_points'], 3)
+        self.assertEqual(stats['successful_tiles'], 0)
+
     def test_create_generator_function(self):
         """测试create_generator便捷函数"""
         generator = create_generator(
-            zoom_level=18,
-            grid_size=3,
-            output_dir=self.output_dir,
-            downloader_type='sync'
+            download={'zoom': 16, 'grid_size': 3}
         )
-        
+
         self.assertIsInstance(generator, RSDatasetGenerator)
-        self.assertEqual(generator.config['zoom_level'], 18)
-        self.assertEqual(generator.config['grid_size'], 3)
-    
-    @patch('requests.get')
-    def test_quick_generate_function(self, mock_get):
+        self.assertEqual(generator.config.download.zoom, 16)
+        self.assertEqual(generator.config.download.grid_size, 3)
+
+    def test_quick_generate_function(self):
         """测试quick_generate便捷函数"""
-        # 模拟成功的HTTP响应
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.content = b'\x89PNG\r\n\x1a\n' + b'\x00' * 100
-        mock_response.raise_for_status.return_value = None
-        mock_get.return_value = mock_response
-        
         result = quick_generate(
-            input_file=self.test_geojson,
+            input_file=self.test_shapefile,
             output_dir=self.output_dir,
-            zoom_level=18,
+            zoom=18,
             grid_size=3
         )
-        
-        self.assertIsInstance(result, dict)
-        self.assertIn('success', result)
-        self.assertIn('summary', result)
+
+        self.assertIn('processing_stats', result)
+        self.assertEqual(result['processing_stats']['successful_points'], 3)
 
 
 class TestConfigurationIntegration(unittest.TestCase):
     """配置集成测试"""
-    
+
+    @classmethod
+    def setUpClass(cls):
+        """类级夹具：配置文件整个测试类只写一次"""
+        # TemporaryDirectory用weakref.finalize注册清理，测试崩溃也不泄漏/tmp
+        cls._class_tmp_ctx = tempfile.TemporaryDirectory()
+        cls.class_temp_dir = cls._class_tmp_ctx.name
+        cls.config_file = os.path.join(cls.class_temp_dir, 'test_config.yaml')
+        cls.create_test_config_file()
+
+    @classmethod
+    def tearDownClass(cls):
+        """类级清理"""
+        cls._class_tmp_ctx.cleanup()
+
     def setUp(self):
         """测试前准备"""
-        self.temp_dir = tempfile.mkdtemp()
-        self.config_file = os.path.join(self.temp_dir, 'test_config.yaml')
-    
+        Config.reset()
+
     def tearDown(self):
         """测试后清理"""
-        shutil.rmtree(self.temp_dir, ignore_errors=True)
-    
-    def create_test_config_file(self):
+        Config.reset()
+
+    @classmethod
+    def create_test_config_file(cls):
         """创建测试配置文件"""
-        config_content = """
+        config_content = f"""
 download:
-  zoom_level: 18
+  zoom: 18
   grid_size: 5
-  tile_size: 256
-
-network:
+  max_concurrency: 10
   max_retries: 3
   request_timeout: 30
-  max_concurrency: 10
-  downloader_type: "async"
 
 paths:
-  output_dir: "/tmp/rs_output"
-  cache_dir: "/tmp/rs_cache"
-  temp_dir: "/tmp/rs_temp"
-
-image:
-  output_format: "png"
-  quality: 95
-  add_markers: true
-  marker_color: [255, 0, 0]
-  marker_size: 10
-
-logging:
-  level: "INFO"
-  console_output: true
-  file_output: true
-  log_file: "rs_generator.log"
+  tile_save_dir: "{cls.class_temp_dir}/tiles"
+  output_dir: "{cls.class_temp_dir}/output"
+  log_dir: "{cls.class_temp_dir}/logs"
+
+network:
+  base_url: "http://mt0.google.com/vt/lyrs=s&hl=en"
 """
-        
-        with open(self.config_file, 'w', encoding='utf-8') as f:
+
+        with open(cls.config_file, 'w', encoding='utf-8') as f:
             f.write(config_content)
-    
+
     def test_load_config_from_file(self):
         """测试从文件加载配置"""
-        self.create_test_config_file()
-        
-        config_manager = ConfigManager()
-        config = config_manager.load_config(self.config_file)
-        
-        self.assertIsInstance(config, dict)
-        self.assertEqual(config['download']['zoom_level'], 18)
-        self.assertEqual(config['network']['downloader_type'], 'async')
-        self.assertEqual(config['image']['output_format'], 'png')
-    
-    def test_config_validation(self):
-        """测试配置验证"""
-        self.create_test_config_file()
-        
-        config_manager = ConfigManager()
-        config = config_manager.load_config(self.config_file)
-        
-        # 验证加载的配置
-        is_valid = config_manager.validate_config(config)
-        self.assertTrue(is_valid)
-    
+        config = Config()
+        config.load_from_file(self.config_file)
+
+        self.assertEqual(config.download.zoom, 18)
+        self.assertEqual(config.download.grid_size, 5)
+        self.assertEqual(config.download.max_concurrency, 10)
+        self.assertTrue(config.paths.output_dir.endswith('/output'))
+
     def test_config_with_overrides(self):
         """测试配置覆盖"""
-        self.create_test_config_file()
-        
-        config_manager = ConfigManager()
-        overrides = {
-            'download': {'zoom_level': 20},
-            'network': {'max_concurrency': 20}
-        }
-        
-        config = config_manager.load_config(self.config_file, overrides)
-        
+        config = Config()
+        config.load_from_file(self.config_file)
+
+        config.update_from_dict({
+            'download': {'zoom': 20, 'max_concurrency': 20}
+        })
+
         # 检查覆盖是否生效
-        self.assertEqual(config['download']['zoom_level'], 20)
-        self.assertEqual(config['network']['max_concurrency'], 20)
-        
+        self.assertEqual(config.download.zoom, 20)
+        self.assertEqual(config.download.max_concurrency, 20)
+
         # 检查未覆盖的值是否保持不变
-        self.assertEqual(config['download']['grid_size'], 5)
-        self.assertEqual(config['network']['max_retries'], 3)
-    
+        self.assertEqual(config.download.grid_size, 5)
+        self.assertEqual(config.download.max_retries, 3)
+
     def test_generator_with_config_file(self):
         """测试使用配置文件创建生成器"""
-        self.create_test_config_file()
-        
         generator = RSDatasetGenerator(config_file=self.config_file)
-        
-        self.assertEqual(generator.config['download']['zoom_level'], 18)
-        self.assertEqual(generator.config['network']['downloader_type'], 'async')
-        self.assertEqual(generator.config['image']['output_format'], 'png')
+
+        self.assertEqual(generator.config.download.zoom, 18)
+        self.assertEqual(generator.config.download.grid_size, 5)
+
+    def test_generator_with_kwargs(self):
+        """测试配置文件与额外参数叠加"""
+        generator = RSDatasetGenerator(
+            config_file=self.config_file,
+            download={'zoom': 15}
+        )
+
+        # 额外参数覆盖配置文件
+        self.assertEqual(generator.config.download.zoom, 15)
+        self.assertEqual(generator.config.download.grid_size, 5)
 
 
 class TestPerformanceIntegration(unittest.TestCase):
     """性能集成测试"""
-    
+
+    @classmethod
+    def setUpClass(cls):
+        """类级夹具：大测试文件整个测试类只生成一次"""
+        # TemporaryDirectory用weakref.finalize注册清理，测试崩溃也不泄漏/tmp
+        cls._class_tmp_ctx = tempfile.TemporaryDirectory()
+        cls.class_temp_dir = cls._class_tmp_ctx.name
+        cls.test_shapefile = cls.create_large_test_shapefile()
+
+        # 类级HTTP补丁
+        cls._fake_get = _SwappableGet()
+        cls._get_patch = fast_patch(requests.Session, 'get', cls._fake_get)
+        cls._get_patch.__enter__()
+
+    @classmethod
+    def tearDownClass(cls):
+        """清理类级临时目录和HTTP mock"""
+        cls._get_patch.__exit__(None, None, None)
+        cls._class_tmp_ctx.cleanup()
+
     def setUp(self):
-        """测试前准备"""
-        self.temp_dir = tempfile.mkdtemp()
+        """测试前准备：每个测试使用独立的输出子目录"""
+        self.temp_dir = os.path.join(self.class_temp_dir, self._testMethodName)
+        os.makedirs(self.temp_dir, exist_ok=True)
         self.output_dir = os.path.join(self.temp_dir, 'output')
-        
-        # 创建包含多个点的测试文件
-        self.test_geojson = self.create_large_test_geojson()
-    
+
+        # 记录测试前线程数，tearDown据此检查工作线程是否遗留
+        self._threads_before = threading.active_count()
+
+        # 重置共享mock为默认的成功响应
+        self._fake_get.side_effect = None
+        self._fake_get.response = _make_ok_response()
+
+        Config.reset()
+        self.config = Config()
+        self.config.paths.tile_save_dir = os.path.join(self.temp_dir, 'tiles')
+        self.config.paths.output_dir = self.output_dir
+        self.config.paths.log_dir = os.path.join(self.temp_dir, 'logs')
+        self.config.download.grid_size = 3
+        self.config.download.max_retries = 0
+        self.config.download.request_interval_range = (0.0, 0.0)
+        self.config.download.retry_wait_range = (0.0, 0.0)
+
     def tearDown(self):
-        """测试后清理"""
-        shutil.rmtree(self.temp_dir, ignore_errors=True)
-    
-    def create_large_test_geojson(self, num_points=10):
-        """创建包含多个点的测试GeoJSON文件"""
-        features = []
-        
-        # 在北京周围生成随机点
+        """检查下载器/图像处理的工作线程没有泄漏到后续测试
+
+        线程池shutdown(wait=False)后工作线程异步退出，
+        先短暂等待退出完成再断言，避免与线程调度竞争。
+        """
+        Config.reset()
+
+        deadline = time.monotonic() + 2.0
+        while (threading.active_count() > self._threads_before
+               and time.monotonic() < deadline):
+            time.sleep(0.01)
+
+        self.assertLessEqual(
+            threading.active_count(), self._threads_before,
+            "下载或图像处理的工作线程未随测试结束而停止"
+        )
+
+    @classmethod
+    def create_large_test_shapefile(cls, num_points=10):
+        """创建包含多个点的测试Shapefile（按点数区分文件名）"""
+        # 在北京周围0.1度范围内向量化生成随机点（固定种子保证可复现）
         base_lon, base_lat = 116.3974, 39.9093
-        
-        for i in range(num_points):
-            # 在基准点周围0.1度范围内生成随机点
-            import random
-            lon = base_lon + (random.random() - 0.5) * 0.1
-            lat = base_lat + (random.random() - 0.5) * 0.1
-            
-            feature = {
-                "type": "Feature",
-                "geometry": {
-                    "type": "Point",
-                    "coordinates": [lon, lat]
-                },
-                "properties": {
-                    "id": i + 1,
-                    "name": f"Point_{i + 1}",
-                    "category": "test"
-                }
-            }
-            features.append(feature)
-        
-        test_data = {
-            "type": "FeatureCollection",
-            "features": features
-        }
-        
-        geojson_path = os.path.join(self.temp_dir, 'large_test_points.geojson')
-        with open(geojson_path, 'w', encoding='utf-8') as f:
-            json.dump(test_data, f, ensure_ascii=False, indent=2)
-        
-        return geojson_path
-    
-    @patch('requests.get')
-    def test_sync_vs_async_performance(self, mock_get):
-        """测试同步vs异步下载器性能"""
-        # 模拟快速响应
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.content = b'\x89PNG\r\n\x1a\n' + b'\x00' * 100
-        mock_response.raise_for_status.return_value = None
-        mock_get.return_value = mock_response
-        
-        # 测试同步下载器
-        sync_config = {
-            'zoom_level': 18,
-            'grid_size': 3,
-            'output_dir': os.path.join(self.output_dir, 'sync'),
-            'downloader_type': 'sync',
-            'max_retries': 1
-        }
-        
-        sync_generator = RSDatasetGenerator(config=sync_config)
-        
-        start_time = time.time()
-        sync_result = sync_generator.generate_dataset(
-            input_file=self.test_geojson,
-            output_dir=sync_config['output_dir']
+        rng = np.random.default_rng(0)
+        lons = base_lon + (rng.random(num_points) - 0.5) * 0.1
+        lats = base_lat + (rng.random(num_points) - 0.5) * 0.1
+
+        return _write_point_shapefile(
+            os.path.join(cls.class_temp_dir, f'large_test_points_{num_points}.shp'),
+            lons=lons.tolist(),
+            lats=lats.tolist()
         )
-        sync_time = time.time() - start_time
-        
-        # 测试异步下载器
-        async_config = {
-            'zoom_level': 18,
-            'grid_size': 3,
-            'output_dir': os.path.join(self.output_dir, 'async'),
-            'downloader_type': 'async',
-            'max_concurrency': 5,
-            'max_retries': 1
-        }
-        
-        async_generator = RSDatasetGenerator(config=async_config)
-        
-        start_time = time.time()
-        async_result = async_generator.generate_dataset(
-            input_file=self.test_geojson,
-            output_dir=async_config['output_dir']
+
+    @unittest.skipUnless(os.environ.get('RUN_BENCHMARKS'),
+                         '基准测试默认跳过，设置RUN_BENCHMARKS=1启用（常规基准见benchmark.py）')
+    def test_pipeline_throughput(self):
+        """测试端到端处理流水线的吞吐量"""
+        generator = RSDatasetGenerator()
+
+        start_time = time.monotonic()
+        result = generator.generate_dataset(
+            input_file=self.test_shapefile,
+            output_dir=self.output_dir
         )
-        async_time = time.time() - start_time
-        
-        # 验证两种方式都能成功处理
-        self.assertIsInstance(sync_result, dict)
-        self.assertIsInstance(async_result, dict)
-        
+        elapsed = time.monotonic() - start_time
+
+        stats = result['processing_stats']
+        self.assertEqual(stats['failed_points'], 0)
+
         # 记录性能数据（用于分析，不做严格断言）
-        print(f"\n同步下载器耗时: {sync_time:.2f}秒")
-        print(f"异步下载器耗时: {async_time:.2f}秒")
-        
-        if sync_result.get('success') and async_result.get('success'):
-            print(f"性能提升: {((sync_time - async_time) / sync_time * 100):.1f}%")
-    
-    def test_memory_usage_monitoring(self):
-        """测试内存使用监控"""
-        config = {
-            'zoom_level': 18,
-            'grid_size': 3,
-            'output_dir': self.output_dir,
-            'downloader_type': 'sync',
-            'enable_monitoring': True
-        }
-        
-        generator = RSDatasetGenerator(config=config)
-        
-        # 启动性能监控
-        generator.performance_monitor.start_monitoring()
-        
-        # 模拟一些处理
-        time.sleep(0.5)
-        
-        # 停止监控并获取统计
-        generator.performance_monitor.stop_monitoring()
-        stats = generator.performance_monitor.get_statistics()
-        
-        self.assertIsInstance(stats, dict)
-        self.assertIn('avg_memory_mb', stats)
-        self.assertIn('peak_memory_mb', stats)
-        self.assertIn('avg_cpu_percent', stats)
-        
-        # 内存使用应该是合理的
-        self.assertGreater(stats['avg_memory_mb'], 0)
-        self.assertGreater(stats['peak_memory_mb'], 0)
-    
-    def test_large_dataset_processing(self):
-        """测试大数据集处理"""
-        # 创建更大的测试数据集
-        large_geojson = self.create_large_test_geojson(num_points=50)
-        
-        config = {
-            'zoom_level': 16,  # 降低缩放级别以减少瓦片数量
-            'grid_size': 3,
-            'output_dir': self.output_dir,
-            'downloader_type': 'async',
-            'max_concurrency': 10,
-            'max_retries': 1
-        }
-        
-        generator = RSDatasetGenerator(config=config)
-        
-        # 估算处理时间
-        estimation = generator.estimate_processing_time(
-            input_file=large_geojson,
-            config=config
+        tiles_per_sec = stats['successful_tiles'] / max(elapsed, 1e-6)
+        print(f"\n流水线耗时: {elapsed:.2f}秒")
+        print(f"瓦片吞吐量: {tiles_per_sec:.1f} 瓦片/秒")
+
+    def test_end_to_end_processing(self):
+        """测试10点数据集的完整处理流程"""
+        generator = RSDatasetGenerator()
+
+        result = generator.generate_dataset(
+            input_file=self.test_shapefile,
+            output_dir=self.output_dir
         )
-        
+
+        stats = result['processing_stats']
+        self.assertEqual(stats['total_points'], 10)
+        self.assertEqual(stats['successful_points'], 10)
+        self.assertEqual(stats['total_tiles'], 10 * 3 ** 2)
+
+        # 每个点生成一张拼接图像
+        self.assertEqual(result['output_files']['images_count'], 10)
+
+    def test_large_dataset_estimation(self):
+        """测试大数据集的处理时间估算"""
+        # 创建更大的测试数据集
+        large_shapefile = self.create_large_test_shapefile(num_points=50)
+
+        generator = RSDatasetGenerator()
+
+        estimation = generator.estimate_processing_time(large_shapefile)
+
         self.assertEqual(estimation['total_points'], 50)
-        self.assertGreater(estimation['estimated_tiles'], 0)
-        self.assertGreater(estimation['estimated_time_seconds'], 0)
-        
-        print(f"\n大数据集估算:")
-        print(f"  总点数: {estimation['total_points']}")
-        print(f"  估算瓦片数: {estimation['estimated_tiles']}")
-        print(f"  估算时间: {estimation['estimated_time_seconds']:.1f}秒")
+        self.assertEqual(estimation['total_tiles'], 50 * 3 ** 2)
+        self.assertGreater(estimation['estimated_total_time'], 0)
 
 
 class TestErrorHandlingIntegration(unittest.TestCase):
     """错误处理集成测试"""
-    
+
+    @classmethod
+    def setUpClass(cls):
+        """类级夹具：无效坐标与单点Shapefile所有测试共享"""
+        # TemporaryDirectory用weakref.finalize注册清理，测试崩溃也不泄漏/tmp
+        cls._class_tmp_ctx = tempfile.TemporaryDirectory()
+        cls.class_temp_dir = cls._class_tmp_ctx.name
+
+        # 一个无效坐标点和一个有效坐标点
+        cls.invalid_coords_shp = _write_point_shapefile(
+            os.path.join(cls.class_temp_dir, 'invalid_coords.shp'),
+            lons=[200.0, 116.3974],
+            lats=[100.0, 39.9093]
+        )
+
+        # 单个有效点
+        cls.single_point_shp = _write_point_shapefile(
+            os.path.join(cls.class_temp_dir, 'single_point.shp'),
+            lons=[116.3974],
+            lats=[39.9093]
+        )
+
+        # 类级HTTP补丁
+        cls._fake_get = _SwappableGet()
+        cls._get_patch = fast_patch(requests.Session, 'get', cls._fake_get)
+        cls._get_patch.__enter__()
+
+    @classmethod
+    def tearDownClass(cls):
+        """清理类级临时目录和HTTP mock"""
+        cls._get_patch.__exit__(None, None, None)
+        cls._class_tmp_ctx.cleanup()
+
     def setUp(self):
-        """测试前准备"""
-        self.temp_dir = tempfile.mkdtemp()
+        """测试前准备：每个测试使用独立的输出子目录"""
+        self.temp_dir = os.path.join(self.class_temp_dir, self._testMethodName)
+        os.makedirs(self.temp_dir, exist_ok=True)
         self.output_dir = os.path.join(self.temp_dir, 'output')
-    
+
+        # 重置共享mock为默认的成功响应
+        self._fake_get.side_effect = None
+        self._fake_get.response = _make_ok_response()
+
+        Config.reset()
+        self.config = Config()
+        self.config.paths.tile_save_dir = os.path.join(self.temp_dir, 'tiles')
+        self.config.paths.output_dir = self.output_dir
+        self.config.paths.log_dir = os.path.join(self.temp_dir, 'logs')
+        self.config.download.grid_size = 3
+        self.config.download.max_retries = 0
+        self.config.download.request_interval_range = (0.0, 0.0)
+        self.config.download.retry_wait_range = (0.0, 0.0)
+
     def tearDown(self):
         """测试后清理"""
-        shutil.rmtree(self.temp_dir, ignore_errors=True)
-    
+        Config.reset()
+
     def test_invalid_coordinates_handling(self):
         """测试无效坐标处理"""
-        # 创建包含无效坐标的GeoJSON
-        invalid_data = {
-            "type": "FeatureCollection",
-            "features": [
-                {
-                    "type": "Feature",
-                    "geometry": {
-                        "type": "Point",
-                        "coordinates": [200.0, 100.0]  # 无效坐标
-                    },
-                    "properties": {"name": "Invalid Point"}
-                },
-                {
-                    "type": "Feature",
-                    "geometry": {
-                        "type": "Point",
-                        "coordinates": [116.3974, 39.9093]  # 有效坐标
-                    },
-                    "properties": {"name": "Valid Point"}
-                }
-            ]
-        }
-        
-        invalid_geojson = os.path.join(self.temp_dir, 'invalid_coords.geojson')
-        with open(invalid_geojson, 'w', encoding='utf-8') as f:
-            json.dump(invalid_data, f)
-        
-        config = {
-            'zoom_level': 18,
-            'grid_size': 3,
-            'output_dir': self.output_dir,
-            'downloader_type': 'sync'
-        }
-        
-        generator = RSDatasetGenerator(config=config)
-        
-        with patch('requests.get') as mock_get:
-            mock_response = Mock()
-            mock_response.status_code = 200
-            mock_response.content = b'\x89PNG\r\n\x1a\n' + b'\x00' * 100
-            mock_response.raise_for_status.return_value = None
-            mock_get.return_value = mock_response
-            
-            result = generator.generate_dataset(
-                input_file=invalid_geojson,
-                output_dir=self.output_dir
-            )
-        
-        self.assertIsInstance(result, dict)
-        self.assertIn('summary', result)
-        
-        # 应该处理有效点，跳过无效点
-        if 'processing_stats' in result['summary']:
-            stats = result['summary']['processing_stats']
-            self.assertGreater(stats.get('failed_points', 0), 0)
-    
-    def test_network_timeout_handling(self):
-        """测试网络超时处理"""
-        # 创建简单的测试文件
-        test_data = {
-            "type": "FeatureCollection",
-            "features": [
-                {
-                    "type": "Feature",
-                    "geometry": {
-                        "type": "Point",
-                        "coordinates": [116.3974, 39.9093]
-                    },
-                    "properties": {"name": "Test Point"}
-                }
-            ]
-        }
-        
-        test_geojson = os.path.join(self.temp_dir, 'test.geojson')
-        with open(test_geojson, 'w', encoding='utf-8') as f:
-            json.dump(test_data, f)
-        
-        config = {
-            'zoom_level': 18,
-            'grid_size': 3,
-            'output_dir': self.output_dir,
-            'downloader_type': 'sync',
-            'request_timeout': 1,  # 很短的超时时间
-            'max_retries': 2
-        }
-        
-        generator = RSDatasetGenerator(config=config)
-        
-        with patch('requests.get') as mock_get:
-            # 模拟超时
-            import requests
-            mock_get.side_effect = requests.exceptions.Timeout("请求超时")
-            
-            result = generator.generate_dataset(
-                input_file=test_geojson,
-                output_dir=self.output_dir
-            )
-        
-        self.assertIsInstance(result, dict)
-        self.assertIn('summary', result)
-        
-        # 应该记录下载失败
-        if 'processing_stats' in result['summary']:
-            stats = result['summary']['processing_stats']
-            # 由于网络错误，下载的瓦片数量应该很少或为0
-            self.assertLessEqual(stats.get('downloaded_tiles', 0), stats.get('total_tiles', 1))
-    
-    def test_disk_space_handling(self):
-        """测试磁盘空间不足处理"""
-        # 这个测试比较难模拟，主要测试错误处理逻辑
-        config = {
-            'zoom_level': 18,
-            'grid_size': 3,
-            'output_dir': '/invalid/path/that/does/not/exist',  # 无效路径
-            'downloader_type': 'sync'
-        }
-        
-        generator = RSDatasetGenerator(config=config)
-        
-        # 创建简单的测试文件
-        test_data = {
-            "type": "FeatureCollection",
-            "features": [
-                {
-                    "type": "Feature",
-                    "geometry": {
-                        "type": "Point",
-                        "coordinates": [116.3974, 39.9093]
-                    },
-                    "properties": {"name": "Test Point"}
-                }
-            ]
-        }
-        
-        test_geojson = os.path.join(self.temp_dir, 'test.geojson')
-        with open(test_geojson, 'w', encoding='utf-8') as f:
-            json.dump(test_data, f)
-        
+        generator = RSDatasetGenerator()
+
         result = generator.generate_dataset(
-            input_file=test_geojson,
-            output_dir=config['output_dir']
+            input_file=self.invalid_coords_shp,
+            output_dir=self.output_dir
         )
-        
-        self.assertIsInstance(result, dict)
-        self.assertIn('success', result)
-        # 由于路径无效，应该失败
-        self.assertFalse(result['success'])
-        self.assertIn('error', result)
+
+        # 无效坐标点在加载时被过滤，只处理有效点
+        stats = result['processing_stats']
+        self.assertEqual(stats['total_points'], 1)
+        self.assertEqual(stats['successful_points'], 1)
+
+    def test_error_scenarios(self):
+        """测试超时与无效输出路径两类错误场景
+
+        两个场景共享同一份类级单点Shapefile夹具，
+        用subTest参数化（unittest版的pytest.mark.parametrize）。
+        """
+        # 无效输出路径指向一个已存在的文件之下，创建目录必然失败
+        scenarios = {
+            'timeout': {
+                'output_dir': self.output_dir,
+                'side_effect': requests.exceptions.Timeout("请求超时")
+            },
+            'bad_path': {
+                'output_dir': os.path.join(self.single_point_shp, 'output'),
+                'side_effect': None
+            },
+        }
+
+        for scenario, params in scenarios.items():
+            with self.subTest(scenario=scenario):
+                self._fake_get.side_effect = params['side_effect']
+                generator = RSDatasetGenerator()
+
+                if scenario == 'timeout':
+                    result = generator.generate_dataset(
+                        input_file=self.single_point_shp,
+                        output_dir=params['output_dir']
+                    )
+
+                    # 下载全部超时，应该如实统计失败
+                    stats = result['processing_stats']
+                    self.assertEqual(stats['successful_tiles'], 0)
+                    self.assertEqual(stats['failed_points'], 1)
+                else:
+                    # 输出目录无法创建，应该直接报错
+                    with self.assertRaises(OSError):
+                        generator.generate_dataset(
+                            input_file=self.single_point_shp,
+                            output_dir=params['output_dir']
+                        )
 
 
 if __name__ == '__main__':
     # 设置测试环境
     os.environ['TESTING'] = '1'
-    
+
     # 运行测试
-    unittest.main(verbosity=2)
\ No newline at end of file
+    unittest.main(verbosity=2)
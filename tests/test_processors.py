@@ -8,36 +8,28 @@
 - 元数据管理
 """
 
+import csv
 import os
-import sys
 import unittest
 import tempfile
 import json
+import geopandas as gpd
 import numpy as np
-from pathlib import Path
 from unittest.mock import Mock, patch, MagicMock
 from PIL import Image
 
-# 添加项目根目录到Python路径
-project_root = Path(__file__).parent.parent
-sys.path.insert(0, str(project_root))
-
-try:
-    from src.processors.data_loader import (
-        DataLoader, ShapefileLoader, GeoJSONLoader, 
-        GeoPoint, GeoBounds
-    )
-    from src.processors.image_processor import (
-        ImageProcessor, TileMerger, PixelCoordinate, ImageMetadata
-    )
-    from src.processors.metadata_manager import (
-        MetadataManager, DatasetMetadata, ProcessingStats
-    )
-    from src.processors.data_processor import DataProcessor
-except ImportError as e:
-    print(f"导入错误: {e}")
-    print("请确保在项目根目录运行测试")
-    sys.exit(1)
+from tests._fs import fast_rmtree
+from src.processors.data_loader import (
+    DataLoader, ShapefileLoader, GeoJSONLoader, 
+    GeoPoint, GeoBounds, GeoPointArray
+)
+from src.processors.image_processor import (
+    ImageProcessor, TileMerger, PixelCoordinate, ImageMetadata
+)
+from src.processors.metadata_manager import (
+    MetadataManager, DatasetMetadata, ProcessingStats
+)
+from src.processors.data_processor import DataProcessor
 
 
 class TestGeoPoint(unittest.TestCase):
@@ -97,7 +89,44 @@ class TestGeoPoint(unittest.TestCase):
         
         # 同一点的距离应该是0
         self.assertEqual(beijing.distance_to(beijing), 0.0)
-    
+
+    def test_geo_point_distance_to_array(self):
+        """测试向量化距离计算与标量内核一致"""
+        beijing = GeoPoint(longitude=116.3974, latitude=39.9093)
+
+        rng = np.random.default_rng(42)
+        lons = rng.uniform(-180.0, 180.0, 10000)
+        lats = rng.uniform(-90.0, 90.0, 10000)
+
+        vectorized = beijing.distance_to_array(lons, lats)
+
+        self.assertEqual(vectorized.shape, lons.shape)
+
+        # 抽样与逐点标量结果比对
+        for i in range(0, 10000, 997):
+            scalar = beijing.distance_to(
+                GeoPoint(longitude=lons[i], latitude=lats[i])
+            )
+            self.assertAlmostEqual(vectorized[i], scalar, places=9)
+    
+    def test_geo_point_pairwise_distances(self):
+        """测试两两距离矩阵与标量内核一致"""
+        rng = np.random.default_rng(7)
+        lons = rng.uniform(-180.0, 180.0, 100)
+        lats = rng.uniform(-90.0, 90.0, 100)
+
+        points = GeoPointArray(lons=lons, lats=lats)
+        matrix = points.pairwise_distances()
+
+        self.assertEqual(matrix.shape, (100, 100))
+
+        # 对角线为零，抽样与逐点标量结果比对
+        for i in range(0, 100, 13):
+            self.assertAlmostEqual(matrix[i, i], 0.0, places=6)
+            for j in range(0, 100, 29):
+                scalar = points[i].distance_to(points[j])
+                self.assertAlmostEqual(matrix[i, j], scalar, places=9)
+
     def test_geo_point_to_dict(self):
         """测试地理点转字典"""
         point = GeoPoint(
@@ -165,7 +194,51 @@ class TestGeoBounds(unittest.TestCase):
         # 边界上的点
         boundary_point = GeoPoint(longitude=116.0, latitude=39.0)
         self.assertTrue(bounds.contains_point(boundary_point))
-    
+
+    def test_geo_bounds_contains_points_vectorized(self):
+        """测试批量包含检查与标量结果一致"""
+        bounds = GeoBounds(
+            min_lon=116.0, max_lon=117.0,
+            min_lat=39.0, max_lat=40.0
+        )
+
+        # 覆盖边界内外的1000x1000网格
+        lons, lats = np.meshgrid(
+            np.linspace(115.0, 118.0, 1000),
+            np.linspace(38.0, 41.0, 1000)
+        )
+        mask = bounds.contains_points(lons, lats)
+
+        self.assertEqual(mask.shape, lons.shape)
+        self.assertEqual(mask.dtype, np.bool_)
+
+        # 抽样与标量实现比对
+        for i, j in [(0, 0), (500, 500), (999, 999), (333, 666)]:
+            point = GeoPoint(longitude=lons[i, j], latitude=lats[i, j])
+            self.assertEqual(mask[i, j], bounds.contains_point(point))
+
+    def test_geo_bounds_filter_points(self):
+        """测试批量筛选边界内点"""
+        bounds = GeoBounds(
+            min_lon=116.0, max_lon=117.0,
+            min_lat=39.0, max_lat=40.0
+        )
+
+        points = GeoPointArray(
+            lons=[116.5, 118.0, 116.0, 115.5],
+            lats=[39.5, 39.5, 39.0, 40.5],
+            properties=[{'name': n} for n in ['a', 'b', 'c', 'd']],
+            indices=[10, 11, 12, 13]
+        )
+
+        inside = bounds.filter_points(points)
+
+        # 只保留边界内（含边界上）的点，属性与原始索引同步筛选
+        self.assertEqual(len(inside), 2)
+        self.assertEqual(list(inside.lons), [116.5, 116.0])
+        self.assertEqual([p['name'] for p in inside.properties], ['a', 'c'])
+        self.assertEqual(inside.indices, [10, 12])
+
     def test_geo_bounds_center(self):
         """测试地理边界中心点计算"""
         bounds = GeoBounds(
@@ -199,12 +272,15 @@ class TestDataLoader(unittest.TestCase):
     
     def setUp(self):
         """测试前准备"""
-        self.temp_dir = tempfile.mkdtemp()
+        # TemporaryDirectory用weakref.finalize注册清理，测试崩溃也不泄漏/tmp
+        self._tmp_ctx = tempfile.TemporaryDirectory()
+        self.temp_dir = self._tmp_ctx.name
     
     def tearDown(self):
         """测试后清理"""
-        import shutil
-        shutil.rmtree(self.temp_dir, ignore_errors=True)
+        # 先并行清空目录内容，再让TemporaryDirectory删掉空根目录
+        fast_rmtree(self.temp_dir, keep_root=True)
+        self._tmp_ctx.cleanup()
     
     def test_create_geojson_loader(self):
         """测试创建GeoJSON加载器"""
@@ -261,20 +337,15 @@ class TestDataLoader(unittest.TestCase):
     @patch('geopandas.read_file')
     def test_geojson_loader_load_points(self, mock_read_file):
         """测试GeoJSON加载器加载点数据"""
-        # 模拟GeoDataFrame
-        mock_row1 = Mock()
-        mock_row1.geometry.x = 116.3974
-        mock_row1.geometry.y = 39.9093
-        mock_row1.to_dict.return_value = {'name': 'Beijing'}
-        
-        mock_row2 = Mock()
-        mock_row2.geometry.x = 121.4737
-        mock_row2.geometry.y = 31.2304
-        mock_row2.to_dict.return_value = {'name': 'Shanghai'}
-        
-        mock_gdf = Mock()
-        mock_gdf.iterrows.return_value = [(0, mock_row1), (1, mock_row2)]
-        mock_read_file.return_value = mock_gdf
+        # 真实的GeoDataFrame替身：向量化实现整列读取geometry.x/y，
+        # 无法用逐行Mock模拟
+        mock_read_file.return_value = gpd.GeoDataFrame(
+            {'name': ['Beijing', 'Shanghai']},
+            geometry=gpd.points_from_xy(
+                [116.3974, 121.4737], [39.9093, 31.2304]
+            ),
+            crs='EPSG:4326'
+        )
         
         geojson_file = os.path.join(self.temp_dir, 'test.geojson')
         with open(geojson_file, 'w') as f:
@@ -414,13 +485,16 @@ class TestTileMerger(unittest.TestCase):
     
     def setUp(self):
         """测试前准备"""
-        self.temp_dir = tempfile.mkdtemp()
+        # TemporaryDirectory用weakref.finalize注册清理，测试崩溃也不泄漏/tmp
+        self._tmp_ctx = tempfile.TemporaryDirectory()
+        self.temp_dir = self._tmp_ctx.name
         self.merger = TileMerger()
     
     def tearDown(self):
         """测试后清理"""
-        import shutil
-        shutil.rmtree(self.temp_dir, ignore_errors=True)
+        # 先并行清空目录内容，再让TemporaryDirectory删掉空根目录
+        fast_rmtree(self.temp_dir, keep_root=True)
+        self._tmp_ctx.cleanup()
     
     def create_test_tile(self, color=(255, 0, 0), size=(256, 256)):
         """创建测试瓦片图像"""
@@ -768,13 +842,16 @@ class TestMetadataManager(unittest.TestCase):
     
     def setUp(self):
         """测试前准备"""
-        self.temp_dir = tempfile.mkdtemp()
+        # TemporaryDirectory用weakref.finalize注册清理，测试崩溃也不泄漏/tmp
+        self._tmp_ctx = tempfile.TemporaryDirectory()
+        self.temp_dir = self._tmp_ctx.name
         self.manager = MetadataManager()
     
     def tearDown(self):
         """测试后清理"""
-        import shutil
-        shutil.rmtree(self.temp_dir, ignore_errors=True)
+        # 先并行清空目录内容，再让TemporaryDirectory删掉空根目录
+        fast_rmtree(self.temp_dir, keep_root=True)
+        self._tmp_ctx.cleanup()
     
     def test_save_image_metadata_json(self):
         """测试保存图像元数据为JSON"""
@@ -885,7 +962,6 @@ class TestMetadataManager(unittest.TestCase):
         self.assertTrue(os.path.exists(output_path))
         
         # 验证CSV内容
-        import csv
         with open(output_path, 'r', encoding='utf-8') as f:
             reader = csv.DictReader(f)
             rows = list(reader)
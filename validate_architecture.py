@@ -11,17 +11,70 @@
 
 import os
 import ast
+import re
 import sys
 import json
+import datetime
+import argparse
 import importlib.util
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Any, Optional, Set
-from dataclasses import dataclass
+from typing import Dict, List, Any, Callable, Optional, Set, Tuple
+from dataclasses import dataclass, asdict
 
+# 可选依赖：缺少yaml时配置文件检查降级为明确的错误提示
+try:
+    import yaml
+except ImportError:
+    yaml = None
 
-@dataclass
+
+# 状态图标映射：模块级常量，避免在结果循环内反复构建字典
+_STATUS_ICON = {
+    'pass': '✅',
+    'warning': '⚠️',
+    'error': '❌'
+}
+
+# 报告末尾的静态检查清单：模块级常量，生成报告时不再逐次重建
+_BEST_PRACTICE_LINES = (
+    "## 📋 架构最佳实践检查清单",
+    "",
+    "### 模块化设计",
+    "- [ ] 单一职责原则：每个模块只负责一个功能",
+    "- [ ] 开闭原则：对扩展开放，对修改封闭",
+    "- [ ] 依赖倒置：依赖抽象而不是具体实现",
+    "",
+    "### 代码质量",
+    "- [ ] 类型注解：为函数参数和返回值添加类型注解",
+    "- [ ] 文档字符串：为所有公共类和函数添加文档",
+    "- [ ] 异常处理：适当的异常处理和错误信息",
+    "- [ ] 单元测试：为核心功能编写测试",
+    "",
+    "### 性能优化",
+    "- [ ] 异步支持：I/O密集型操作使用异步",
+    "- [ ] 缓存机制：合理使用缓存减少重复计算",
+    "- [ ] 资源管理：正确管理文件句柄和网络连接",
+    "- [ ] 内存优化：避免内存泄漏和过度使用",
+    "",
+    "### 可维护性",
+    "- [ ] 配置管理：外部化配置参数",
+    "- [ ] 日志记录：完善的日志记录机制",
+    "- [ ] 错误处理：友好的错误信息和恢复机制",
+    "- [ ] 版本管理：清晰的版本控制和发布流程",
+    ""
+)
+
+
+@dataclass(frozen=True, slots=True)
 class ValidationResult:
-    """验证结果"""
+    """验证结果
+
+    每次检查生成一个实例并长期驻留在结果列表里，
+    启用slots省掉每实例的__dict__；frozen使其可哈希，
+    报告循环里的属性读取也走C实现的槽描述符。
+    """
     category: str
     item: str
     status: str  # 'pass', 'warning', 'error'
@@ -29,14 +82,438 @@ class ValidationResult:
     details: Optional[str] = None
 
 
+@dataclass(frozen=True, slots=True)
+class _FileSummary:
+    """单个Python文件的结构摘要
+
+    验证器只需要结构性事实（文档字符串有无、名称、
+    注解与导入计数），不需要整棵AST；解析后立即压缩
+    为摘要并丢弃语法树，缓存常驻内存从每文件数十KB
+    降到几百字节。
+    """
+    has_module_doc: bool
+    classes: Tuple[Tuple[str, bool], ...]       # (类名, 是否有文档)
+    public_funcs: Tuple[Tuple[str, bool], ...]  # (函数名, 是否有文档)
+    func_total: int
+    func_annotated: int
+    import_total: int
+    relative_imports: int
+    try_total: int
+    src_imports: Tuple[str, ...]
+
+
+# 空文件的共享摘要：与解析''得到的空Module结果一致
+_EMPTY_SUMMARY = _FileSummary(
+    has_module_doc=False, classes=(), public_funcs=(),
+    func_total=0, func_annotated=0, import_total=0,
+    relative_imports=0, try_total=0, src_imports=()
+)
+
+
+def _has_docstring(node: ast.AST) -> bool:
+    """判断模块/类/函数节点是否带非空文档字符串
+
+    等价于bool(ast.get_docstring(node))，但不做缩进清理，
+    省去每次调用里的重复isinstance链与字符串拷贝。
+    """
+    body = getattr(node, 'body', None)
+    if not body:
+        return False
+    first = body[0]
+    return (isinstance(first, ast.Expr)
+            and isinstance(first.value, ast.Constant)
+            and isinstance(first.value.value, str)
+            and bool(first.value.value))
+
+
+class _NodeCollector(ast.NodeVisitor):
+    """按节点类型分桶的AST访问者
+
+    ast.walk是逐层yield的递归生成器，配合Python层的
+    类型分发表仍有可观的解释器开销；NodeVisitor把类型
+    分发交给内建的方法查找，visit_*里绑定好的append
+    直接入桶，遍历一趟即得全部桶。顺带记录各模块/类/
+    函数节点的文档字符串有无，并累计带注解函数与相对
+    导入的数量，下游检查只查表和比较整数，不再逐节点
+    调用ast.get_docstring或构造筛选列表。
+    """
+
+    __slots__ = ('buckets', 'has_doc', 'func_annotated', 'relative_imports',
+                 '_cls_app', '_func_app', '_imp_app', '_try_app')
+
+    def __init__(self):
+        self.buckets: Dict[str, List[ast.AST]] = {
+            'class': [], 'func': [], 'import': [], 'try': []
+        }
+        # 节点id -> 是否有文档字符串（桶里持有节点引用，id稳定）
+        self.has_doc: Dict[int, bool] = {}
+        # 带类型注解的函数数 / 相对导入语句数
+        self.func_annotated = 0
+        self.relative_imports = 0
+        # 预绑定append方法，省去每次命中的属性链查找
+        self._cls_app = self.buckets['class'].append
+        self._func_app = self.buckets['func'].append
+        self._imp_app = self.buckets['import'].append
+        self._try_app = self.buckets['try'].append
+
+    def visit_Module(self, node: ast.Module):
+        self.has_doc[id(node)] = _has_docstring(node)
+        self.generic_visit(node)
+
+    def visit_ClassDef(self, node: ast.ClassDef):
+        self._cls_app(node)
+        self.has_doc[id(node)] = _has_docstring(node)
+        self.generic_visit(node)
+
+    def visit_FunctionDef(self, node: ast.FunctionDef):
+        self._func_app(node)
+        self.has_doc[id(node)] = _has_docstring(node)
+        if node.returns is not None or any(
+                arg.annotation is not None for arg in node.args.args):
+            self.func_annotated += 1
+        self.generic_visit(node)
+
+    def visit_Import(self, node: ast.Import):
+        self._imp_app(node)
+        self.generic_visit(node)
+
+    def visit_ImportFrom(self, node: ast.ImportFrom):
+        self._imp_app(node)
+        if node.level > 0:
+            self.relative_imports += 1
+        self.generic_visit(node)
+
+    def visit_Try(self, node: ast.Try):
+        self._try_app(node)
+        self.generic_visit(node)
+
+
 class ArchitectureValidator:
     """架构验证器"""
-    
+
+    # 设计模式标记的交替正则：一趟扫描同时命中全部标记，
+    # 替代逐子串的多次全文搜索；singleton沿用原先的忽略大小写语义
+    _DESIGN_MARKER_RE = re.compile(
+        r'(?P<abc>ABC)|(?P<abstractmethod>abstractmethod)'
+        r'|(?i:(?P<singleton>singleton))|(?P<instance>_instance)'
+        r'|(?P<progress>ProgressReporter)|(?P<observer>Observer)'
+    )
+
+    # README必需章节，同样合并为单个交替正则
+    _README_SECTIONS = ['安装', '使用', '配置', '示例']
+    _README_SECTION_RE = re.compile('|'.join(_README_SECTIONS))
+
+    # 遍历时整目录跳过的无关目录（缓存/虚拟环境/构建产物）
+    _SKIP_DIRS = {'__pycache__', 'venv', '.venv', 'build', 'dist'}
+
     def __init__(self, project_root: str):
         self.project_root = Path(project_root)
         self.results: List[ValidationResult] = []
         self.src_dir = self.project_root / 'src'
-        
+        # 模块缓存：路径 -> 结构摘要(_FileSummary)或解析异常，
+        # 多个验证器共享同一次读取、解析与遍历的结果
+        self._module_cache: Dict[Path, Any] = {}
+        # 文本缓存：路径 -> 文件内容或读取异常，
+        # 覆盖requirements.txt、README等被多处重复打开的文件
+        self._text_cache: Dict[Path, Any] = {}
+        # src下Python文件列表（懒收集，多个验证器复用）
+        self._py_files: Optional[List[Path]] = None
+        # 跨运行的单文件结果缓存：按(mtime_ns, size)签名判定
+        # 文件是否变化，未变化的文件直接复用上次的结果，
+        # 开发循环中的重复运行只剩stat开销
+        self._results_cache_file = self.project_root / 'architecture_report.cache.json'
+        self._stale_file_cache: Dict[str, Any] = {}
+        self._fresh_file_cache: Dict[str, Any] = {}
+
+    def _iter_py_files(self) -> List[Path]:
+        """递归收集src下的Python文件（结果缓存）
+
+        rglob为每个中间目录分配Path对象并重复stat；
+        os.scandir的DirEntry自带类型信息，整个遍历
+        不产生额外系统调用。缓存、虚拟环境与构建产物
+        目录整体剪枝，不进入遍历。
+
+        Returns:
+            Python文件路径列表
+        """
+        if self._py_files is None:
+            collected: List[Path] = []
+            stack = [str(self.src_dir)]
+            while stack:
+                current = stack.pop()
+                subdirs = []
+                try:
+                    with os.scandir(current) as entries:
+                        for entry in entries:
+                            if entry.is_dir(follow_symlinks=False):
+                                if (entry.name.startswith('.')
+                                        or entry.name in self._SKIP_DIRS):
+                                    continue
+                                subdirs.append(entry.path)
+                            elif (entry.name.endswith('.py')
+                                  and entry.is_file(follow_symlinks=False)):
+                                collected.append(Path(entry.path))
+                except OSError:
+                    continue
+                # 倒序入栈保持与目录序一致的深度优先遍历
+                stack.extend(reversed(subdirs))
+            self._py_files = collected
+        return self._py_files
+
+    def _read(self, file_path: Path) -> str:
+        """读取文本文件内容（按路径缓存）
+
+        Args:
+            file_path: 文件路径
+
+        Returns:
+            文件内容
+
+        Raises:
+            读取失败时重新抛出首次失败的异常（异常同样缓存，
+            避免对坏文件重复尝试）
+        """
+        key = file_path.resolve()
+        cached = self._text_cache.get(key)
+        if cached is None:
+            try:
+                with open(file_path, 'r', encoding='utf-8') as f:
+                    cached = f.read()
+            except Exception as e:
+                cached = e
+            self._text_cache[key] = cached
+        if isinstance(cached, Exception):
+            raise cached
+        return cached
+
+    @staticmethod
+    def _read_head_bytes(file_path: Path, n: int = 128) -> bytes:
+        """读取文件头部的原始字节
+
+        编码声明只出现在文件最前面，按字节读取头部即可完成
+        检查，无需对整个文件做一次完整解码。
+
+        Args:
+            file_path: 文件路径
+            n: 读取的字节数
+
+        Returns:
+            文件前n个字节；读取失败时返回空字节串
+        """
+        try:
+            with open(file_path, 'rb') as f:
+                return f.read(n)
+        except OSError:
+            return b''
+
+    @classmethod
+    def _scan_design_markers(cls, content: str) -> Set[str]:
+        """单趟扫描文件内容，返回命中的设计模式标记组名
+
+        Args:
+            content: 文件内容
+
+        Returns:
+            命中标记的组名集合（如{'abc', 'singleton'}）
+        """
+        return {
+            match.lastgroup
+            for match in cls._DESIGN_MARKER_RE.finditer(content)
+        }
+
+    @staticmethod
+    def _collect_nodes(tree: ast.AST) -> _NodeCollector:
+        """单次遍历AST并按节点类型分桶
+
+        各验证器对同一棵树反复ast.walk筛选不同节点类型，
+        树遍历本身是访存密集操作；改为_NodeCollector一趟
+        访问者遍历，后续只查桶和文档字符串表。
+
+        Args:
+            tree: 已解析的AST
+
+        Returns:
+            完成遍历的_NodeCollector（含buckets与has_doc）
+        """
+        collector = _NodeCollector()
+        collector.visit(tree)
+        return collector
+
+    def _load_module(self, file_path: Path) -> Any:
+        """读取、解析并摘要Python模块（按路径缓存）
+
+        解析完成即把AST压缩成_FileSummary并释放语法树，
+        缓存里只保留结构摘要。
+
+        Args:
+            file_path: 模块文件路径
+
+        Returns:
+            _FileSummary结构摘要；读取或解析失败时返回
+            对应的异常对象（同样缓存，避免重复尝试）
+        """
+        key = file_path.resolve()
+        cached = self._module_cache.get(key)
+        if cached is None:
+            try:
+                content = self._read(file_path)
+                if not content:
+                    # 空文件（如占位__init__.py）无需走解析器
+                    cached = _EMPTY_SUMMARY
+                else:
+                    # type_comments显式关闭（虽为默认值），报错带上文件名
+                    tree = ast.parse(content, filename=str(file_path),
+                                     type_comments=False)
+                    cached = self._summarize(tree)
+            except Exception as e:
+                cached = e
+            self._module_cache[key] = cached
+        return cached
+
+    @classmethod
+    def _summarize(cls, tree: ast.AST) -> _FileSummary:
+        """遍历AST并压缩为结构摘要
+
+        Args:
+            tree: 已解析的AST
+
+        Returns:
+            文件的_FileSummary结构摘要
+        """
+        collector = cls._collect_nodes(tree)
+        buckets = collector.buckets
+        has_doc = collector.has_doc
+        return _FileSummary(
+            has_module_doc=bool(has_doc.get(id(tree))),
+            classes=tuple(
+                (node.name, has_doc[id(node)]) for node in buckets['class']),
+            public_funcs=tuple(
+                (node.name, has_doc[id(node)]) for node in buckets['func']
+                if not node.name.startswith('_')),
+            func_total=len(buckets['func']),
+            func_annotated=collector.func_annotated,
+            import_total=len(buckets['import']),
+            relative_imports=collector.relative_imports,
+            try_total=len(buckets['try']),
+            src_imports=tuple(
+                node.module for node in buckets['import']
+                if isinstance(node, ast.ImportFrom) and node.module
+                and node.module.startswith('src.')),
+        )
+
+    def _prefetch_modules(self):
+        """并行预加载所有Python模块到缓存
+
+        逐文件的读取+解析互相独立，读文件期间释放GIL，
+        用线程池并发预热缓存后，各验证器串行跑在全命中的
+        缓存上，结果顺序与串行版完全一致。上次运行结果仍
+        有效的文件无需解析，不参与预热；单文件或无文件时
+        直接串行，省去线程池开销。
+        """
+        pending = []
+        for py_file in self._iter_py_files():
+            try:
+                st = py_file.stat()
+                rel = str(py_file.relative_to(self.project_root))
+            except (OSError, ValueError):
+                pending.append(py_file)
+                continue
+            entry = self._stale_entry(rel, st)
+            if (entry is None or 'imports' not in entry
+                    or 'code_quality' not in entry.get('sections', {})):
+                pending.append(py_file)
+
+        if len(pending) <= 1:
+            for py_file in pending:
+                self._load_module(py_file)
+            return
+
+        max_workers = min(8, (os.cpu_count() or 1) * 2)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            # 缓存键为文件路径，各任务互不重叠，字典写入无需加锁
+            list(executor.map(self._load_module, pending))
+
+    def _load_results_cache(self):
+        """加载上次运行留下的单文件结果缓存
+
+        缓存文件缺失或损坏时静默丢弃，等价于一次全量冷运行。
+        """
+        self._stale_file_cache = {}
+        self._fresh_file_cache = {}
+        try:
+            with open(self._results_cache_file, 'r', encoding='utf-8') as f:
+                cached = json.load(f)
+            if isinstance(cached, dict):
+                self._stale_file_cache = cached
+        except Exception:
+            pass
+
+    def _store_results_cache(self):
+        """写回本次运行收集的单文件结果缓存
+
+        只包含本次实际遇到的文件，已删除文件的旧条目随之
+        淘汰；写入失败只影响下次运行的速度，不影响结果。
+        """
+        try:
+            with open(self._results_cache_file, 'w', encoding='utf-8') as f:
+                json.dump(self._fresh_file_cache, f, ensure_ascii=False, indent=2)
+        except Exception:
+            pass
+
+    def _stale_entry(self, rel: str, st: os.stat_result) -> Optional[Dict[str, Any]]:
+        """按(mtime_ns, size)签名查找仍然有效的缓存条目
+
+        Args:
+            rel: 相对项目根的文件路径
+            st: 文件当前的stat结果
+
+        Returns:
+            签名匹配的缓存条目；文件已变化或无缓存时返回None
+        """
+        entry = self._stale_file_cache.get(rel)
+        if (entry and entry.get('mtime_ns') == st.st_mtime_ns
+                and entry.get('size') == st.st_size):
+            return entry
+        return None
+
+    def _fresh_entry(self, rel: str, st: os.stat_result) -> Dict[str, Any]:
+        """取（或创建）文件在本次运行缓存中的条目"""
+        return self._fresh_file_cache.setdefault(rel, {
+            'mtime_ns': st.st_mtime_ns,
+            'size': st.st_size,
+            'sections': {}
+        })
+
+    def _run_file_checks(self, file_path: Path, section: str,
+                         runner: Callable[[], None]):
+        """执行单文件检查，签名未变时直接回放缓存结果
+
+        Args:
+            file_path: 被检查的文件
+            section: 缓存分区名（同一文件可被多类检查覆盖）
+            runner: 产生验证结果的无参检查函数
+        """
+        try:
+            st = file_path.stat()
+            rel = str(file_path.relative_to(self.project_root))
+        except (OSError, ValueError):
+            runner()
+            return
+
+        stale = self._stale_entry(rel, st)
+        cached = stale.get('sections', {}).get(section) if stale else None
+
+        if cached is not None:
+            for item in cached:
+                self.results.append(ValidationResult(**item))
+            section_results = cached
+        else:
+            start = len(self.results)
+            runner()
+            section_results = [asdict(result) for result in self.results[start:]]
+
+        self._fresh_entry(rel, st)['sections'][section] = section_results
+
     def validate_all(self) -> List[ValidationResult]:
         """执行所有验证
         
@@ -44,7 +521,16 @@ class ArchitectureValidator:
             验证结果列表
         """
         self.results.clear()
-        
+        self._module_cache.clear()
+        self._text_cache.clear()
+        self._py_files = None
+
+        # 加载跨运行结果缓存，签名未变的文件免于重新解析
+        self._load_results_cache()
+
+        # 并行预热模块缓存，后续各验证器命中缓存串行执行
+        self._prefetch_modules()
+
         # 验证项目结构
         self._validate_project_structure()
         
@@ -65,7 +551,10 @@ class ArchitectureValidator:
         
         # 验证配置
         self._validate_configuration()
-        
+
+        # 写回结果缓存供下次运行复用
+        self._store_results_cache()
+
         return self.results
     
     def _add_result(self, category: str, item: str, status: str, 
@@ -148,7 +637,9 @@ class ArchitectureValidator:
             full_path = self.project_root / file_path
             if full_path.exists():
                 self._add_result(category, f"下载器模块 {file_path}", "pass", "存在")
-                self._validate_module_content(full_path, category)
+                self._run_file_checks(
+                    full_path, 'module_content',
+                    lambda path=full_path: self._validate_module_content(path, category))
             else:
                 self._add_result(category, f"下载器模块 {file_path}", "error", "缺失")
         
@@ -164,100 +655,94 @@ class ArchitectureValidator:
             full_path = self.project_root / file_path
             if full_path.exists():
                 self._add_result(category, f"处理器模块 {file_path}", "pass", "存在")
-                self._validate_module_content(full_path, category)
+                self._run_file_checks(
+                    full_path, 'module_content',
+                    lambda path=full_path: self._validate_module_content(path, category))
             else:
                 self._add_result(category, f"处理器模块 {file_path}", "error", "缺失")
     
     def _validate_module_content(self, file_path: Path, category: str):
         """验证模块内容"""
-        try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-            
-            # 解析AST
-            tree = ast.parse(content)
-            
-            # 检查文档字符串
-            if ast.get_docstring(tree):
-                self._add_result(category, f"模块文档 {file_path.name}", "pass", "有文档字符串")
-            else:
-                self._add_result(category, f"模块文档 {file_path.name}", "warning", "缺少文档字符串")
-            
-            # 检查类和函数
-            classes = [node for node in ast.walk(tree) if isinstance(node, ast.ClassDef)]
-            functions = [node for node in ast.walk(tree) if isinstance(node, ast.FunctionDef)]
-            
-            if classes:
-                self._add_result(category, f"类定义 {file_path.name}", "pass", f"包含 {len(classes)} 个类")
-                
-                # 检查类的文档字符串
-                for cls in classes:
-                    if ast.get_docstring(cls):
-                        self._add_result(category, f"类文档 {cls.name}", "pass", "有文档字符串")
-                    else:
-                        self._add_result(category, f"类文档 {cls.name}", "warning", "缺少文档字符串")
-            
-            if functions:
-                # 检查公共函数的文档字符串
-                public_functions = [f for f in functions if not f.name.startswith('_')]
-                for func in public_functions:
-                    if ast.get_docstring(func):
-                        self._add_result(category, f"函数文档 {func.name}", "pass", "有文档字符串")
-                    else:
-                        self._add_result(category, f"函数文档 {func.name}", "warning", "缺少文档字符串")
-        
-        except Exception as e:
-            self._add_result(category, f"模块解析 {file_path.name}", "error", f"解析失败: {str(e)}")
+        loaded = self._load_module(file_path)
+        if isinstance(loaded, Exception):
+            self._add_result(category, f"模块解析 {file_path.name}", "error", f"解析失败: {str(loaded)}")
+            return
+
+        summary = loaded
+
+        # 检查文档字符串（摘要里已是布尔值）
+        if summary.has_module_doc:
+            self._add_result(category, f"模块文档 {file_path.name}", "pass", "有文档字符串")
+        else:
+            self._add_result(category, f"模块文档 {file_path.name}", "warning", "缺少文档字符串")
+
+        # 检查类和函数
+        if summary.classes:
+            self._add_result(category, f"类定义 {file_path.name}", "pass", f"包含 {len(summary.classes)} 个类")
+
+            # 检查类的文档字符串
+            for cls_name, documented in summary.classes:
+                if documented:
+                    self._add_result(category, f"类文档 {cls_name}", "pass", "有文档字符串")
+                else:
+                    self._add_result(category, f"类文档 {cls_name}", "warning", "缺少文档字符串")
+
+        if summary.func_total:
+            # 检查公共函数的文档字符串
+            for func_name, documented in summary.public_funcs:
+                if documented:
+                    self._add_result(category, f"函数文档 {func_name}", "pass", "有文档字符串")
+                else:
+                    self._add_result(category, f"函数文档 {func_name}", "warning", "缺少文档字符串")
     
     def _validate_code_quality(self):
         """验证代码质量"""
         category = "代码质量"
         
         # 检查Python文件
-        python_files = list(self.src_dir.rglob('*.py'))
-        
+        python_files = self._iter_py_files()
+
         for py_file in python_files:
-            try:
-                with open(py_file, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                
-                # 检查编码声明
-                if 'utf-8' in content[:100] or content.startswith('#!/usr/bin/env python3'):
-                    self._add_result(category, f"编码声明 {py_file.name}", "pass", "正确")
-                else:
-                    self._add_result(category, f"编码声明 {py_file.name}", "warning", "建议添加编码声明")
-                
-                # 检查导入语句
-                tree = ast.parse(content)
-                imports = [node for node in ast.walk(tree) if isinstance(node, (ast.Import, ast.ImportFrom))]
-                
-                if imports:
-                    # 检查是否有相对导入
-                    relative_imports = [imp for imp in imports if isinstance(imp, ast.ImportFrom) and imp.level > 0]
-                    if relative_imports:
-                        self._add_result(category, f"导入语句 {py_file.name}", "pass", "使用相对导入")
-                    else:
-                        self._add_result(category, f"导入语句 {py_file.name}", "warning", "建议使用相对导入")
-                
-                # 检查异常处理
-                try_nodes = [node for node in ast.walk(tree) if isinstance(node, ast.Try)]
-                if try_nodes:
-                    self._add_result(category, f"异常处理 {py_file.name}", "pass", f"包含 {len(try_nodes)} 个异常处理块")
-                
-                # 检查类型注解
-                functions = [node for node in ast.walk(tree) if isinstance(node, ast.FunctionDef)]
-                annotated_functions = [f for f in functions if f.returns or any(arg.annotation for arg in f.args.args)]
-                
-                if annotated_functions and len(annotated_functions) > len(functions) * 0.5:
-                    self._add_result(category, f"类型注解 {py_file.name}", "pass", "大部分函数有类型注解")
-                elif annotated_functions:
-                    self._add_result(category, f"类型注解 {py_file.name}", "warning", "部分函数有类型注解")
-                else:
-                    self._add_result(category, f"类型注解 {py_file.name}", "warning", "缺少类型注解")
-            
-            except Exception as e:
-                self._add_result(category, f"代码分析 {py_file.name}", "error", f"分析失败: {str(e)}")
-    
+            self._run_file_checks(
+                py_file, 'code_quality',
+                lambda path=py_file: self._validate_file_quality(path, category))
+
+    def _validate_file_quality(self, py_file: Path, category: str):
+        """验证单个文件的代码质量"""
+        loaded = self._load_module(py_file)
+        if isinstance(loaded, Exception):
+            self._add_result(category, f"代码分析 {py_file.name}", "error", f"分析失败: {str(loaded)}")
+            return
+
+        summary = loaded
+
+        # 检查编码声明（只读头部字节，不依赖整文件解码结果）
+        head = self._read_head_bytes(py_file)
+        if b'utf-8' in head or head.startswith(b'#!/usr/bin/env python3'):
+            self._add_result(category, f"编码声明 {py_file.name}", "pass", "正确")
+        else:
+            self._add_result(category, f"编码声明 {py_file.name}", "warning", "建议添加编码声明")
+
+        # 检查导入语句（遍历时已累计相对导入数量）
+        if summary.import_total:
+            if summary.relative_imports:
+                self._add_result(category, f"导入语句 {py_file.name}", "pass", "使用相对导入")
+            else:
+                self._add_result(category, f"导入语句 {py_file.name}", "warning", "建议使用相对导入")
+
+        # 检查异常处理
+        if summary.try_total:
+            self._add_result(category, f"异常处理 {py_file.name}", "pass", f"包含 {summary.try_total} 个异常处理块")
+
+        # 检查类型注解（遍历时已累计带注解函数数量）
+        annotated = summary.func_annotated
+        if annotated and annotated > summary.func_total * 0.5:
+            self._add_result(category, f"类型注解 {py_file.name}", "pass", "大部分函数有类型注解")
+        elif annotated:
+            self._add_result(category, f"类型注解 {py_file.name}", "warning", "部分函数有类型注解")
+        else:
+            self._add_result(category, f"类型注解 {py_file.name}", "warning", "缺少类型注解")
+
     def _validate_dependencies(self):
         """验证依赖关系"""
         category = "依赖关系"
@@ -265,8 +750,7 @@ class ArchitectureValidator:
         # 检查requirements.txt
         req_file = self.project_root / 'requirements.txt'
         if req_file.exists():
-            with open(req_file, 'r', encoding='utf-8') as f:
-                requirements = f.read().strip().split('\n')
+            requirements = self._read(req_file).strip().split('\n')
             
             # 检查核心依赖
             core_deps = ['geopandas', 'Pillow', 'requests', 'aiohttp', 'pyyaml']
@@ -291,38 +775,114 @@ class ArchitectureValidator:
         category = "依赖关系"
         
         # 简单的循环依赖检查
-        python_files = list(self.src_dir.rglob('*.py'))
+        python_files = self._iter_py_files()
         import_graph = {}
         
         for py_file in python_files:
             try:
-                with open(py_file, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                
-                tree = ast.parse(content)
-                imports = []
-                
-                for node in ast.walk(tree):
-                    if isinstance(node, ast.ImportFrom) and node.module:
-                        if node.module.startswith('src.'):
-                            imports.append(node.module)
-                
-                module_name = str(py_file.relative_to(self.project_root)).replace('/', '.').replace('.py', '')
-                import_graph[module_name] = imports
-            
-            except Exception:
+                st = py_file.stat()
+                rel_path = py_file.relative_to(self.project_root)
+            except (OSError, ValueError):
                 continue
+            rel = str(rel_path)
+
+            # 导入边与文件签名绑定，签名未变时免于解析
+            stale = self._stale_entry(rel, st)
+            imports = stale.get('imports') if stale else None
+
+            if imports is None:
+                loaded = self._load_module(py_file)
+                if isinstance(loaded, Exception):
+                    continue
+
+                imports = list(loaded.src_imports)
+
+            self._fresh_entry(rel, st)['imports'] = imports
+            # 由路径组件拼模块名：单次分配且不依赖'/'分隔符
+            module_name = '.'.join(rel_path.with_suffix('').parts)
+            import_graph[module_name] = imports
         
-        # 检查是否有明显的循环依赖
-        has_cycles = False
-        for module, deps in import_graph.items():
-            for dep in deps:
-                if dep in import_graph and module in import_graph[dep]:
-                    has_cycles = True
-                    self._add_result(category, "循环依赖", "warning", f"发现循环依赖: {module} <-> {dep}")
-        
-        if not has_cycles:
+        # 邻接表先收拢到图内模块并去重（frozenset成员判定O(1)），
+        # 环检测内层循环不再逐边做成员检查
+        known = frozenset(import_graph)
+        graph = {
+            module: [dep for dep in dict.fromkeys(deps) if dep in known]
+            for module, deps in import_graph.items()
+        }
+
+        # 用强连通分量一次性找出所有循环（含长度>=3的环）
+        cycles = self._find_dependency_cycles(graph)
+        for component in cycles:
+            self._add_result(category, "循环依赖", "warning", f"发现循环依赖: {' <-> '.join(component)}")
+
+        if not cycles:
             self._add_result(category, "循环依赖", "pass", "未发现明显的循环依赖")
+
+    @staticmethod
+    def _find_dependency_cycles(graph: Dict[str, List[str]]) -> List[List[str]]:
+        """在导入图中查找循环依赖（迭代式Tarjan强连通分量）
+
+        原先的逐对检查只能发现A<->B形式的二元环，且复杂度随
+        依赖数平方增长；Tarjan算法单趟O(V+E)即可找出所有规模
+        大于1的强连通分量，覆盖任意长度的环。采用显式栈的迭代
+        实现，避免深依赖链触发递归深度限制。
+
+        Args:
+            graph: 模块名 -> 依赖模块名列表；所有依赖必须指向
+                图内节点（调用方先行过滤图外依赖）
+
+        Returns:
+            循环依赖分量列表，每个分量按发现顺序列出成员模块
+        """
+        index_of: Dict[str, int] = {}
+        lowlink: Dict[str, int] = {}
+        on_stack: Set[str] = set()
+        scc_stack: List[str] = []
+        cycles: List[List[str]] = []
+        counter = 0
+
+        for root in graph:
+            if root in index_of:
+                continue
+            index_of[root] = lowlink[root] = counter
+            counter += 1
+            scc_stack.append(root)
+            on_stack.add(root)
+            work = [(root, iter(graph.get(root, [])))]
+
+            while work:
+                node, deps = work[-1]
+                descended = False
+                for dep in deps:
+                    if dep not in index_of:
+                        index_of[dep] = lowlink[dep] = counter
+                        counter += 1
+                        scc_stack.append(dep)
+                        on_stack.add(dep)
+                        work.append((dep, iter(graph[dep])))
+                        descended = True
+                        break
+                    if dep in on_stack:
+                        lowlink[node] = min(lowlink[node], index_of[dep])
+                if descended:
+                    continue
+
+                work.pop()
+                if lowlink[node] == index_of[node]:
+                    component = []
+                    while True:
+                        member = scc_stack.pop()
+                        on_stack.remove(member)
+                        component.append(member)
+                        if member == node:
+                            break
+                    if len(component) > 1:
+                        cycles.append(component[::-1])
+                if work:
+                    parent = work[-1][0]
+                    lowlink[parent] = min(lowlink[parent], lowlink[node])
+
+        return cycles
     
     def _validate_design_patterns(self):
         """验证设计模式"""
@@ -339,10 +899,9 @@ class ArchitectureValidator:
         base_downloader = self.src_dir / 'downloaders' / 'base.py'
         if base_downloader.exists():
             try:
-                with open(base_downloader, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                
-                if 'ABC' in content or 'abstractmethod' in content:
+                hits = self._scan_design_markers(self._read(base_downloader))
+
+                if 'abc' in hits or 'abstractmethod' in hits:
                     self._add_result(category, "策略模式", "pass", "抽象基类已定义")
                 else:
                     self._add_result(category, "策略模式", "warning", "建议使用抽象基类")
@@ -353,10 +912,9 @@ class ArchitectureValidator:
         config_file = self.src_dir / 'config.py'
         if config_file.exists():
             try:
-                with open(config_file, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                
-                if 'singleton' in content.lower() or '_instance' in content:
+                hits = self._scan_design_markers(self._read(config_file))
+
+                if 'singleton' in hits or 'instance' in hits:
                     self._add_result(category, "单例模式", "pass", "配置管理使用单例模式")
                 else:
                     self._add_result(category, "单例模式", "warning", "配置管理建议使用单例模式")
@@ -367,10 +925,9 @@ class ArchitectureValidator:
         utils_file = self.src_dir / 'utils.py'
         if utils_file.exists():
             try:
-                with open(utils_file, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                
-                if 'ProgressReporter' in content or 'Observer' in content:
+                hits = self._scan_design_markers(self._read(utils_file))
+
+                if 'progress' in hits or 'observer' in hits:
                     self._add_result(category, "观察者模式", "pass", "进度报告使用观察者模式")
                 else:
                     self._add_result(category, "观察者模式", "warning", "建议为进度报告使用观察者模式")
@@ -384,13 +941,12 @@ class ArchitectureValidator:
         # 检查README.md
         readme_file = self.project_root / 'README.md'
         if readme_file.exists():
-            with open(readme_file, 'r', encoding='utf-8') as f:
-                readme_content = f.read()
+            readme_content = self._read(readme_file)
             
-            # 检查README内容
-            required_sections = ['安装', '使用', '配置', '示例']
-            for section in required_sections:
-                if section in readme_content:
+            # 检查README内容：一趟扫描得到全部命中章节
+            section_hits = set(self._README_SECTION_RE.findall(readme_content))
+            for section in self._README_SECTIONS:
+                if section in section_hits:
                     self._add_result(category, f"README {section}章节", "pass", "存在")
                 else:
                     self._add_result(category, f"README {section}章节", "warning", "缺失")
@@ -420,33 +976,65 @@ class ArchitectureValidator:
         # 检查配置文件
         config_file = self.project_root / 'config.yaml'
         if config_file.exists():
-            try:
-                import yaml
-                with open(config_file, 'r', encoding='utf-8') as f:
-                    config_data = yaml.safe_load(f)
-                
-                # 检查配置结构
-                required_sections = ['download', 'paths', 'network', 'image', 'logging']
-                for section in required_sections:
-                    if section in config_data:
-                        self._add_result(category, f"配置节 {section}", "pass", "存在")
-                    else:
-                        self._add_result(category, f"配置节 {section}", "warning", "缺失")
-                
-                self._add_result(category, "配置文件格式", "pass", "YAML格式正确")
-            
-            except Exception as e:
-                self._add_result(category, "配置文件格式", "error", f"YAML格式错误: {str(e)}")
+            if yaml is None:
+                self._add_result(category, "配置文件格式", "error", "缺少yaml依赖，无法检查配置文件")
+            else:
+                self._validate_config_content(config_file, category)
         else:
             self._add_result(category, "配置文件", "warning", "缺失默认配置文件")
-        
+
         # 检查配置管理模块
         config_module = self.src_dir / 'config.py'
         if config_module.exists():
             self._add_result(category, "配置管理模块", "pass", "存在")
         else:
             self._add_result(category, "配置管理模块", "error", "缺失")
-    
+
+    def _validate_config_content(self, config_file: Path, category: str):
+        """验证配置文件内容"""
+        try:
+            config_data = yaml.safe_load(self._read(config_file))
+
+            # 检查配置结构
+            required_sections = ['download', 'paths', 'network', 'image', 'logging']
+            for section in required_sections:
+                if section in config_data:
+                    self._add_result(category, f"配置节 {section}", "pass", "存在")
+                else:
+                    self._add_result(category, f"配置节 {section}", "warning", "缺失")
+
+            self._add_result(category, "配置文件格式", "pass", "YAML格式正确")
+
+        except Exception as e:
+            self._add_result(category, "配置文件格式", "error", f"YAML格式错误: {str(e)}")
+
+    def _bucket_results(self):
+        """单次遍历对验证结果分类统计
+
+        报告生成与命令行摘要原先各自多次线性过滤结果列表；
+        一趟循环同时完成计数、警告/错误收集与按类别分组。
+        分组用defaultdict省掉每条结果的setdefault探测，
+        类别顺序即插入顺序，与结果顺序保持一致。
+
+        Returns:
+            (状态计数字典, 警告列表, 错误列表, 按类别分组字典)
+        """
+        counts = {'pass': 0, 'warning': 0, 'error': 0}
+        warn_list: List[ValidationResult] = []
+        err_list: List[ValidationResult] = []
+        by_category: Dict[str, List[ValidationResult]] = defaultdict(list)
+
+        for result in self.results:
+            by_category[result.category].append(result)
+            if result.status in counts:
+                counts[result.status] += 1
+            if result.status == 'warning':
+                warn_list.append(result)
+            elif result.status == 'error':
+                err_list.append(result)
+
+        return counts, warn_list, err_list, by_category
+
     def generate_report(self, output_file: str = "architecture_report.md") -> str:
         """生成验证报告
         
@@ -456,11 +1044,12 @@ class ArchitectureValidator:
         Returns:
             报告内容
         """
-        # 统计结果
+        # 统计结果（单次遍历分桶）
+        counts, warn_results, err_results, categories = self._bucket_results()
         total = len(self.results)
-        passed = len([r for r in self.results if r.status == 'pass'])
-        warnings = len([r for r in self.results if r.status == 'warning'])
-        errors = len([r for r in self.results if r.status == 'error'])
+        passed = counts['pass']
+        warnings = counts['warning']
+        errors = counts['error']
         
         # 计算分数
         score = (passed * 100 + warnings * 50) / (total * 100) if total > 0 else 0
@@ -469,7 +1058,7 @@ class ArchitectureValidator:
         report_lines = [
             "# 项目架构验证报告",
             "",
-            f"验证时间: {__import__('datetime').datetime.now().strftime('%Y-%m-%d %H:%M:%S')}",
+            f"验证时间: {datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}",
             f"项目路径: {self.project_root}",
             "",
             "## 总体评分",
@@ -482,92 +1071,50 @@ class ArchitectureValidator:
             f"- 📊 总计: {total}",
             ""
         ]
-        
-        # 按类别分组
-        categories = {}
-        for result in self.results:
-            if result.category not in categories:
-                categories[result.category] = []
-            categories[result.category].append(result)
-        
+        # 循环内统一走绑定的append流式写入，
+        # 不再为每个小节构造临时列表再extend
+        write = report_lines.append
+
         # 生成详细报告
         for category, results in categories.items():
-            report_lines.extend([
-                f"## {category}",
-                ""
-            ])
-            
+            write(f"## {category}")
+            write("")
+
             for result in results:
-                status_icon = {
-                    'pass': '✅',
-                    'warning': '⚠️',
-                    'error': '❌'
-                }.get(result.status, '❓')
-                
-                report_lines.append(f"- {status_icon} **{result.item}**: {result.message}")
+                status_icon = _STATUS_ICON.get(result.status, '❓')
+
+                write(f"- {status_icon} **{result.item}**: {result.message}")
                 if result.details:
-                    report_lines.append(f"  - {result.details}")
-            
-            report_lines.append("")
-        
+                    write(f"  - {result.details}")
+
+            write("")
+
         # 添加建议
         if errors > 0:
-            report_lines.extend([
-                "## 🚨 紧急修复建议",
-                "",
-                "以下问题需要立即修复：",
-                ""
-            ])
-            
-            for result in self.results:
-                if result.status == 'error':
-                    report_lines.append(f"- **{result.item}**: {result.message}")
-            
-            report_lines.append("")
-        
+            write("## 🚨 紧急修复建议")
+            write("")
+            write("以下问题需要立即修复：")
+            write("")
+
+            for result in err_results:
+                write(f"- **{result.item}**: {result.message}")
+
+            write("")
+
         if warnings > 0:
-            report_lines.extend([
-                "## 💡 改进建议",
-                "",
-                "以下问题建议改进：",
-                ""
-            ])
-            
-            for result in self.results:
-                if result.status == 'warning':
-                    report_lines.append(f"- **{result.item}**: {result.message}")
-            
-            report_lines.append("")
-        
-        # 添加最佳实践建议
-        report_lines.extend([
-            "## 📋 架构最佳实践检查清单",
-            "",
-            "### 模块化设计",
-            "- [ ] 单一职责原则：每个模块只负责一个功能",
-            "- [ ] 开闭原则：对扩展开放，对修改封闭",
-            "- [ ] 依赖倒置：依赖抽象而不是具体实现",
-            "",
-            "### 代码质量",
-            "- [ ] 类型注解：为函数参数和返回值添加类型注解",
-            "- [ ] 文档字符串：为所有公共类和函数添加文档",
-            "- [ ] 异常处理：适当的异常处理和错误信息",
-            "- [ ] 单元测试：为核心功能编写测试",
-            "",
-            "### 性能优化",
-            "- [ ] 异步支持：I/O密集型操作使用异步",
-            "- [ ] 缓存机制：合理使用缓存减少重复计算",
-            "- [ ] 资源管理：正确管理文件句柄和网络连接",
-            "- [ ] 内存优化：避免内存泄漏和过度使用",
-            "",
-            "### 可维护性",
-            "- [ ] 配置管理：外部化配置参数",
-            "- [ ] 日志记录：完善的日志记录机制",
-            "- [ ] 错误处理：友好的错误信息和恢复机制",
-            "- [ ] 版本管理：清晰的版本控制和发布流程",
-            ""
-        ])
-        
+            write("## 💡 改进建议")
+            write("")
+            write("以下问题建议改进：")
+            write("")
+
+            for result in warn_results:
+                write(f"- **{result.item}**: {result.message}")
+
+            write("")
+
+        # 添加最佳实践建议（静态内容取模块级常量）
+        report_lines.extend(_BEST_PRACTICE_LINES)
+
         report_content = "\n".join(report_lines)
         
         # 保存报告
@@ -580,8 +1127,6 @@ class ArchitectureValidator:
 
 def main():
     """主函数"""
-    import argparse
-    
     parser = argparse.ArgumentParser(
         description="项目架构验证工具",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -632,11 +1177,12 @@ def main():
     validator = ArchitectureValidator(str(project_path))
     results = validator.validate_all()
     
-    # 统计结果
+    # 统计结果（单次遍历分桶）
+    counts, _, _, _ = validator._bucket_results()
     total = len(results)
-    passed = len([r for r in results if r.status == 'pass'])
-    warnings = len([r for r in results if r.status == 'warning'])
-    errors = len([r for r in results if r.status == 'error'])
+    passed = counts['pass']
+    warnings = counts['warning']
+    errors = counts['error']
     
     # 显示摘要
     print(f"验证完成！")
@@ -660,11 +1206,7 @@ def main():
                 current_category = result.category
                 print(f"\n{current_category}:")
             
-            status_icon = {
-                'pass': '✅',
-                'warning': '⚠️',
-                'error': '❌'
-            }.get(result.status, '❓')
+            status_icon = _STATUS_ICON.get(result.status, '❓')
             
             print(f"  {status_icon} {result.item}: {result.message}")
             if result.details:
@@ -674,11 +1216,11 @@ def main():
     print(f"\n正在生成报告: {args.output}")
     validator.generate_report(args.output)
     
-    # 输出JSON格式
+    # 输出JSON格式（results逐条流式写出，不整表驻留内存）
     if args.json:
         json_file = args.output.replace('.md', '.json')
-        json_data = {
-            'timestamp': __import__('datetime').datetime.now().isoformat(),
+        header = {
+            'timestamp': datetime.datetime.now().isoformat(),
             'project_path': str(project_path),
             'summary': {
                 'total': total,
@@ -686,22 +1228,19 @@ def main():
                 'warnings': warnings,
                 'errors': errors,
                 'score': score
-            },
-            'results': [
-                {
-                    'category': r.category,
-                    'item': r.item,
-                    'status': r.status,
-                    'message': r.message,
-                    'details': r.details
-                }
-                for r in results
-            ]
+            }
         }
-        
+
         with open(json_file, 'w', encoding='utf-8') as f:
-            json.dump(json_data, f, indent=2, ensure_ascii=False)
-        
+            head = json.dumps(header, ensure_ascii=False)
+            # 复用头部序列化结果，替换收尾的'}'接上results数组
+            f.write(head[:-1] + ', "results": [')
+            for i, r in enumerate(results):
+                if i:
+                    f.write(', ')
+                f.write(json.dumps(asdict(r), ensure_ascii=False))
+            f.write(']}')
+
         print(f"JSON报告已保存: {json_file}")
     
     print(f"\n报告已保存: {args.output}")